@@ -0,0 +1,138 @@
+import atexit
+import threading
+import time
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models import F
+
+
+class CounterBuffer:
+    """Write-behind buffer for denormalized integer counters.
+
+    Increments are accumulated in process memory and written to the database
+    in batches, so hot paths never issue an UPDATE per event. A flush happens
+    once the number of buffered increments reaches ``flush_threshold`` or the
+    oldest buffered increment is older than ``flush_interval`` seconds, and
+    once more when the process exits.
+
+    Rows whose pending increment is identical are updated together, which
+    keeps a flush to one ``UPDATE ... SET field = field + n`` per distinct n.
+
+    Attributes:
+        model_label (str): ``app_label.ModelName`` of the model holding the counter
+        field (str): Name of the counter field to increment
+    """
+
+    def __init__(self, model_label, field, threshold_setting, interval_setting):
+        self.model_label = model_label
+        self.field = field
+        self.threshold_setting = threshold_setting
+        self.interval_setting = interval_setting
+        self._pending = defaultdict(int)
+        self._buffered = 0
+        self._first_buffered_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def flush_threshold(self):
+        """int: Number of buffered increments that triggers a flush."""
+        return getattr(settings, self.threshold_setting, 100)
+
+    @property
+    def flush_interval(self):
+        """float: Maximum age in seconds of a buffered increment before a flush."""
+        return getattr(settings, self.interval_setting, 5)
+
+    def increment(self, pk, amount=1):
+        """Buffers an increment for the row with primary key ``pk``.
+
+        Args:
+            pk (int): Primary key of the row to increment
+            amount (int, optional): Value to add to the counter. Defaults to 1.
+        """
+        with self._lock:
+            self._pending[pk] += amount
+            self._buffered += 1
+            if self._first_buffered_at is None:
+                self._first_buffered_at = time.monotonic()
+            should_flush = (
+                self._buffered >= self.flush_threshold
+                or time.monotonic() - self._first_buffered_at >= self.flush_interval
+            )
+        if should_flush:
+            self.flush()
+
+    def pending(self, pk):
+        """Returns the not yet flushed increment for ``pk``.
+
+        Args:
+            pk (int): Primary key of the row
+
+        Returns:
+            int: Buffered increment, 0 if nothing is pending
+        """
+        with self._lock:
+            return self._pending.get(pk, 0)
+
+    def flush(self):
+        """Writes all buffered increments to the database.
+
+        On a database error the increments are put back into the buffer so
+        the next flush retries them.
+
+        Returns:
+            int: Number of rows that received an increment
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = defaultdict(int)
+            self._buffered = 0
+            self._first_buffered_at = None
+        if not pending:
+            return 0
+
+        by_amount = defaultdict(list)
+        for pk, amount in pending.items():
+            by_amount[amount].append(pk)
+
+        model = apps.get_model(self.model_label)
+        try:
+            for amount, pks in by_amount.items():
+                model.objects.filter(pk__in=pks).update(**{self.field: F(self.field) + amount})
+                for pk in pks:
+                    del pending[pk]
+        except Exception:
+            with self._lock:
+                for pk, amount in pending.items():
+                    self._pending[pk] += amount
+                    self._buffered += 1
+                if self._first_buffered_at is None:
+                    self._first_buffered_at = time.monotonic()
+            raise
+        return sum(len(pks) for pks in by_amount.values())
+
+    def clear(self):
+        """Drops all buffered increments without writing them."""
+        with self._lock:
+            self._pending = defaultdict(int)
+            self._buffered = 0
+            self._first_buffered_at = None
+
+
+views_count_buffer = CounterBuffer(
+    "articles.Article",
+    "views_count",
+    threshold_setting="ARTICLE_VIEWS_FLUSH_THRESHOLD",
+    interval_setting="ARTICLE_VIEWS_FLUSH_INTERVAL",
+)
+
+
+@atexit.register
+def _flush_on_exit():
+    """Flushes buffered view counts when the interpreter shuts down."""
+    try:
+        views_count_buffer.flush()
+    except Exception:
+        pass
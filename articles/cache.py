@@ -0,0 +1,182 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.http import urlencode
+
+
+POPULAR_TAGS_CACHE_KEY = "articles:popular_tags"
+
+
+class TieredCache:
+    """Two-level cache: a per-process L1 in front of a shared L2.
+
+    Reads try the local L1 first and fall back to the shared L2, copying hits
+    into L1. Writes go to both. Keys are expected to embed a version or
+    generation read from L2 (see ``ArticleCache``), so entries never need to
+    be deleted from the L1 of other processes: a bump simply stops them from
+    being addressed.
+
+    Attributes:
+        local_alias (str): Name of the L1 cache in ``CACHES``
+        shared_alias (str): Name of the L2 cache in ``CACHES``
+    """
+
+    def __init__(self, local_alias, shared_alias):
+        self.local_alias = local_alias
+        self.shared_alias = shared_alias
+
+    @property
+    def local(self):
+        """Returns the L1 cache backend."""
+        return caches[self.local_alias]
+
+    @property
+    def shared(self):
+        """Returns the L2 cache backend."""
+        return caches[self.shared_alias]
+
+    def get(self, key):
+        """Returns the cached value of ``key``, or None on a miss in both levels."""
+        value = self.local.get(key)
+        if value is None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.local.set(key, value, settings.ARTICLE_CACHE_L1_TIMEOUT)
+        return value
+
+    def set(self, key, value):
+        """Stores ``value`` in both levels."""
+        self.shared.set(key, value, settings.ARTICLE_CACHE_TIMEOUT)
+        self.local.set(key, value, settings.ARTICLE_CACHE_L1_TIMEOUT)
+
+
+class ArticleCache:
+    """Versioned cache of serialized article responses.
+
+    Detail entries are keyed by article id and a per-article version; list
+    pages are keyed by a hash of their query parameters and a global list
+    generation. Saving or deleting an article bumps its version and the list
+    generation, which invalidates every affected entry without scanning keys.
+
+    Engagements and buffered view counts only change counters, so they do
+    not bump the list generation: an engagement bumps the article's version
+    and, for pages carrying the viewer state, the engaging user's viewer
+    generation. List keys also embed a time window of
+    ``ARTICLE_LIST_COUNTERS_TIMEOUT`` seconds, so the counters of shared list
+    pages (and their ETags) are at most that old. Detail entries show
+    ``views_count`` as of when they were cached, at most
+    ``ARTICLE_CACHE_TIMEOUT`` seconds.
+
+    Counters are stored in L2 only, so every process sees a bump at once.
+    They start from the current time in nanoseconds rather than 1, so a
+    counter evicted and re-created can never collide with an older value
+    still addressing cached entries.
+    """
+    prefix = "articles:cache"
+
+    def __init__(self, store):
+        self.store = store
+
+    def _counter(self, key):
+        """Returns the current value of a version counter, creating it if missing."""
+        value = self.store.shared.get(key)
+        if value is None:
+            self.store.shared.add(key, time.time_ns(), None)
+            value = self.store.shared.get(key)
+        return value
+
+    def _bump(self, key):
+        """Increments a version counter, resetting it if it was evicted."""
+        try:
+            self.store.shared.incr(key)
+        except ValueError:
+            self.store.shared.set(key, time.time_ns(), None)
+
+    def version(self, article_id):
+        """Returns an article's current cache version.
+
+        The version changes whenever the article or one of its engagements
+        changes, so it also serves as a validator for conditional requests.
+
+        Args:
+            article_id (UUID): Public id of the article
+
+        Returns:
+            int: Current version
+        """
+        return self._counter(f"{self.prefix}:version:{article_id}")
+
+    def detail_key(self, article_id, variant="", version=None):
+        """Returns the cache key of an article's current serialized form.
+
+        Args:
+            article_id (UUID): Public id of the article
+            variant (str, optional): Extra key part, e.g. the request host used
+                in absolute URLs. Defaults to "".
+            version (int, optional): Version already read with ``version()``,
+                saving a round trip to L2. Defaults to the current version.
+
+        Returns:
+            str: Key embedding the article's current version
+        """
+        if version is None:
+            version = self.version(article_id)
+        return f"{self.prefix}:detail:{article_id}:{version}:{variant}"
+
+    def list_key(self, name, params, variant="", viewer_id=None):
+        """Returns the cache key of a list page.
+
+        Args:
+            name (str): Name of the list endpoint
+            params (QueryDict): Query parameters (filters, search, ordering, cursor, size)
+            variant (str, optional): Extra key part. Defaults to "".
+            viewer_id (int, optional): User whose engagement state the page
+                shows. Defaults to None, for pages without it.
+
+        Returns:
+            str: Key embedding the current list generation, counter window
+                and, with ``viewer_id``, viewer generation
+        """
+        generation = self._counter(f"{self.prefix}:generation")
+        window = int(time.time() // settings.ARTICLE_LIST_COUNTERS_TIMEOUT)
+        generation = f"{generation}.{window}"
+        if viewer_id is not None:
+            generation = f"{generation}.{self._counter(f'{self.prefix}:viewer:{viewer_id}')}"
+        query = urlencode(sorted(params.lists()), doseq=True)
+        digest = hashlib.sha1(f"{variant}?{query}".encode()).hexdigest()
+        return f"{self.prefix}:list:{name}:{generation}:{digest}"
+
+    def get(self, key):
+        """Returns a cached entry, or None."""
+        return self.store.get(key)
+
+    def set(self, key, value):
+        """Caches an entry."""
+        self.store.set(key, value)
+
+    def invalidate(self, article_id, lists=True, viewer_id=None):
+        """Invalidates an article's detail entries and the list pages showing the change.
+
+        Args:
+            article_id (UUID): Public id of the changed article
+            lists (bool, optional): Invalidate every cached list page. Pass
+                False for counter-only changes, which list pages pick up
+                within ``ARTICLE_LIST_COUNTERS_TIMEOUT``. Defaults to True.
+            viewer_id (int, optional): User whose viewer-state pages are
+                invalidated, for engagements. Defaults to None.
+        """
+        self._bump(f"{self.prefix}:version:{article_id}")
+        if lists:
+            self._bump(f"{self.prefix}:generation")
+        if viewer_id is not None:
+            self._bump(f"{self.prefix}:viewer:{viewer_id}")
+
+
+article_cache = ArticleCache(
+    TieredCache(
+        local_alias=getattr(settings, "ARTICLE_CACHE_L1_ALIAS", "local"),
+        shared_alias=getattr(settings, "ARTICLE_CACHE_L2_ALIAS", "default"),
+    )
+)
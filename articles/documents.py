@@ -0,0 +1,41 @@
+from django_elasticsearch_dsl import Document, fields
+from django_elasticsearch_dsl.registries import registry
+
+from articles.models import Article
+
+
+@registry.register_document
+class ArticleDocument(Document):
+    """Elasticsearch document indexing articles for full-text search.
+
+    Indexes the title, body, tags and author name as analysed text (with
+    keyword sub-fields for faceting) plus the creation date. Indexing is
+    driven by the signal handlers in ``articles.signals`` through the search
+    backend, so django-elasticsearch-dsl's own autosync signals are ignored.
+    """
+    title = fields.TextField(fields={"raw": fields.KeywordField()})
+    body = fields.TextField()
+    tags = fields.KeywordField(multi=True)
+    author_name = fields.TextField(fields={"raw": fields.KeywordField()})
+    created = fields.DateField()
+
+    class Index:
+        name = "articles"
+        settings = {"number_of_shards": 1, "number_of_replicas": 0}
+
+    class Django:
+        model = Article
+        ignore_signals = True
+        queryset_pagination = 500
+
+    def get_queryset(self):
+        """Returns articles with the author and tags loaded in bulk for indexing."""
+        return super().get_queryset().select_related("author").prefetch_related("tags")
+
+    def prepare_tags(self, instance):
+        """Returns the tag names of an article."""
+        return [tag.name for tag in instance.tags.all()]
+
+    def prepare_author_name(self, instance):
+        """Returns the full name of the article's author."""
+        return instance.author.full_name
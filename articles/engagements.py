@@ -0,0 +1,284 @@
+import uuid
+from collections import namedtuple
+from functools import partial
+
+from django.db import connections, router, transaction
+from django.http import Http404
+from django.utils import timezone
+
+from articles.cache import article_cache
+from articles.exceptions import CantClapOwnArticle, CantCommentOwnArticle, CantRateOwnArticle
+from articles.models import Article, Bookmark, Clap, Comment, Rating, engagement_deltas
+
+
+EngagementResult = namedtuple("EngagementResult", ["created", "article_pkid", "title"])
+
+
+class EngagementType(namedtuple("EngagementType", ["model", "own_article_error", "created_message", "exists_message"])):
+    """How one kind of engagement is written and reported.
+
+    Attributes:
+        model (Model): Engagement model
+        own_article_error (type): Exception for the author's own article, None if allowed
+        created_message (str): Message for a new engagement, formatted with ``title``
+        exists_message (str): Message for a duplicate, None if duplicates are allowed
+    """
+
+
+ENGAGEMENT_TYPES = {
+    "clap": EngagementType(
+        Clap, CantClapOwnArticle,
+        "You clapped on this article {title}", "You already clapped on this article {title}",
+    ),
+    "bookmark": EngagementType(
+        Bookmark, None,
+        "You bookmarked this article {title}", "You already bookmarked this article {title}",
+    ),
+    "rate": EngagementType(
+        Rating, CantRateOwnArticle,
+        "You rated this article {title}", "You already rated this article {title}",
+    ),
+    "comment": EngagementType(
+        Comment, CantCommentOwnArticle,
+        "You commented on this article {title}", None,
+    ),
+}
+
+
+def _row_params(model, connection, user, values):
+    """Prepares the column values of one new engagement row.
+
+    Args:
+        model (Model): Engagement model
+        connection (BaseDatabaseWrapper): Connection the row is written on
+        user (User): User engaging with the article
+        values (dict): Other field values
+
+    Returns:
+        tuple: Column names and their database values, in the same order
+    """
+    now = timezone.now()
+    row = {"id": uuid.uuid4(), "created": now, "updated": now, "user": user.pk, **values}
+    fields = [model._meta.get_field(name) for name in row]
+    return (
+        [field.column for field in fields],
+        [field.get_db_prep_save(value, connection) for field, value in zip(fields, row.values())],
+    )
+
+
+def _insert_sql(model, connection, columns, exclude_author):
+    """Builds the INSERT ... SELECT statement writing one engagement.
+
+    Args:
+        model (Model): Engagement model
+        connection (BaseDatabaseWrapper): Connection the statement runs on
+        columns (list): Columns filled from parameters, in order
+        exclude_author (bool): Skip the insert when the user wrote the article
+
+    Returns:
+        str: SQL with placeholders for the column values, the article UUID
+            and, when ``exclude_author`` is set, the user's primary key
+    """
+    qn = connection.ops.quote_name
+    table = qn(model._meta.db_table)
+    article_table = qn(Article._meta.db_table)
+    article_pk = qn(Article._meta.pk.column)
+    article_column = qn(model._meta.get_field("article").column)
+    condition = f"{qn(Article._meta.get_field('id').column)} = %s"
+    if exclude_author:
+        condition += f" AND {qn(Article._meta.get_field('author').column)} <> %s"
+    return (
+        f"INSERT INTO {table} ({', '.join(qn(column) for column in columns)}, {article_column}) "
+        f"SELECT {', '.join(['%s'] * len(columns))}, {article_pk} FROM {article_table} "
+        f"WHERE {condition} "
+        f"ON CONFLICT DO NOTHING "
+        f"RETURNING {article_column}, "
+        f"(SELECT {qn(Article._meta.get_field('title').column)} FROM {article_table} "
+        f"WHERE {article_table}.{article_pk} = {table}.{article_column})"
+    )
+
+
+def write_engagement(model, user, article_id, own_article_error=None, **values):
+    """Records a clap, bookmark, rating or comment in one statement.
+
+    The article is resolved by its UUID inside the insert itself
+    (``INSERT ... SELECT ... FROM articles_article``), and duplicates are
+    absorbed by ``ON CONFLICT DO NOTHING`` against the model's unique
+    constraint, so concurrent double submissions can never raise an
+    IntegrityError. ``RETURNING`` tells whether a row was written, which is
+    the common case and needs no further lookup. The article's counters are
+    bumped in the same transaction and its cached responses are invalidated
+    once it commits.
+
+    Only when nothing was inserted is the article read once more, to tell a
+    missing article, the author's own article and an existing engagement
+    apart.
+
+    Args:
+        model (Model): Engagement model (Clap, Bookmark, Rating or Comment)
+        user (User): User engaging with the article
+        article_id (UUID): Public id of the article
+        own_article_error (type, optional): Exception raised when the user
+            wrote the article; authors may engage with their own articles if omitted
+        **values: Other field values, e.g. ``rating`` and ``review``
+
+    Returns:
+        EngagementResult: ``created`` is False if the user had already engaged
+
+    Raises:
+        Http404: If no article has this id
+    """
+    connection = connections[router.db_for_write(model)]
+    columns, params = _row_params(model, connection, user, values)
+    params.append(Article._meta.get_field("id").get_db_prep_save(article_id, connection))
+    if own_article_error is not None:
+        params.append(user.pk)
+    sql = _insert_sql(model, connection, columns, own_article_error is not None)
+
+    with transaction.atomic(using=connection.alias):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            inserted = cursor.fetchone()
+        if inserted is not None:
+            article_pkid, title = inserted
+            Article.objects.filter(pkid=article_pkid).add_engagement(
+                **engagement_deltas(model(article_id=article_pkid, **values))
+            )
+            transaction.on_commit(
+                partial(article_cache.invalidate, article_id, lists=False, viewer_id=user.pk),
+                using=connection.alias,
+            )
+            return EngagementResult(True, article_pkid, title)
+
+    article = Article.objects.filter(id=article_id).values("pkid", "author_id", "title").first()
+    if article is None:
+        raise Http404
+    if own_article_error is not None and article["author_id"] == user.pk:
+        raise own_article_error
+    return EngagementResult(False, article["pkid"], article["title"])
+
+
+def _bulk_insert(model, user, rows):
+    """Inserts engagement rows with one multi-row insert-on-conflict statement.
+
+    Args:
+        model (Model): Engagement model
+        user (User): User engaging with the articles
+        rows (list): ``(article_pkid, values)`` pairs
+
+    Returns:
+        list: Article primary keys of the rows actually inserted; duplicates
+            of existing engagements are skipped
+    """
+    connection = connections[router.db_for_write(model)]
+    qn = connection.ops.quote_name
+    article_column = model._meta.get_field("article").column
+    placeholders, params = [], []
+    for article_pkid, values in rows:
+        columns, row_params = _row_params(model, connection, user, {**values, "article": article_pkid})
+        placeholders.append(f"({', '.join(['%s'] * len(columns))})")
+        params.extend(row_params)
+    sql = (
+        f"INSERT INTO {qn(model._meta.db_table)} ({', '.join(qn(column) for column in columns)}) "
+        f"VALUES {', '.join(placeholders)} "
+        f"ON CONFLICT DO NOTHING RETURNING {qn(article_column)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [article_pkid for article_pkid, in cursor.fetchall()]
+
+
+def write_engagements(user, operations):
+    """Records a batch of claps, bookmarks, ratings and comments.
+
+    All articles are resolved with one query, the own-article rules of
+    ``ENGAGEMENT_TYPES`` are applied in memory, and each engagement model is
+    written with a single multi-row insert-on-conflict statement whose
+    ``RETURNING`` rows tell new engagements from existing ones. Counters are
+    bumped with one UPDATE per touched article, in the same transaction.
+
+    Args:
+        user (User): User engaging with the articles
+        operations (list): Dicts with ``type`` (a key of ``ENGAGEMENT_TYPES``),
+            ``article`` (UUID) and ``values`` (other field values)
+
+    Returns:
+        list: One ``{"status": int, "message": str}`` dict per operation, in order
+    """
+    articles = {
+        article["id"]: article
+        for article in Article.objects.filter(id__in={operation["article"] for operation in operations})
+        .values("id", "pkid", "author_id", "title")
+    }
+
+    results = [None] * len(operations)
+    pending = {}
+    for index, operation in enumerate(operations):
+        kind = ENGAGEMENT_TYPES[operation["type"]]
+        article = articles.get(operation["article"])
+        if article is None:
+            results[index] = {"status": 404, "message": "Article not found"}
+        elif kind.own_article_error is not None and article["author_id"] == user.pk:
+            results[index] = {"status": kind.own_article_error.status_code,
+                              "message": str(kind.own_article_error.default_detail)}
+        else:
+            pending.setdefault(kind, []).append((index, article, operation["values"]))
+
+    deltas = {}
+    with transaction.atomic():
+        for kind, items in pending.items():
+            rows, seen = [], set()
+            for index, article, values in items:
+                # Later duplicates of the same engagement in one batch report
+                # as existing, like a second request would.
+                if kind.exists_message is None or article["pkid"] not in seen:
+                    rows.append((article["pkid"], values))
+                    seen.add(article["pkid"])
+            inserted = _bulk_insert(kind.model, user, rows) if rows else []
+            if kind.model is Comment and inserted:
+                # Raw inserts skip Comment.save, which derives the thread path.
+                Comment.objects.filter(user=user, path="").assign_paths()
+            remaining = {}
+            for article_pkid in inserted:
+                remaining[article_pkid] = remaining.get(article_pkid, 0) + 1
+            for index, article, values in items:
+                title = article["title"]
+                if remaining.get(article["pkid"]):
+                    remaining[article["pkid"]] -= 1
+                    results[index] = {"status": 201, "message": kind.created_message.format(title=title)}
+                    counters = deltas.setdefault((article["pkid"], article["id"]), {})
+                    for name, delta in engagement_deltas(kind.model(**values)).items():
+                        counters[name] = counters.get(name, 0) + delta
+                else:
+                    results[index] = {"status": 400, "message": kind.exists_message.format(title=title)}
+        for (article_pkid, article_id), counters in deltas.items():
+            Article.objects.filter(pkid=article_pkid).add_engagement(**counters)
+            transaction.on_commit(partial(article_cache.invalidate, article_id, lists=False, viewer_id=user.pk))
+    return results
+
+
+def viewer_state(user, article_pkids):
+    """Returns how a user engaged with each article of a page.
+
+    Runs one set-based query per engagement table, whatever the page size.
+
+    Args:
+        user (User): The reading user
+        article_pkids (Iterable[int]): Primary keys of the articles on the page
+
+    Returns:
+        dict: Article primary key mapped to ``has_clapped``, ``has_bookmarked``
+            and ``my_rating`` (None if the user did not rate it)
+    """
+    article_pkids = list(article_pkids)
+    clapped = set(Clap.objects.filter(user=user, article_id__in=article_pkids).values_list("article_id", flat=True))
+    bookmarked = set(Bookmark.objects.filter(user=user, article_id__in=article_pkids).values_list("article_id", flat=True))
+    ratings = dict(Rating.objects.filter(user=user, article_id__in=article_pkids).values_list("article_id", "rating"))
+    return {
+        pkid: {
+            "has_clapped": pkid in clapped,
+            "has_bookmarked": pkid in bookmarked,
+            "my_rating": ratings.get(pkid),
+        }
+        for pkid in article_pkids
+    }
@@ -36,4 +36,16 @@ class CantCommentOwnArticle(APIException):
     """
     status_code = status.HTTP_403_FORBIDDEN
     default_detail = _('You cannot comment on your own article.')
-    default_code = 'forbidden'
\ No newline at end of file
+    default_code = 'forbidden'
+
+
+class NotArticleAuthor(APIException):
+    """
+    Exception raised when a user requests statistics of someone else's article.
+    
+    This exception returns a 403 Forbidden status code; article statistics
+    are only shown to the article's author.
+    """
+    status_code = status.HTTP_403_FORBIDDEN
+    default_detail = _('Only the author can see the statistics of this article.')
+    default_code = 'forbidden'
@@ -61,7 +61,7 @@ class RatingFactory(factory.django.DjangoModelFactory):
     Generates ratings with:
     - Associated article from ArticleFactory
     - Associated user from UserFactory
-    - Default rating of '5' (Excellent)
+    - Default rating of 5 (Excellent)
     - Random review sentence
     """
     """Factory for creating Rating test instances.
@@ -69,7 +69,7 @@ class RatingFactory(factory.django.DjangoModelFactory):
     Generates ratings with:
     - Associated article from ArticleFactory
     - Associated user from UserFactory
-    - Default rating of '5' (Excellent)
+    - Default rating of 5 (Excellent)
     - Random review sentence
     """
     class Meta:
@@ -77,7 +77,7 @@ class RatingFactory(factory.django.DjangoModelFactory):
 
     article = factory.SubFactory(ArticleFactory)
     user = factory.SubFactory(UserFactory)
-    rating = '5'
+    rating = 5
     review = factory.Faker('sentence')
 
 
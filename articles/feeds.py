@@ -0,0 +1,194 @@
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+
+from articles.models import Article, TimelineEntry
+from profiles.models import Follow, Profile
+
+
+PULLED_AUTHORS_CACHE_KEY = "articles:feed:pulled_authors"
+PULLED_AUTHORS_CACHE_TIMEOUT = 300
+
+
+def follower_count(author_id):
+    """Returns the stored number of profiles following a user.
+
+    Args:
+        author_id (int): Primary key of the followed user
+
+    Returns:
+        int: Number of followers
+    """
+    return Profile.objects.filter(user_id=author_id).values_list("followers_count", flat=True).first() or 0
+
+
+def pulled_author_ids():
+    """Returns the users whose articles are merged into feeds at read time.
+
+    Authors with more than ``FEED_FANOUT_MAX_FOLLOWERS`` followers are not
+    fanned out: copying each of their articles into every follower timeline
+    would cost more than reading their recent articles when a feed is served.
+    The set is read from the ``followers_count`` index and cached briefly.
+
+    Returns:
+        set: User primary keys
+    """
+    author_ids = cache.get(PULLED_AUTHORS_CACHE_KEY)
+    if author_ids is None:
+        author_ids = set(
+            Profile.objects.filter(followers_count__gt=settings.FEED_FANOUT_MAX_FOLLOWERS)
+            .values_list("user_id", flat=True)
+        )
+        cache.set(PULLED_AUTHORS_CACHE_KEY, author_ids, PULLED_AUTHORS_CACHE_TIMEOUT)
+    return author_ids
+
+
+def fan_out_article(article):
+    """Copies a new article into the timeline of each follower of its author.
+
+    Entries are written with ``bulk_create`` in ``FEED_FANOUT_BATCH_SIZE``
+    batches and the affected timelines are trimmed. Authors above
+    ``FEED_FANOUT_MAX_FOLLOWERS`` are skipped; ``feed_queryset`` pulls their
+    articles instead.
+
+    Args:
+        article (Article): The published article
+
+    Returns:
+        int: Number of timelines written
+    """
+    if follower_count(article.author_id) > settings.FEED_FANOUT_MAX_FOLLOWERS:
+        if article.author_id not in pulled_author_ids():
+            # The author just crossed the threshold: refresh the cached set
+            # so readers start pulling this article right away.
+            cache.delete(PULLED_AUTHORS_CACHE_KEY)
+        return 0
+
+    follower_ids = iter(
+        Follow.objects.filter(from_profile__user_id=article.author_id)
+        .order_by("to_profile_id")
+        .values_list("to_profile__user_id", flat=True)
+    )
+    written = 0
+    while True:
+        batch = list(islice(follower_ids, settings.FEED_FANOUT_BATCH_SIZE))
+        if not batch:
+            return written
+        TimelineEntry.objects.bulk_create(
+            [
+                TimelineEntry(
+                    owner_id=owner_id, article_id=article.pkid,
+                    author_id=article.author_id, created=article.created,
+                )
+                for owner_id in batch
+            ],
+            ignore_conflicts=True,
+        )
+        trim_timelines(batch)
+        written += len(batch)
+
+
+def backfill_timeline(owner_id, author_ids):
+    """Copies the recent articles of newly followed authors into a timeline.
+
+    Authors above ``FEED_FANOUT_MAX_FOLLOWERS`` are skipped, as their
+    articles are pulled at read time.
+
+    Args:
+        owner_id (int): Primary key of the following user
+        author_ids (Iterable[int]): Primary keys of the followed users
+    """
+    entries = []
+    for author_id in author_ids:
+        if follower_count(author_id) > settings.FEED_FANOUT_MAX_FOLLOWERS:
+            continue
+        recent = (
+            Article.objects.filter(author_id=author_id)
+            .order_by("-created", "-pkid")
+            .values_list("pkid", "created")[:settings.FEED_FOLLOW_BACKFILL]
+        )
+        entries.extend(
+            TimelineEntry(owner_id=owner_id, article_id=pkid, author_id=author_id, created=created)
+            for pkid, created in recent
+        )
+    if entries:
+        TimelineEntry.objects.bulk_create(entries, ignore_conflicts=True)
+        trim_timelines([owner_id])
+
+
+def remove_from_timelines(owner_ids=None, author_ids=None):
+    """Deletes timeline entries after an unfollow.
+
+    Args:
+        owner_ids (Iterable[int], optional): Readers whose timelines are cleaned; all if omitted
+        author_ids (Iterable[int], optional): Authors whose articles are removed; all if omitted
+    """
+    entries = TimelineEntry.objects.all()
+    if owner_ids is not None:
+        entries = entries.filter(owner_id__in=owner_ids)
+    if author_ids is not None:
+        entries = entries.filter(author_id__in=author_ids)
+    entries.delete()
+
+
+def trim_timelines(owner_ids):
+    """Caps timelines at ``FEED_TIMELINE_LENGTH`` entries, dropping the oldest.
+
+    Only timelines more than ``FEED_TIMELINE_TRIM_SLACK`` entries over the cap
+    are trimmed, so a steady stream of new articles costs one trim per
+    ``FEED_TIMELINE_TRIM_SLACK`` articles instead of a delete per insert.
+
+    Args:
+        owner_ids (Iterable[int]): Readers whose timelines may have grown
+    """
+    length = settings.FEED_TIMELINE_LENGTH
+    overflowing = list(
+        TimelineEntry.objects.filter(owner_id__in=owner_ids)
+        .values("owner_id")
+        .annotate(total=Count("pk"))
+        .filter(total__gt=length + settings.FEED_TIMELINE_TRIM_SLACK)
+        .values_list("owner_id", flat=True)
+    )
+    if not overflowing:
+        return
+    expired = list(
+        TimelineEntry.objects.filter(owner_id__in=overflowing)
+        .annotate(position=Window(
+            RowNumber(),
+            partition_by=[F("owner_id")],
+            order_by=[F("created").desc(), F("article_id").desc()],
+        ))
+        .filter(position__gt=length)
+        .values_list("pk", flat=True)
+    )
+    TimelineEntry.objects.filter(pk__in=expired).delete()
+
+
+def feed_queryset(user):
+    """Returns the articles of a user's home feed.
+
+    Combines the user's materialized timeline with the articles of followed
+    authors that are pulled at read time (see ``pulled_author_ids``). The
+    result is an ``Article`` queryset, so keyset pagination over
+    ``(created, pkid)`` applies to both sources at once; the timeline part is
+    bounded by the timeline cap and the pulled part is served by the
+    ``(author, created, pkid)`` index.
+
+    Args:
+        user (User): Reader of the feed
+
+    Returns:
+        QuerySet: Articles, with list statistics annotated
+    """
+    condition = Q(pkid__in=TimelineEntry.objects.filter(owner=user).values("article_id"))
+    pulled = pulled_author_ids()
+    if pulled:
+        followed_pulled = list(
+            Profile.objects.filter(followers__user=user, user_id__in=pulled).values_list("user_id", flat=True)
+        )
+        if followed_pulled:
+            condition |= Q(author_id__in=followed_pulled)
+    return Article.objects.with_list_stats().filter(condition)
@@ -1,5 +1,26 @@
 import django_filters as filters
-from articles.models import Article
+from django.db import connections
+from django.db.models import Count, Exists, F, OuterRef, Q
+from django.db.models.lookups import IContains
+from rest_framework.filters import BaseFilterBackend
+
+from articles.models import Article, TaggedArticle
+from articles.search import get_search_backend
+
+
+class ILikeContains(IContains):
+    """Case-insensitive substring match rendered as ``ILIKE`` on PostgreSQL.
+
+    Django renders ``icontains`` as ``UPPER(col::text) LIKE UPPER(...)``,
+    which a trigram index on the raw column cannot serve; ``col ILIKE ...``
+    can. Other vendors keep the ``icontains`` SQL.
+    """
+
+    def as_postgresql(self, compiler, connection):
+        # Compiled directly, without the UPPER(::text) cast of icontains.
+        lhs_sql, lhs_params = compiler.compile(self.lhs)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs_sql} ILIKE {rhs_sql}", (*lhs_params, *rhs_params)
 
 
 class ArticleFilter(filters.FilterSet):
@@ -8,18 +29,33 @@ class ArticleFilter(filters.FilterSet):
     Provides filtering capabilities for Article model with:
     - Case-insensitive partial matching on author's first name
     - Case-insensitive partial matching on article title
+    - Comma-separated tag names, matching any (default) or all of them
+
+    On PostgreSQL both filters also accept close misspellings through
+    ``pg_trgm`` word similarity. The substring match is written as
+    ``ILIKE`` on the raw column (see ``ILikeContains``), so both lookups
+    are served by the trigram GIN indexes created in migration
+    ``articles.0007``.
 
     Attributes:
         author (CharFilter): Filter for author's first name (contains match, case-insensitive)
         title (CharFilter): Filter for article title (contains match, case-insensitive)
+        tags (CharFilter): Comma-separated tag names, e.g. ``?tags=django,python``
+        tags_match (ChoiceFilter): ``any`` or ``all`` of the tags; defaults to ``any``
     """
     
     author = filters.CharFilter(
-        "author__first_name", lookup_expr="icontains"
+        "author__first_name", method="filter_text"
     )
     
     title = filters.CharFilter(
-        "title", "icontains"
+        "title", method="filter_text"
+    )
+
+    tags = filters.CharFilter(method="filter_tags")
+
+    tags_match = filters.ChoiceFilter(
+        choices=[("any", "any"), ("all", "all")], method="filter_tags_match"
     )
     
     class Meta:
@@ -30,4 +66,75 @@ class ArticleFilter(filters.FilterSet):
         - The fields available for filtering and their default lookup expressions
         """
         model = Article
-        fields = ["author", "title"]
\ No newline at end of file
+        fields = ["author", "title"]
+
+    def filter_text(self, queryset, name, value):
+        """Filters a text field by substring, or trigram word similarity on PostgreSQL.
+
+        Args:
+            queryset (QuerySet): Articles to filter
+            name (str): Field path of the filter
+            value (str): Text entered by the client
+
+        Returns:
+            QuerySet: Filtered articles
+        """
+        condition = Q(ILikeContains(F(name), value))
+        if connections[queryset.db].vendor == "postgresql":
+            condition |= Q(**{f"{name}__trigram_word_similar": value})
+        return queryset.filter(condition)
+
+    def filter_tags(self, queryset, name, value):
+        """Filters articles by tag names through ``TaggedArticle``.
+
+        The tags are matched by name, then joined to articles on the
+        (tag, content_object) index, without taggit's content-type join.
+        With ``tags_match=all`` an article must carry every listed tag.
+
+        Args:
+            queryset (QuerySet): Articles to filter
+            name (str): Name of the filter
+            value (str): Comma-separated tag names
+
+        Returns:
+            QuerySet: Filtered articles
+        """
+        names = {tag.strip() for tag in value.split(",") if tag.strip()}
+        if not names:
+            return queryset
+        tagged = TaggedArticle.objects.filter(tag__name__in=names)
+        if self.form.cleaned_data.get("tags_match") == "all":
+            complete = (
+                tagged.values("content_object")
+                .annotate(matched=Count("tag", distinct=True))
+                .filter(matched=len(names))
+                .values("content_object")
+            )
+            return queryset.filter(pkid__in=complete)
+        return queryset.filter(Exists(tagged.filter(content_object=OuterRef("pkid"))))
+
+    def filter_tags_match(self, queryset, name, value):
+        """Leaves the queryset unchanged; ``filter_tags`` reads the match mode."""
+        return queryset
+
+
+class ArticleSearchFilter(BaseFilterBackend):
+    """Filter backend restricting a list of articles to a search query.
+
+    Replaces DRF's ``SearchFilter`` for articles: the ``search`` query
+    parameter is matched by the configured search backend (see
+    ``articles.search.get_search_backend``), so deployments using the
+    inverted index or Elasticsearch avoid ``icontains`` scans of the body.
+    A view may pin a backend with a ``search_backend`` attribute.
+
+    Attributes:
+        search_param (str): Name of the query parameter holding the query
+    """
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        backend = get_search_backend(getattr(view, "search_backend", None))
+        return backend.filter_queryset(queryset, query)
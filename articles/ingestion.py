@@ -0,0 +1,189 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db import close_old_connections
+
+
+logger = logging.getLogger(__name__)
+
+
+ViewEvent = namedtuple("ViewEvent", ["article_id", "user_id", "viewer_ip"])
+ViewEvent.__doc__ = """Compact view event queued by the article detail endpoint.
+
+Attributes:
+    article_id (int): Primary key (pkid) of the viewed article
+    user_id (int): Primary key of the viewing user
+    viewer_ip (str): IP address of the viewer, may be None
+"""
+
+
+class ViewEventPipeline:
+    """In-process, batched ingestion pipeline for article view events.
+
+    The request path only puts a ``ViewEvent`` on a bounded queue. A daemon
+    worker thread collects events into batches of ``ARTICLE_VIEW_EVENTS_BATCH_SIZE``
+    (or whatever arrived within ``ARTICLE_VIEW_EVENTS_FLUSH_INTERVAL`` seconds)
+    and hands them to ``ArticleView.record_views``, which dedupes them and
+    writes them with multi-row ``INSERT ... ON CONFLICT DO NOTHING`` statements.
+
+    The worker is started lazily on the first event of each process, so it
+    survives pre-fork servers. With ``ARTICLE_VIEW_EVENTS_WORKER`` disabled no
+    thread is started and events stay queued until ``drain()`` is called.
+    """
+
+    def __init__(self):
+        self._queue = None
+        self._worker = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    @property
+    def batch_size(self):
+        """int: Maximum number of events written per batch."""
+        return getattr(settings, "ARTICLE_VIEW_EVENTS_BATCH_SIZE", 500)
+
+    @property
+    def flush_interval(self):
+        """float: Seconds the worker waits to fill a batch before writing it."""
+        return getattr(settings, "ARTICLE_VIEW_EVENTS_FLUSH_INTERVAL", 1.0)
+
+    def _get_queue(self):
+        """Returns the queue of the current process, creating it after a fork."""
+        with self._lock:
+            if self._queue is None or self._pid != os.getpid():
+                self._queue = queue.Queue(
+                    maxsize=getattr(settings, "ARTICLE_VIEW_EVENTS_QUEUE_SIZE", 10000)
+                )
+                self._worker = None
+                self._pid = os.getpid()
+            return self._queue
+
+    def enqueue(self, event):
+        """Queues a view event without touching the database.
+
+        Events are dropped (and logged) when the queue is full, so a stalled
+        database can never block article reads.
+
+        Args:
+            event (ViewEvent): The view event to record
+
+        Returns:
+            bool: True if the event was queued, False if it was dropped
+        """
+        events = self._get_queue()
+        try:
+            events.put_nowait(event)
+        except queue.Full:
+            logger.warning("View event queue is full, dropping event for article %s", event.article_id)
+            return False
+        if getattr(settings, "ARTICLE_VIEW_EVENTS_WORKER", True):
+            self.start()
+        return True
+
+    def start(self):
+        """Starts the background worker thread if it is not running yet."""
+        self._get_queue()
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(
+                target=self._run, name="article-view-events", daemon=True
+            )
+            self._worker.start()
+
+    def _collect(self, events, block):
+        """Pulls up to one batch of events from the queue.
+
+        Args:
+            events (queue.Queue): Queue to read from
+            block (bool): Whether to wait up to ``flush_interval`` for events
+
+        Returns:
+            list: Collected events, possibly empty
+        """
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                if block:
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    batch.append(events.get(timeout=timeout))
+                else:
+                    batch.append(events.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """Worker loop writing batches until the process exits."""
+        events = self._get_queue()
+        while True:
+            batch = self._collect(events, block=True)
+            if not batch:
+                continue
+            try:
+                self.write_batch(batch)
+            except Exception:
+                logger.exception("Failed to write %d view events", len(batch))
+            finally:
+                close_old_connections()
+
+    def write_batch(self, batch):
+        """Writes one batch of events and flushes the resulting view counts.
+
+        Args:
+            batch (list): ``ViewEvent`` instances to write
+
+        Returns:
+            int: Number of new ``ArticleView`` rows
+        """
+        from articles.buffers import views_count_buffer
+
+        ArticleView = apps.get_model("articles", "ArticleView")
+        created = ArticleView.record_views(batch)
+        views_count_buffer.flush()
+        return created
+
+    def drain(self):
+        """Synchronously writes every queued event in the calling thread.
+
+        Returns:
+            int: Number of new ``ArticleView`` rows
+        """
+        events = self._get_queue()
+        created = 0
+        while True:
+            batch = self._collect(events, block=False)
+            if not batch:
+                return created
+            created += self.write_batch(batch)
+
+    def clear(self):
+        """Drops every queued event without writing it."""
+        events = self._get_queue()
+        while True:
+            try:
+                events.get_nowait()
+            except queue.Empty:
+                return
+
+
+view_events = ViewEventPipeline()
+
+
+@atexit.register
+def _drain_on_exit():
+    """Writes queued view events when the interpreter shuts down."""
+    try:
+        view_events.drain()
+    except Exception:
+        pass
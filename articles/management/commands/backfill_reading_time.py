@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from articles.models import Article
+
+
+class Command(BaseCommand):
+    """Backfills ``Article.word_count`` and ``Article.reading_time_minutes``.
+
+    Articles are processed in primary-key chunks: each chunk loads only the
+    primary key and body, recomputes the stats and writes them back with one
+    ``bulk_update``, so memory use is bounded by the chunk size.
+
+    Example:
+        python manage.py backfill_reading_time --batch-size 200
+    """
+    help = "Recomputes stored word counts and reading times for existing articles"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of articles loaded and updated per chunk"
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        processed = 0
+        last_pkid = 0
+        while True:
+            articles = list(
+                Article.objects.filter(pkid__gt=last_pkid)
+                .order_by("pkid")
+                .only("pkid", "body")[:batch_size]
+            )
+            if not articles:
+                break
+            for article in articles:
+                article.update_reading_stats()
+            Article.objects.bulk_update(articles, ["word_count", "reading_time_minutes"])
+            processed += len(articles)
+            last_pkid = articles[-1].pkid
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled reading time for {processed} articles"))
@@ -0,0 +1,134 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from articles.models import Article
+from articles.search import DatabaseSearchBackend, InvertedIndexSearchBackend
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    """Benchmarks the inverted index against the ``icontains`` search path.
+
+    Generates synthetic articles whose words follow a Zipf distribution,
+    builds the inverted index for them, then times the same random queries
+    (single words, two-word conjunctions, prefixes and phrases) through both
+    backends, both for ranked search and for filtering the article list.
+    Everything runs in one transaction that is rolled back at the end, so
+    the database is left untouched.
+
+    Example:
+        python manage.py benchmark_search --articles 100000 --queries 200
+    """
+    help = "Compares the inverted index search backend with icontains scans"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--articles", type=int, default=100000, help="Number of synthetic articles")
+        parser.add_argument("--words", type=int, default=120, help="Words per article body")
+        parser.add_argument("--vocabulary", type=int, default=20000, help="Number of distinct words")
+        parser.add_argument("--queries", type=int, default=100, help="Queries timed per backend")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed")
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.vocabulary = [self.make_word(rank) for rank in range(options["vocabulary"])]
+        self.weights = [1 / (rank + 1) for rank in range(options["vocabulary"])]
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            phrases = self.create_articles(options["articles"], options["words"])
+            self.stdout.write(f"Created {options['articles']} articles in {time.perf_counter() - started:.1f}s")
+
+            inverted = InvertedIndexSearchBackend()
+            started = time.perf_counter()
+            inverted.rebuild(batch_size=2000)
+            self.stdout.write(f"Built the inverted index in {time.perf_counter() - started:.1f}s")
+
+            queries = self.make_queries(options["queries"], phrases)
+            database = DatabaseSearchBackend()
+            for name, backend in (("icontains", database), ("inverted", inverted)):
+                self.report(f"{name} search", [self.time(lambda q: backend.search(q), query) for query in queries])
+                self.report(
+                    f"{name} list filter",
+                    [
+                        self.time(lambda q: list(backend.filter_queryset(Article.objects.all(), q)
+                                                 .order_by("-pkid").values_list("pkid", flat=True)[:10]), query)
+                        for query in queries
+                    ],
+                )
+            transaction.set_rollback(True)
+
+    def make_word(self, rank):
+        """Returns a pronounceable synthetic word, unique per rank."""
+        syllables = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "da", "fe", "go", "hu", "ji", "pe", "qu"]
+        word = ""
+        rank += 16
+        while rank:
+            rank, index = divmod(rank, len(syllables))
+            word += syllables[index]
+        return word
+
+    def sample(self, count):
+        """Draws Zipf-distributed words from the vocabulary."""
+        return self.random.choices(self.vocabulary, weights=self.weights, k=count)
+
+    def create_articles(self, count, words):
+        """Bulk creates the synthetic articles.
+
+        Returns:
+            list: Two-word phrases taken from article bodies, for phrase queries
+        """
+        author = User.objects.create(
+            email=f"search-benchmark-{time.time_ns()}@example.com", first_name="Bench", last_name="Mark"
+        )
+        phrases = []
+        batch = []
+        for index in range(count):
+            body_words = self.sample(words)
+            article = Article(author=author, title=" ".join(self.sample(6)), body=" ".join(body_words))
+            article.update_reading_stats()
+            batch.append(article)
+            if index % 500 == 0:
+                position = self.random.randrange(words - 1)
+                phrases.append(" ".join(body_words[position:position + 2]))
+            if len(batch) == 1000:
+                Article.objects.bulk_create(batch)
+                batch = []
+        Article.objects.bulk_create(batch)
+        return phrases
+
+    def make_queries(self, count, phrases):
+        """Builds a mix of word, conjunction, prefix and phrase queries."""
+        mid_frequency = self.vocabulary[50:2000]
+        queries = []
+        for index in range(count):
+            kind = index % 4
+            if kind == 0:
+                queries.append(self.random.choice(mid_frequency))
+            elif kind == 1:
+                queries.append(" ".join(self.random.sample(mid_frequency, 2)))
+            elif kind == 2:
+                queries.append(self.random.choice(mid_frequency)[:4] + "*")
+            else:
+                queries.append(f'"{self.random.choice(phrases)}"')
+        return queries
+
+    def time(self, run, query):
+        """Returns the wall-clock milliseconds of one query."""
+        started = time.perf_counter()
+        run(query)
+        return (time.perf_counter() - started) * 1000
+
+    def report(self, label, timings):
+        """Writes the median, 95th percentile and maximum of the timings."""
+        timings = sorted(timings)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(
+            f"{label:>24}: median {statistics.median(timings):8.1f} ms  "
+            f"p95 {p95:8.1f} ms  max {timings[-1]:8.1f} ms"
+        )
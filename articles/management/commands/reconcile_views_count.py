@@ -0,0 +1,73 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from articles.buffers import views_count_buffer
+from articles.models import Article, ArticleView
+from articles.sketches import HyperLogLog
+
+
+class Command(BaseCommand):
+    """Rebuilds the denormalized ``Article.views_count`` from ``ArticleView`` rows.
+
+    Buffered increments are flushed first, then articles are reconciled in
+    primary-key chunks so each UPDATE only locks a bounded number of rows.
+    When ``ARTICLE_VIEWS_MODE`` is ``sketch`` the counter is rebuilt from the
+    stored HyperLogLog sketches instead.
+
+    Example:
+        python manage.py reconcile_views_count --batch-size 5000
+    """
+    help = "Rebuilds Article.views_count from the ArticleView table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of articles updated per statement"
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        views_count_buffer.flush()
+
+        views = (
+            ArticleView.objects.filter(article=OuterRef("pkid"))
+            .order_by()
+            .values("article")
+            .annotate(total=Count("pkid"))
+            .values("total")
+        )
+        views_count = Coalesce(Subquery(views, output_field=IntegerField()), Value(0))
+
+        reconciled = 0
+        last_pkid = 0
+        while True:
+            pkids = list(
+                Article.objects.filter(pkid__gt=last_pkid)
+                .order_by("pkid")
+                .values_list("pkid", flat=True)[:batch_size]
+            )
+            if not pkids:
+                break
+            if settings.ARTICLE_VIEWS_MODE == "sketch":
+                self.reconcile_from_sketches(pkids)
+            else:
+                Article.objects.filter(pkid__in=pkids).update(views_count=views_count)
+            reconciled += len(pkids)
+            last_pkid = pkids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Reconciled views_count for {reconciled} articles"))
+
+    def reconcile_from_sketches(self, pkids):
+        """Sets views_count to the estimate of each article's all-time sketch.
+
+        Args:
+            pkids (list): Primary keys of the articles to reconcile
+        """
+        articles = list(Article.objects.filter(pkid__in=pkids).only("pkid", "views_sketch"))
+        for article in articles:
+            article.views_count = HyperLogLog.from_bytes(article.views_sketch).count()
+        Article.objects.bulk_update(articles, ["views_count"])
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from articles.models import Article
+
+
+class Command(BaseCommand):
+    """Rebuilds the denormalized engagement counters of every article.
+
+    ``clap_count``, ``bookmark_count``, ``comment_count``, ``rating_sum`` and
+    ``rating_count`` are recomputed from the engagement tables in
+    primary-key chunks, so each UPDATE only locks a bounded number of rows.
+    Use it after bulk imports or raw SQL writes that bypassed the counters.
+
+    Example:
+        python manage.py recount_engagement --batch-size 5000
+    """
+    help = "Rebuilds the clap, bookmark, comment and rating counters of articles"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of articles updated per statement"
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        recounted = 0
+        last_pkid = 0
+        while True:
+            pkids = list(
+                Article.objects.filter(pkid__gt=last_pkid)
+                .order_by("pkid")
+                .values_list("pkid", flat=True)[:batch_size]
+            )
+            if not pkids:
+                break
+            Article.objects.filter(pkid__in=pkids).recount_engagement()
+            recounted += len(pkids)
+            last_pkid = pkids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Recounted engagement for {recounted} articles"))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from articles.related import refresh_related_articles
+
+
+class Command(BaseCommand):
+    """Updates the precomputed related articles.
+
+    By default only the articles edited or clapped since the previous run
+    are recomputed; ``--full`` also refreshes the TF-IDF document
+    frequencies and recomputes every article. Meant to run periodically,
+    e.g. every few minutes incrementally and nightly in full.
+
+    Example:
+        python manage.py refresh_related_articles --full --batch-size 200
+    """
+    help = "Recomputes related articles from text, tags and clap co-occurrence"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recompute every article instead of those changed since the last run"
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of articles computed per batch"
+        )
+
+    def handle(self, *args, **options):
+        recomputed = refresh_related_articles(full=options["full"], batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Recomputed related articles for {recomputed} articles"))
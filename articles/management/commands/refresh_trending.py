@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from articles.trending import refresh_trending
+
+
+class Command(BaseCommand):
+    """Updates the trending article scores.
+
+    New views, claps, ratings and comments are folded into hourly buckets
+    from per-table high-water marks, then the top articles of every
+    ``TRENDING_WINDOWS`` window are recomputed from the buckets. Meant to
+    run every few minutes, e.g. from cron.
+
+    Example:
+        python manage.py refresh_trending --batch-size 10000
+    """
+    help = "Folds new engagement events into buckets and recomputes trending scores"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of events read per query"
+        )
+
+    def handle(self, *args, **options):
+        read, stored = refresh_trending(batch_size=options["batch_size"])
+        windows = ", ".join(f"{name}: {total}" for name, total in stored.items())
+        self.stdout.write(self.style.SUCCESS(f"Read {read} events; trending articles {windows}"))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from articles.stats import rollup_stats
+
+
+class Command(BaseCommand):
+    """Adds the views, claps and ratings recorded since the last run to the statistics rollups.
+
+    Each event table is aggregated from its own high-water mark on
+    ``created`` into hourly and daily rows, one day of events per
+    transaction. Meant to run every few minutes, e.g. from cron; the first
+    run rolls up the whole history.
+
+    Example:
+        python manage.py rollup_stats
+    """
+    help = "Aggregates new views, claps and ratings into hourly and daily statistics"
+
+    def handle(self, *args, **options):
+        added = rollup_stats()
+        self.stdout.write(self.style.SUCCESS(f"Added {added} hourly statistics groups"))
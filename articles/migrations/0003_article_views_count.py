@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:20
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def populate_views_count(apps, schema_editor):
+    """Copies the current number of ArticleView rows into the new counter."""
+    Article = apps.get_model("articles", "Article")
+    ArticleView = apps.get_model("articles", "ArticleView")
+    views = (
+        ArticleView.objects.filter(article=OuterRef("pkid"))
+        .order_by()
+        .values("article")
+        .annotate(total=Count("pkid"))
+        .values("total")
+    )
+    Article.objects.update(
+        views_count=Coalesce(Subquery(views, output_field=IntegerField()), Value(0))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='views_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of unique views, maintained by the view counter buffer', verbose_name='Views count'),
+        ),
+        migrations.RunPython(populate_views_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:22
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0003_article_views_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='views_sketch',
+            field=models.BinaryField(blank=True, help_text="HyperLogLog sketch of all unique viewers, used when ARTICLE_VIEWS_MODE is 'sketch'", null=True, verbose_name='Views sketch'),
+        ),
+        migrations.CreateModel(
+            name='ArticleViewSketch',
+            fields=[
+                ('pkid', models.BigAutoField(editable=False, primary_key=True, serialize=False)),
+                ('id', models.UUIDField(db_index=True, default=uuid.uuid4, unique=True)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+                ('day', models.DateField(verbose_name='Day')),
+                ('registers', models.BinaryField(verbose_name='Sketch registers')),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_sketches', to='articles.article')),
+            ],
+            options={
+                'unique_together': {('article', 'day')},
+            },
+        ),
+    ]
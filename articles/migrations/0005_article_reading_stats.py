@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0004_article_view_sketches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='reading_time_minutes',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Estimated reading time in minutes, recomputed when the body changes', verbose_name='Reading time'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of words in the body, recomputed when the body changes', verbose_name='Word count'),
+        ),
+    ]
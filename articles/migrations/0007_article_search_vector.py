@@ -0,0 +1,97 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:41
+
+import django.contrib.postgres.search
+from django.db import migrations
+from django.db.utils import OperationalError
+
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE FUNCTION articles_article_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A')
+            || setweight(to_tsvector('english', coalesce(NEW.body, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER articles_article_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, body ON articles_article
+    FOR EACH ROW EXECUTE FUNCTION articles_article_search_vector_update()
+    """,
+    "UPDATE articles_article SET search_vector = "
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') "
+    "|| setweight(to_tsvector('english', coalesce(body, '')), 'B')",
+    "CREATE INDEX articles_article_search_vector_gin ON articles_article USING gin (search_vector)",
+    "CREATE INDEX articles_article_title_trgm ON articles_article USING gin (title gin_trgm_ops)",
+    "CREATE INDEX users_customuser_first_name_trgm ON users_customuser USING gin (first_name gin_trgm_ops)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS users_customuser_first_name_trgm",
+    "DROP INDEX IF EXISTS articles_article_title_trgm",
+    "DROP INDEX IF EXISTS articles_article_search_vector_gin",
+    "DROP TRIGGER IF EXISTS articles_article_search_vector_trigger ON articles_article",
+    "DROP FUNCTION IF EXISTS articles_article_search_vector_update()",
+]
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE articles_article_fts USING fts5(title, body, tokenize = 'porter unicode61')",
+    "INSERT INTO articles_article_fts (rowid, title, body) SELECT pkid, title, body FROM articles_article",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TABLE IF EXISTS articles_article_fts",
+]
+
+
+def create_search_index(apps, schema_editor):
+    """Creates the full-text index of the database vendor.
+
+    PostgreSQL gets a trigger maintaining ``search_vector``, a GIN index on
+    it and trigram indexes for the title and author name filters. SQLite gets
+    an FTS5 table when the library supports it; other vendors get nothing and
+    keep using the ``icontains`` search backend.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        statements = POSTGRES_FORWARD
+    elif vendor == "sqlite":
+        try:
+            schema_editor.execute(SQLITE_FORWARD[0])
+        except OperationalError:
+            # SQLite compiled without FTS5
+            return
+        statements = SQLITE_FORWARD[1:]
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    """Drops the structures created by ``create_search_index``, leaving the pg_trgm extension."""
+    vendor = schema_editor.connection.vendor
+    statements = {"postgresql": POSTGRES_BACKWARD, "sqlite": SQLITE_BACKWARD}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0006_inverted_search_index'),
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Weighted title and body lexemes, maintained by a trigger on PostgreSQL', null=True, verbose_name='Search vector'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
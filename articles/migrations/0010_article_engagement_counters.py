@@ -0,0 +1,61 @@
+# Generated by Django 5.1.7 on 2026-10-18 18:59
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    """Counts the existing engagements of every article."""
+    Article = apps.get_model("articles", "Article")
+
+    def total(model_name, aggregate):
+        rows = (
+            apps.get_model("articles", model_name).objects.filter(article=OuterRef("pkid"))
+            .order_by().values("article").annotate(value=aggregate).values("value")
+        )
+        return Coalesce(Subquery(rows, output_field=IntegerField()), Value(0))
+
+    Article.objects.update(
+        clap_count=total("Clap", Count("pkid")),
+        bookmark_count=total("Bookmark", Count("pkid")),
+        comment_count=total("Comment", Count("pkid")),
+        rating_count=total("Rating", Count("pkid")),
+        rating_sum=total("Rating", Sum(Cast("rating", IntegerField()))),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0009_home_feed_timelines'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='bookmark_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of bookmarks, maintained on every bookmark write', verbose_name='Bookmark count'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='clap_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of claps, maintained on every clap write', verbose_name='Clap count'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of comments, maintained on every comment write', verbose_name='Comment count'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of ratings, maintained on every rating write', verbose_name='Rating count'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Sum of all ratings, maintained on every rating write', verbose_name='Rating sum'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import CharField, Value
+from django.db.models.functions import Cast, Concat, LPad
+
+
+def backfill_paths(apps, schema_editor):
+    """Gives every existing comment, all top-level, its one-segment path."""
+    Comment = apps.get_model("articles", "Comment")
+    Comment.objects.update(path=Concat(
+        LPad(Cast("pkid", CharField()), 12, Value("0")), Value("/"), output_field=CharField()
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0011_related_articles'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='replies', to='articles.comment'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(db_default='', default='', editable=False, max_length=255, verbose_name='Thread path'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='reply_count',
+            field=models.PositiveIntegerField(db_default=0, default=0, editable=False, help_text='Number of direct replies', verbose_name='Reply count'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['article', 'parent', 'created', 'pkid'], name='articles_comment_thread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['article', 'path'], name='articles_comment_path_idx'),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+    ]
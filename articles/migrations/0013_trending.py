@@ -0,0 +1,49 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0012_comment_threads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobcheckpoint',
+            name='last_pkid',
+            field=models.BigIntegerField(default=0, verbose_name='Last processed primary key'),
+        ),
+        migrations.CreateModel(
+            name='TrendingBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(verbose_name='Hour')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Views')),
+                ('claps', models.PositiveIntegerField(default=0, verbose_name='Claps')),
+                ('ratings', models.PositiveIntegerField(default=0, verbose_name='Ratings')),
+                ('comments', models.PositiveIntegerField(default=0, verbose_name='Comments')),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trending_buckets', to='articles.article')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['hour'], name='articles_trending_hour_idx')],
+                'unique_together': {('article', 'hour')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TrendingScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window', models.CharField(max_length=8, verbose_name='Window')),
+                ('score', models.FloatField(verbose_name='Score')),
+                ('computed', models.DateTimeField(verbose_name='Computed at')),
+                ('article', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trending_scores', to='articles.article')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['window', '-score'], name='articles_trending_rank_idx')],
+                'unique_together': {('window', 'article')},
+            },
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0013_trending'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleStatsDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Views')),
+                ('claps', models.PositiveIntegerField(default=0, verbose_name='Claps')),
+                ('ratings', models.PositiveIntegerField(default=0, verbose_name='Ratings')),
+                ('rating_sum', models.PositiveIntegerField(default=0, verbose_name='Sum of ratings')),
+                ('start', models.DateField(verbose_name='Day')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArticleStatsHourly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Views')),
+                ('claps', models.PositiveIntegerField(default=0, verbose_name='Claps')),
+                ('ratings', models.PositiveIntegerField(default=0, verbose_name='Ratings')),
+                ('rating_sum', models.PositiveIntegerField(default=0, verbose_name='Sum of ratings')),
+                ('start', models.DateTimeField(verbose_name='Hour')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='articleview',
+            index=models.Index(fields=['created'], name='articles_view_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='clap',
+            index=models.Index(fields=['created'], name='articles_clap_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['created'], name='articles_rating_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='articlestatsdaily',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='articles.article'),
+        ),
+        migrations.AddField(
+            model_name='articlestatsdaily',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='articlestatshourly',
+            name='article',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='articles.article'),
+        ),
+        migrations.AddField(
+            model_name='articlestatshourly',
+            name='author',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='articlestatsdaily',
+            index=models.Index(fields=['author', 'start'], name='articles_stats_day_author_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='articlestatsdaily',
+            unique_together={('article', 'start')},
+        ),
+        migrations.AddIndex(
+            model_name='articlestatshourly',
+            index=models.Index(fields=['author', 'start'], name='articles_stats_hour_author_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='articlestatshourly',
+            unique_together={('article', 'start')},
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:28
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, FloatField, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce
+
+
+def backfill_rating_summary(apps, schema_editor):
+    """Counts the existing ratings of every article per value and scores them."""
+    Article = apps.get_model("articles", "Article")
+    Rating = apps.get_model("articles", "Rating")
+
+    def total(stars):
+        rows = (
+            Rating.objects.filter(article=OuterRef("pkid"), rating=stars)
+            .order_by().values("article").annotate(value=Count("pk")).values("value")
+        )
+        return Coalesce(Subquery(rows, output_field=IntegerField()), Value(0))
+
+    Article.objects.update(**{f"rating_{stars}_count": total(stars) for stars in range(1, 6)})
+    weight = float(settings.RATING_PRIOR_WEIGHT)
+    Article.objects.filter(rating_count__gt=0).update(rating_score=(
+        (Value(weight * settings.RATING_PRIOR_MEAN) + Cast("rating_sum", FloatField()))
+        / (Value(weight) + Cast("rating_count", FloatField()))
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0014_stats_rollups'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of 1-star ratings, maintained on every rating write', verbose_name='1-star ratings'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of 2-star ratings, maintained on every rating write', verbose_name='2-star ratings'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of 3-star ratings, maintained on every rating write', verbose_name='3-star ratings'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of 4-star ratings, maintained on every rating write', verbose_name='4-star ratings'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of 5-star ratings, maintained on every rating write', verbose_name='5-star ratings'),
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='rating_score',
+            field=models.FloatField(default=0, editable=False, help_text='Bayesian-smoothed mean rating used for sorting, 0 when unrated', verbose_name='Rating score'),
+        ),
+        migrations.AlterField(
+            model_name='rating',
+            name='rating',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Poor'), (2, 'Fair'), (3, 'Good'), (4, 'Very Good'), (5, 'Excellent')]),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-rating_score', '-pkid'], name='articles_rating_score_idx'),
+        ),
+        migrations.RunPython(backfill_rating_summary, migrations.RunPython.noop),
+    ]
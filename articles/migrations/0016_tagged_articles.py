@@ -0,0 +1,75 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:32
+
+import django.db.models.deletion
+import taggit.managers
+from django.db import migrations, models
+
+
+def move_tags(apps, schema_editor):
+    """Moves the article rows of taggit's generic table into TaggedArticle."""
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    TaggedItem = apps.get_model("taggit", "TaggedItem")
+    TaggedArticle = apps.get_model("articles", "TaggedArticle")
+    content_type = ContentType.objects.filter(app_label="articles", model="article").first()
+    if content_type is None:
+        return
+    items = TaggedItem.objects.filter(content_type=content_type)
+    TaggedArticle.objects.bulk_create(
+        [
+            TaggedArticle(content_object_id=object_id, tag_id=tag_id)
+            for object_id, tag_id in items.values_list("object_id", "tag_id").iterator()
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+    items.delete()
+
+
+def restore_tags(apps, schema_editor):
+    """Copies TaggedArticle rows back into taggit's generic table."""
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    TaggedItem = apps.get_model("taggit", "TaggedItem")
+    TaggedArticle = apps.get_model("articles", "TaggedArticle")
+    content_type, _ = ContentType.objects.get_or_create(app_label="articles", model="article")
+    TaggedItem.objects.bulk_create(
+        [
+            TaggedItem(content_type=content_type, object_id=object_id, tag_id=tag_id)
+            for object_id, tag_id in TaggedArticle.objects.values_list("content_object_id", "tag_id").iterator()
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0015_rating_summary'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaggedArticle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_object', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tagged_items', to='articles.article')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='%(app_label)s_%(class)s_items', to='taggit.tag')),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='article',
+            name='tags',
+            field=taggit.managers.TaggableManager(blank=True, help_text='A comma-separated list of tags.', through='articles.TaggedArticle', to='taggit.Tag', verbose_name='Tags'),
+        ),
+        migrations.AddIndex(
+            model_name='taggedarticle',
+            index=models.Index(fields=['tag', 'content_object'], name='articles_tagged_tag_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='taggedarticle',
+            unique_together={('content_object', 'tag')},
+        ),
+        migrations.RunPython(move_tags, restore_tags),
+    ]
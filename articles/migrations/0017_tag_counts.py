@@ -0,0 +1,40 @@
+# Generated by Django 5.1.7 on 2026-10-18 20:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counts(apps, schema_editor):
+    """Counts the articles of every tag already in use."""
+    TaggedArticle = apps.get_model("articles", "TaggedArticle")
+    TagCount = apps.get_model("articles", "TagCount")
+    TagCount.objects.bulk_create(
+        [
+            TagCount(tag_id=tag_id, article_count=total)
+            for tag_id, total in TaggedArticle.objects.values("tag").annotate(total=Count("pk")).values_list("tag", "total")
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0016_tagged_articles'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagCount',
+            fields=[
+                ('tag', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='taggit.tag')),
+                ('article_count', models.PositiveIntegerField(default=0, verbose_name='Article count')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-article_count', 'tag'], name='articles_tagcount_rank_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
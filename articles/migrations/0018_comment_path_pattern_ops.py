@@ -0,0 +1,21 @@
+# Generated by Django 5.1.7 on 2026-10-18 20:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0017_tag_counts'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='comment',
+            name='articles_comment_path_idx',
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['article', 'path'], name='articles_comment_path_idx', opclasses=['int8_ops', 'varchar_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from articles.engagements import viewer_state
+
+
+class ViewerStateMixin:
+    """Adds the current user's engagement state to each listed article.
+
+    When the request has ``?viewer_state=1``, every item gets
+    ``has_clapped``, ``has_bookmarked`` and ``my_rating``, computed for the
+    whole page with one query per engagement table (see
+    ``articles.engagements.viewer_state``) and passed to the serializer
+    through its context.
+    """
+    viewer_state_query_param = "viewer_state"
+
+    def wants_viewer_state(self):
+        """Returns True if the request asked for the viewer state."""
+        value = self.request.query_params.get(self.viewer_state_query_param, "")
+        return value.lower() in ("1", "true", "yes")
+
+    def paginate_queryset(self, queryset):
+        """Paginates, then loads the viewer state of the page's articles."""
+        page = super().paginate_queryset(queryset)
+        if self.wants_viewer_state():
+            articles = page if page is not None else queryset
+            self.viewer_state = viewer_state(self.request.user, [article.pkid for article in articles])
+        return page
+
+    def get_serializer_context(self):
+        """Passes the page's viewer state to the serializer."""
+        context = super().get_serializer_context()
+        if getattr(self, "viewer_state", None) is not None:
+            context["viewer_state"] = self.viewer_state
+        return context
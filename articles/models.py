@@ -1,17 +1,224 @@
+import uuid
 from typing import Literal
-from django.db import models
+from collections import defaultdict
+from django.conf import settings
+from django.db import connections, models, router, transaction
+from django.db.models import Case, Count, F, FloatField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, Concat, Greatest, LPad
+from django.db.models.lookups import GreaterThan
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchVectorField
 from autoslug import AutoSlugField
 from taggit.managers import TaggableManager
+from taggit.models import Tag, TaggedItemBase
+from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from common.models import TimeStampedModel
-from articles.services import estimate_time_reading
+from articles.services import count_words, reading_time_from_word_count
+from articles.buffers import views_count_buffer
+from articles.ingestion import ViewEvent
+from articles.sketches import HyperLogLog
 
 
 User = get_user_model()
 
 
+def engagement_deltas(engagement, sign=1):
+    """Returns the counter changes caused by adding or removing an engagement.
+
+    Args:
+        engagement (Clap | Bookmark | Comment | Rating): The engagement
+        sign (int, optional): 1 when it was added, -1 when removed. Defaults to 1.
+
+    Returns:
+        dict: Counter field names mapped to deltas, for ``ArticleQuerySet.add_engagement``
+    """
+    if isinstance(engagement, Rating):
+        return {
+            "rating_count": sign,
+            "rating_sum": sign * engagement.rating,
+            f"rating_{engagement.rating}_count": sign,
+        }
+    return {ENGAGEMENT_COUNTERS[type(engagement)]: sign}
+
+
+def bayesian_rating(rating_sum, rating_count):
+    """Builds the expression of an article's smoothed rating score.
+
+    The mean rating is pulled towards ``RATING_PRIOR_MEAN`` as if
+    ``RATING_PRIOR_WEIGHT`` extra ratings of that value had been given, so
+    a single 5-star rating does not outrank many 4-star ones. Unrated
+    articles score 0 and sort last.
+
+    Args:
+        rating_sum (Expression): Sum of the article's ratings
+        rating_count (Expression): Number of ratings
+
+    Returns:
+        Case: Float expression usable in an UPDATE
+    """
+    weight = float(settings.RATING_PRIOR_WEIGHT)
+    score = (
+        (Value(weight * settings.RATING_PRIOR_MEAN) + Cast(rating_sum, FloatField()))
+        / (Value(weight) + Cast(rating_count, FloatField()))
+    )
+    return Case(When(GreaterThan(rating_count, 0), then=score), default=Value(0.0), output_field=FloatField())
+
+
+def _rating_bucket(stars):
+    """Returns the counter field of one bar of the rating histogram."""
+    return models.PositiveIntegerField(
+        _("%(stars)d-star ratings") % {"stars": stars},
+        help_text=_("Number of %(stars)d-star ratings, maintained on every rating write") % {"stars": stars},
+        default=0,
+        editable=False
+    )
+
+
+def _per_article_subquery(queryset, aggregate, output_field):
+    """Builds a correlated subquery aggregating related rows of each article.
+
+    Args:
+        queryset (QuerySet): Rows pointing at an article through an ``article`` FK
+        aggregate (Aggregate): Aggregate expression computed per article
+        output_field (Field): Field type of the aggregated value
+
+    Returns:
+        Subquery: Subquery yielding one value per outer article
+    """
+    return Subquery(
+        queryset.filter(article=OuterRef("pkid"))
+        .order_by()
+        .values("article")
+        .annotate(value=aggregate)
+        .values("value"),
+        output_field=output_field,
+    )
+
+
+class ArticleQuerySet(models.QuerySet):
+    """QuerySet with the builders shared by article list endpoints."""
+
+    def with_list_stats(self):
+        """Loads everything ArticleOutSerializer renders in a fixed number of queries.
+
+        Joins the author and prefetches the tags of the whole page with one
+        query through ``TaggedArticle``; the engagement counts are stored
+        columns of ``Article``, so serializing a page costs the same number
+        of queries whatever the page size.
+
+        Returns:
+            ArticleQuerySet: Queryset with the author joined and tags prefetched
+        """
+        return self.select_related("author").prefetch_related("tags")
+
+    def add_engagement(self, **deltas):
+        """Adjusts engagement counters in one UPDATE with ``F()`` expressions.
+
+        The counters are incremented in the database rather than read,
+        changed and saved, so concurrent writers never lose an update.
+        Results are clamped at zero. When the rating counters change, the
+        Bayesian ``rating_score`` is recomputed from their new values in the
+        same statement.
+
+        Args:
+            **deltas: Amount added to each counter, e.g. ``clap_count=1``
+
+        Returns:
+            int: Number of articles updated
+        """
+        updates = {name: Greatest(F(name) + delta, Value(0)) for name, delta in deltas.items()}
+        if "rating_count" in updates:
+            updates["rating_score"] = bayesian_rating(updates["rating_sum"], updates["rating_count"])
+        return self.update(**updates)
+
+    def recount_engagement(self):
+        """Recomputes the engagement counters from the engagement tables.
+
+        Returns:
+            int: Number of articles updated
+        """
+        def total(queryset, aggregate):
+            return Coalesce(_per_article_subquery(queryset, aggregate, models.IntegerField()), Value(0))
+
+        rating_sum = total(Rating.objects.all(), Sum("rating"))
+        rating_count = total(Rating.objects.all(), Count("pkid"))
+        return self.update(
+            clap_count=total(Clap.objects.all(), Count("pkid")),
+            bookmark_count=total(Bookmark.objects.all(), Count("pkid")),
+            comment_count=total(Comment.objects.all(), Count("pkid")),
+            rating_count=rating_count,
+            rating_sum=rating_sum,
+            rating_score=bayesian_rating(rating_sum, rating_count),
+            **{
+                f"rating_{stars}_count": total(Rating.objects.filter(rating=stars), Count("pkid"))
+                for stars in Rating.RatingChoices.values
+            },
+        )
+
+class ArticleManager(models.Manager.from_queryset(ArticleQuerySet)):
+    """Default Article manager that leaves the HyperLogLog sketch column unloaded."""
+
+    def get_queryset(self):
+        """Returns articles without the ``views_sketch`` and ``search_vector`` columns."""
+        return super().get_queryset().defer("views_sketch", "search_vector")
+
+
+class TaggedArticle(TaggedItemBase):
+    """
+    Assignment of a tag to an article.
+    A direct through model replacing taggit's generic ``TaggedItem``, so tag
+    filters and prefetches join on the integer article key instead of going
+    through content types.
+    """
+    content_object = models.ForeignKey("Article", on_delete=models.CASCADE, related_name="tagged_items")
+
+    class Meta:
+        """Keeps one row per article and tag, indexed by tag to find its articles."""
+        unique_together = ["content_object", "tag"]
+        indexes = [
+            models.Index(fields=["tag", "content_object"], name="articles_tagged_tag_idx"),
+        ]
+
+
+class TagCount(models.Model):
+    """
+    Number of articles carrying a tag.
+    Maintained from the tag signals (see ``articles.signals``) so the
+    popular tags endpoint reads the top of an index instead of grouping
+    every ``TaggedArticle`` row.
+    """
+    tag = models.OneToOneField(Tag, on_delete=models.CASCADE, primary_key=True, related_name="+")
+    article_count = models.PositiveIntegerField(_("Article count"), default=0)
+
+    class Meta:
+        """Indexes the counts for the most used tags first."""
+        indexes = [
+            models.Index(fields=["-article_count", "tag"], name="articles_tagcount_rank_idx"),
+        ]
+
+    @classmethod
+    def adjust(cls, tag_ids, delta):
+        """Adds ``delta`` to the article count of each tag, creating missing rows.
+
+        Args:
+            tag_ids (Iterable[int]): Primary keys of the tags
+            delta (int): Change of each count
+        """
+        tag_ids = set(tag_ids)
+        if not tag_ids:
+            return
+        cls.objects.bulk_create([cls(tag_id=tag_id) for tag_id in tag_ids], ignore_conflicts=True)
+        cls.objects.filter(tag_id__in=tag_ids).update(
+            article_count=Greatest(F("article_count") + delta, Value(0))
+        )
+
+    def __str__(self):
+        """Returns formatted string of the count."""
+        return f"{self.tag_id}: {self.article_count}"
+
+
 class Article(TimeStampedModel):
     """
     Represents a blog article or post in the system.
@@ -23,31 +230,156 @@ class Article(TimeStampedModel):
     slug = AutoSlugField(populate_from='title', unique=True)
     image = models.ImageField(_("Article banner"), help_text=_("Upload banner for image"), null=True, blank=True)
     body = models.TextField(_("Article body"), help_text=_("Article body"))
-    tags = TaggableManager()
+    tags = TaggableManager(through=TaggedArticle, blank=True)
+    views_count = models.PositiveIntegerField(
+        _("Views count"),
+        help_text=_("Number of unique views, maintained by the view counter buffer"),
+        default=0,
+        editable=False
+    )
+    views_sketch = models.BinaryField(
+        _("Views sketch"),
+        help_text=_("HyperLogLog sketch of all unique viewers, used when ARTICLE_VIEWS_MODE is 'sketch'"),
+        null=True,
+        blank=True
+    )
+
+    word_count = models.PositiveIntegerField(
+        _("Word count"),
+        help_text=_("Number of words in the body, recomputed when the body changes"),
+        default=0,
+        editable=False
+    )
+    reading_time_minutes = models.PositiveIntegerField(
+        _("Reading time"),
+        help_text=_("Estimated reading time in minutes, recomputed when the body changes"),
+        default=0,
+        editable=False
+    )
+    clap_count = models.PositiveIntegerField(
+        _("Clap count"),
+        help_text=_("Number of claps, maintained on every clap write"),
+        default=0,
+        editable=False
+    )
+    bookmark_count = models.PositiveIntegerField(
+        _("Bookmark count"),
+        help_text=_("Number of bookmarks, maintained on every bookmark write"),
+        default=0,
+        editable=False
+    )
+    comment_count = models.PositiveIntegerField(
+        _("Comment count"),
+        help_text=_("Number of comments, maintained on every comment write"),
+        default=0,
+        editable=False
+    )
+    rating_sum = models.PositiveIntegerField(
+        _("Rating sum"),
+        help_text=_("Sum of all ratings, maintained on every rating write"),
+        default=0,
+        editable=False
+    )
+    rating_count = models.PositiveIntegerField(
+        _("Rating count"),
+        help_text=_("Number of ratings, maintained on every rating write"),
+        default=0,
+        editable=False
+    )
+    rating_1_count = _rating_bucket(1)
+    rating_2_count = _rating_bucket(2)
+    rating_3_count = _rating_bucket(3)
+    rating_4_count = _rating_bucket(4)
+    rating_5_count = _rating_bucket(5)
+    rating_score = models.FloatField(
+        _("Rating score"),
+        help_text=_("Bayesian-smoothed mean rating used for sorting, 0 when unrated"),
+        default=0,
+        editable=False
+    )
+    search_vector = SearchVectorField(
+        _("Search vector"),
+        help_text=_("Weighted title and body lexemes, maintained by a trigger on PostgreSQL"),
+        null=True,
+        editable=False
+    )
+
+    objects = ArticleManager()
+
+    class Meta(TimeStampedModel.Meta):
+        """Indexes the keysets of the article lists: by date, overall and per author, and by rating score."""
+        indexes = [
+            models.Index(fields=["-created", "-pkid"], name="articles_created_pkid_idx"),
+            models.Index(fields=["author", "-created", "-pkid"], name="articles_author_created_idx"),
+            models.Index(fields=["-rating_score", "-pkid"], name="articles_rating_score_idx"),
+        ]
     
     def __str__(self):
         """Returns string representation of the article (its title)."""
         return str(self.title)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remembers the loaded body so ``save`` can tell whether it changed."""
+        instance = super().from_db(db, field_names, values)
+        if "body" in field_names:
+            instance._loaded_body = instance.body
+        return instance
+
+    def _body_changed(self):
+        """Returns True when the body differs from the one loaded from the database."""
+        if self._state.adding or not hasattr(self, "_loaded_body"):
+            return "body" not in self.get_deferred_fields()
+        return self.body is not self._loaded_body and self.body != self._loaded_body
+
+    def update_reading_stats(self):
+        """Recomputes ``word_count`` and ``reading_time_minutes`` from the body."""
+        self.word_count = count_words(self.body)
+        self.reading_time_minutes = reading_time_from_word_count(self.word_count)
+
+    def save(self, *args, **kwargs):
+        """Saves the article, recounting words only when the body changed."""
+        update_fields = kwargs.get("update_fields")
+        if self._body_changed() and (update_fields is None or "body" in update_fields):
+            self.update_reading_stats()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "word_count", "reading_time_minutes"}
+        super().save(*args, **kwargs)
+        if "body" not in self.get_deferred_fields():
+            self._loaded_body = self.body
     
     @property
     def time_reading(self):
-        """Calculates estimated reading time for the article in minutes.
+        """Returns the stored estimated reading time for the article in minutes.
         
         Returns:
             int: Estimated reading time in minutes, 0 if body is empty
         """
-        if self.body is None:
-            return estimate_time_reading(self)
-        return 0
+        return self.reading_time_minutes
 
     @property
-    def views_count(self):
-        """Returns total number of views for this article.
-        
+    def average_rating(self):
+        """Returns the mean rating from the stored counters.
+
         Returns:
-            int: Count of all ArticleView instances for this article
+            float: Mean rating, None if the article has no ratings
         """
-        return self.article_views.count()
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    @property
+    def rating_histogram(self):
+        """Returns the number of ratings of each value.
+
+        Returns:
+            dict: Rating value (1 to 5) mapped to its count
+        """
+        return {stars: getattr(self, f"rating_{stars}_count") for stars in Rating.RatingChoices.values}
+
+
+# Views looked up and inserted per statement, bounding the number of query parameters.
+VIEW_INSERT_BATCH = 500
 
 
 class ArticleView(TimeStampedModel):
@@ -60,8 +392,11 @@ class ArticleView(TimeStampedModel):
     viewer_ip = models.GenericIPAddressField(_("Viewer Ip"), null=True, blank=True)
     
     class Meta:
-        """Ensures each unique viewer (user or IP) is only counted once per article."""
+        """Ensures each unique viewer (user or IP) is only counted once per article; indexed by time for rollups."""
         unique_together = ["user", "article", "viewer_ip"]
+        indexes = [
+            models.Index(fields=["created"], name="articles_view_created_idx"),
+        ]
     
     @classmethod
     def record_view(cls, article, user, viewer_ip):
@@ -72,34 +407,245 @@ class ArticleView(TimeStampedModel):
             user (User): The user viewing (None for anonymous)
             viewer_ip (str): IP address of the viewer
         """
-        cls.objects.get_or_create(article=article, user=user, viewer_ip=viewer_ip)
-    
+        cls.record_views([ViewEvent(article.pkid, user.pk if user else None, viewer_ip)])
+
+    @classmethod
+    def record_views(cls, events):
+        """Records a batch of view events.
+
+        Duplicate events in the batch are collapsed first. Events without a
+        user are skipped because every view belongs to a user.
+
+        In the default ``exact`` mode (``ARTICLE_VIEWS_MODE``) views that already
+        exist are filtered out with a lookup on the exact (article, user, IP)
+        triples, the rest are written with ``INSERT ... ON CONFLICT DO NOTHING
+        RETURNING`` so concurrent writers can never fail on the unique
+        constraint, and each row actually inserted bumps
+        ``Article.views_count`` through the write-behind counter buffer. Rows
+        another process inserted in between are not returned, so they are
+        never counted twice.
+
+        In ``sketch`` mode the events are folded into the HyperLogLog sketches
+        instead, and ArticleView rows are only written when the
+        ``ARTICLE_VIEWS_AUDIT_LOG`` setting is enabled. Without those rows,
+        the growth of each article's estimate is added to the trending
+        buckets and stats rollups directly, since their jobs read views from
+        ArticleView.
+
+        Args:
+            events (Iterable[ViewEvent]): Events carrying article_id, user_id and viewer_ip
+
+        Returns:
+            int: Number of new ArticleView rows in exact mode, number of
+                distinct events folded into the sketches in sketch mode
+        """
+        unique_events = {
+            (event.article_id, event.user_id, event.viewer_ip)
+            for event in events
+            if event.user_id is not None
+        }
+        if not unique_events:
+            return 0
+
+        sketch_mode = getattr(settings, "ARTICLE_VIEWS_MODE", "exact") == "sketch"
+        if sketch_mode:
+            grown = ArticleViewSketch.record(unique_events)
+            if not getattr(settings, "ARTICLE_VIEWS_AUDIT_LOG", False):
+                from articles import stats, trending
+
+                now = timezone.now()
+                trending.add_views(grown, now)
+                stats.add_views(grown, now)
+                return len(unique_events)
+
+        events = list(unique_events)
+        inserted = []
+        for start in range(0, len(events), VIEW_INSERT_BATCH):
+            batch = events[start:start + VIEW_INSERT_BATCH]
+            # NULL IPs never conflict on the unique constraint, so existing
+            # rows are still looked up rather than left to ON CONFLICT alone.
+            existing = set(
+                cls.objects.filter(Q.create(
+                    [Q(article_id=article_id, user_id=user_id, viewer_ip=viewer_ip)
+                     for article_id, user_id, viewer_ip in batch],
+                    connector=Q.OR,
+                )).values_list("article_id", "user_id", "viewer_ip")
+            )
+            inserted += cls._insert_new([event for event in batch if event not in existing])
+        if sketch_mode:
+            return len(unique_events)
+        for article_id in inserted:
+            views_count_buffer.increment(article_id)
+        return len(inserted)
+
+    @classmethod
+    def _insert_new(cls, events):
+        """Inserts views with one multi-row insert-on-conflict statement.
+
+        Args:
+            events (list): ``(article_pkid, user_pk, viewer_ip)`` triples
+
+        Returns:
+            list: Article primary keys of the rows actually inserted
+        """
+        if not events:
+            return []
+        connection = connections[router.db_for_write(cls)]
+        qn = connection.ops.quote_name
+        fields = [cls._meta.get_field(name) for name in ("id", "created", "updated", "article", "user", "viewer_ip")]
+        now = timezone.now()
+        placeholders, params = [], []
+        for article_id, user_id, viewer_ip in events:
+            values = (uuid.uuid4(), now, now, article_id, user_id, viewer_ip)
+            placeholders.append(f"({', '.join(['%s'] * len(fields))})")
+            params.extend(field.get_db_prep_save(value, connection) for field, value in zip(fields, values))
+        sql = (
+            f"INSERT INTO {qn(cls._meta.db_table)} ({', '.join(qn(field.column) for field in fields)}) "
+            f"VALUES {', '.join(placeholders)} "
+            f"ON CONFLICT DO NOTHING RETURNING {qn(cls._meta.get_field('article').column)}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [article_id for article_id, in cursor.fetchall()]
+
     def __str__(self):
         """Returns formatted string of the viewing event."""
         return f"{self.article} viewed by {self.user} who has IP of {self.viewer_ip}"
 
 
+class ArticleViewSketch(TimeStampedModel):
+    """
+    Daily HyperLogLog sketch of an article's unique viewers.
+    Used instead of one ArticleView row per viewer when ARTICLE_VIEWS_MODE is 'sketch';
+    the all-time sketch lives on Article.views_sketch.
+    """
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="view_sketches")
+    day = models.DateField(_("Day"))
+    registers = models.BinaryField(_("Sketch registers"))
+
+    class Meta:
+        """Keeps one sketch per article and day."""
+        unique_together = ["article", "day"]
+
+    @staticmethod
+    def viewer_key(user_id, viewer_ip):
+        """Returns the identity hashed into a sketch for one viewer.
+
+        Args:
+            user_id (int): Primary key of the viewing user
+            viewer_ip (str): IP address of the viewer, may be None
+
+        Returns:
+            str: Viewer identity matching ArticleView's uniqueness rule
+        """
+        return f"{user_id}|{viewer_ip or ''}"
+
+    @classmethod
+    def record(cls, events):
+        """Folds view events into today's sketches and the all-time sketches.
+
+        Events are first merged into one in-memory sketch per article, then
+        each stored sketch is locked, merged and saved once per batch, which
+        makes concurrent workers merge into the same sketch safely.
+        ``Article.views_count`` is refreshed from the all-time estimate.
+
+        Args:
+            events (Iterable[tuple]): Distinct (article_id, user_id, viewer_ip) tuples
+
+        Returns:
+            dict: Article pkid mapped to the growth of its unique viewer
+                estimate, for articles whose estimate grew
+        """
+        batch = defaultdict(HyperLogLog)
+        for article_id, user_id, viewer_ip in events:
+            batch[article_id].add(cls.viewer_key(user_id, viewer_ip))
+        if not batch:
+            return {}
+
+        today = timezone.localdate()
+        # Rows are inserted and locked in a fixed order, so workers handling
+        # overlapping articles wait for each other instead of deadlocking.
+        with transaction.atomic():
+            cls.objects.bulk_create(
+                [cls(article_id=article_id, day=today, registers=b"") for article_id in sorted(batch)],
+                ignore_conflicts=True,
+            )
+            daily = list(
+                cls.objects.select_for_update().filter(article_id__in=batch, day=today).order_by("pk")
+            )
+            for sketch in daily:
+                merged = HyperLogLog.from_bytes(sketch.registers).merge(batch[sketch.article_id])
+                sketch.registers = merged.to_bytes()
+            cls.objects.bulk_update(daily, ["registers"])
+
+            articles = list(
+                Article.objects.select_for_update()
+                .filter(pkid__in=batch)
+                .only("pkid", "views_sketch", "views_count")
+                .order_by("pkid")
+            )
+            grown = {}
+            for article in articles:
+                merged = HyperLogLog.from_bytes(article.views_sketch).merge(batch[article.pkid])
+                article.views_sketch = merged.to_bytes()
+                count = merged.count()
+                if count > article.views_count:
+                    grown[article.pkid] = count - article.views_count
+                article.views_count = count
+            Article.objects.bulk_update(articles, ["views_sketch", "views_count"])
+        return grown
+
+    @classmethod
+    def estimate(cls, article, start=None, end=None):
+        """Estimates unique viewers of an article over a range of days.
+
+        Args:
+            article (Article): The article to estimate
+            start (date, optional): First day included. Defaults to the first sketch.
+            end (date, optional): Last day included. Defaults to the last sketch.
+
+        Returns:
+            int: Estimated number of unique viewers in the range
+        """
+        sketches = cls.objects.filter(article=article)
+        if start is not None:
+            sketches = sketches.filter(day__gte=start)
+        if end is not None:
+            sketches = sketches.filter(day__lte=end)
+        merged = HyperLogLog()
+        for registers in sketches.values_list("registers", flat=True).iterator():
+            merged.merge(HyperLogLog.from_bytes(registers))
+        return merged.count()
+
+    def __str__(self):
+        """Returns formatted string of the sketch."""
+        return f"Views sketch of {self.article} on {self.day}"
+
+
 class Rating(TimeStampedModel):
     """
     Represents a user's rating and review of an article.
     Allows users to rate articles on a 5-point scale with optional text review.
     """
-    class RatingChoices(models.TextChoices):
+    class RatingChoices(models.IntegerChoices):
         """Available rating choices with descriptive labels."""
-        POOR = '1', _("Poor")
-        FAIR = '2', _("Fair")
-        GOOD = '3', _("Good")
-        VERY_GOOD = '4', _("Very Good")
-        EXCELLENT = '5', _("Excellent")
+        POOR = 1, _("Poor")
+        FAIR = 2, _("Fair")
+        GOOD = 3, _("Good")
+        VERY_GOOD = 4, _("Very Good")
+        EXCELLENT = 5, _("Excellent")
        
     article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="ratings")
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="ratings")
-    rating = models.CharField(max_length=1, choices=RatingChoices.choices)
+    rating = models.PositiveSmallIntegerField(choices=RatingChoices.choices)
     review = models.CharField(max_length=200)
     
     class Meta:
-        """Ensures each user can only rate an article once."""
+        """Ensures each user can only rate an article once; indexed by time for rollups."""
         unique_together = ["user", "article"]
+        indexes = [
+            models.Index(fields=["created"], name="articles_rating_created_idx"),
+        ]
     
     def __str__(self):
         """Returns formatted string of the rating."""
@@ -132,24 +678,423 @@ class Clap(TimeStampedModel):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="claps")
     
     class Meta:
-        """Prevents duplicate claps by the same user for the same article."""
+        """Prevents duplicate claps by the same user for the same article; indexed by time for rollups."""
         unique_together = ["user", "article"]
+        indexes = [
+            models.Index(fields=["created"], name="articles_clap_created_idx"),
+        ]
     
     def __str__(self):
         """Returns formatted string of the clap action."""
         return f"{self.user} clapped for {self.article.title}"
 
 
+# Width of one zero-padded primary key in a comment's materialized path.
+COMMENT_PATH_STEP = 12
+
+
+class CommentQuerySet(models.QuerySet):
+    """QuerySet with the thread operations of comments."""
+
+    def top_level(self):
+        """Returns the comments that are not replies."""
+        return self.filter(parent__isnull=True)
+
+    def subtree(self, comment):
+        """Returns every reply below a comment, in thread order.
+
+        Descendants share the comment's path as a prefix, so they are
+        selected with one range scan of the (article, path) index rather
+        than one query per level. The prefix match does not depend on how
+        the database collation orders "/" against digits; the index uses
+        ``varchar_pattern_ops`` on PostgreSQL so ``LIKE 'prefix%'`` can
+        still use it under a non-C collation.
+
+        Args:
+            comment (Comment): Root of the subtree
+
+        Returns:
+            QuerySet: The replies, at any depth, ordered by path
+        """
+        return self.filter(
+            article_id=comment.article_id,
+            path__startswith=comment.path,
+        ).exclude(pkid=comment.pkid).order_by("path")
+
+    def assign_paths(self):
+        """Fills in the materialized paths of comments inserted in bulk.
+
+        Returns:
+            int: Number of comments updated
+        """
+        parent_path = Subquery(Comment.objects.filter(pkid=OuterRef("parent_id")).values("path")[:1])
+        return self.update(path=Concat(
+            Coalesce(parent_path, Value("")),
+            LPad(Cast("pkid", models.CharField()), COMMENT_PATH_STEP, Value("0")),
+            Value("/"),
+            output_field=models.CharField(),
+        ))
+
+    def recount_replies(self):
+        """Recomputes the reply counts from the replies that remain.
+
+        Returns:
+            int: Number of comments updated
+        """
+        replies = (
+            Comment.objects.filter(parent=OuterRef("pkid"))
+            .order_by().values("parent").annotate(total=Count("pkid")).values("total")
+        )
+        return self.update(
+            reply_count=Coalesce(Subquery(replies, output_field=models.IntegerField()), Value(0))
+        )
+
+
 class Comment(TimeStampedModel):
     """
-    Represents a user's comment on an article.
+    Represents a user's comment on an article, or a reply to another comment.
     Contains both a title and content body for structured feedback.
+
+    Threads are stored twice: ``parent`` points to the comment replied to,
+    and ``path`` is the materialized path of zero-padded primary keys from
+    the top-level comment down to this one (``000000000004/000000000009/``).
+    Sorting by path lists a thread depth-first in posting order, and a
+    subtree is a path prefix (see ``CommentQuerySet.subtree``).
     """
     article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="comments")
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="comments")
+    parent = models.ForeignKey(
+        "self", on_delete=models.CASCADE, null=True, blank=True, related_name="replies"
+    )
+    # Database defaults too, for the raw inserts of articles.engagements.
+    path = models.CharField(_("Thread path"), max_length=255, default="", db_default="", editable=False)
+    reply_count = models.PositiveIntegerField(
+        _("Reply count"), default=0, db_default=0, editable=False,
+        help_text=_("Number of direct replies")
+    )
     title = models.CharField(max_length=110)
     content = models.TextField()
-    
+
+    objects = CommentQuerySet.as_manager()
+
+    class Meta(TimeStampedModel.Meta):
+        """Indexes the top-level comments of an article in posting order, and threads by path."""
+        indexes = [
+            models.Index(fields=["article", "parent", "created", "pkid"], name="articles_comment_thread_idx"),
+            # Pattern operator classes keep prefix matches on path an index
+            # range scan under any collation; other backends ignore them.
+            models.Index(
+                fields=["article", "path"], name="articles_comment_path_idx",
+                opclasses=["int8_ops", "varchar_pattern_ops"],
+            ),
+        ]
+
+    @property
+    def depth(self):
+        """Returns the nesting level of the comment, 0 for top-level comments."""
+        return max(len(self.path) // (COMMENT_PATH_STEP + 1) - 1, 0)
+
+    def save(self, *args, **kwargs):
+        """Saves the comment, deriving its path from its primary key on insert."""
+        super().save(*args, **kwargs)
+        if not self.path:
+            prefix = self.parent.path if self.parent_id else ""
+            self.path = f"{prefix}{self.pkid:0{COMMENT_PATH_STEP}d}/"
+            Comment.objects.filter(pkid=self.pkid).update(path=self.path)
+
     def __str__(self):
         """Returns formatted string of the comment."""
         return f"Comment '{self.title}' on {self.article} by {self.user}"
+
+
+# Article counter maintained for each engagement model; ratings also keep a sum.
+ENGAGEMENT_COUNTERS = {
+    Clap: "clap_count",
+    Bookmark: "bookmark_count",
+    Comment: "comment_count",
+}
+
+
+class SearchTerm(models.Model):
+    """
+    A token of the built-in inverted search index with its document frequency.
+    Index tables use a plain auto primary key instead of TimeStampedModel to keep
+    postings narrow; they are fully derived from Article and can be rebuilt.
+    """
+    token = models.CharField(_("Token"), max_length=64, unique=True)
+    document_frequency = models.PositiveIntegerField(_("Document frequency"), default=0)
+
+    def __str__(self):
+        """Returns the token."""
+        return self.token
+
+
+class SearchPosting(models.Model):
+    """
+    Occurrences of one search term in one article.
+    Term frequency is weighted (title occurrences count more than body ones) and
+    positions are kept for phrase matching.
+    """
+    term = models.ForeignKey(SearchTerm, on_delete=models.CASCADE, related_name="postings")
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="search_postings")
+    term_frequency = models.PositiveIntegerField(_("Term frequency"))
+    positions = models.JSONField(_("Positions"), default=list)
+
+    class Meta:
+        """Keeps one posting per term and article; the unique index serves term lookups."""
+        unique_together = ["term", "article"]
+
+    def __str__(self):
+        """Returns formatted string of the posting."""
+        return f"{self.term} in article {self.article_id}"
+
+
+class SearchDocument(models.Model):
+    """
+    Per-article statistics of the built-in inverted search index.
+    Holds the weighted token length used for BM25 length normalisation.
+    """
+    article = models.OneToOneField(
+        Article, on_delete=models.CASCADE, primary_key=True, related_name="search_document"
+    )
+    length = models.PositiveIntegerField(_("Weighted token length"))
+
+    def __str__(self):
+        """Returns formatted string of the indexed document."""
+        return f"Search document of article {self.article_id}"
+
+
+class TimelineEntry(models.Model):
+    """
+    An article materialized into a reader's home feed.
+    Entries are written in bulk when a followed author publishes (fan-out on
+    write) and copy the article's author and creation time so a timeline can
+    be read, trimmed and cleaned up on unfollow from its own indexes.
+    """
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="timeline_entries")
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="timeline_entries")
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    created = models.DateTimeField(_("Article creation time"))
+
+    class Meta:
+        """Keeps one entry per reader and article, indexed for newest-first reads and unfollows."""
+        unique_together = ["owner", "article"]
+        indexes = [
+            models.Index(fields=["owner", "-created", "-article"], name="articles_timeline_owner_idx"),
+            models.Index(fields=["owner", "author"], name="articles_timeline_author_idx"),
+        ]
+
+    def __str__(self):
+        """Returns formatted string of the timeline entry."""
+        return f"Article {self.article_id} in the feed of {self.owner_id}"
+
+
+class JobCheckpoint(models.Model):
+    """
+    High-water mark of an incremental batch job.
+    A job processes the rows changed after ``position`` and moves it forward
+    once its work is committed, so an interrupted run resumes where the last
+    successful one stopped.
+    """
+    name = models.CharField(_("Job name"), max_length=100, unique=True)
+    position = models.DateTimeField(_("Processed up to"), null=True, blank=True)
+    last_pkid = models.BigIntegerField(_("Last processed primary key"), default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def position_of(cls, name):
+        """Returns the job's high-water mark, or None if it never completed.
+
+        Args:
+            name (str): Job name
+
+        Returns:
+            datetime: Time up to which changes were processed
+        """
+        return cls.objects.filter(name=name).values_list("position", flat=True).first()
+
+    @classmethod
+    def last_pkid_of(cls, name):
+        """Returns the last primary key processed by a job reading an append-only table.
+
+        Args:
+            name (str): Job name
+
+        Returns:
+            int: Primary key processed last, 0 if none
+        """
+        return cls.objects.filter(name=name).values_list("last_pkid", flat=True).first() or 0
+
+    @classmethod
+    def advance(cls, name, position=None, last_pkid=None):
+        """Moves the job's high-water mark.
+
+        Args:
+            name (str): Job name
+            position (datetime, optional): Time up to which changes are now processed
+            last_pkid (int, optional): Primary key up to which rows are now processed
+        """
+        defaults = {}
+        if position is not None:
+            defaults["position"] = position
+        if last_pkid is not None:
+            defaults["last_pkid"] = last_pkid
+        cls.objects.update_or_create(name=name, defaults=defaults)
+
+    def __str__(self):
+        """Returns formatted string of the checkpoint."""
+        return f"{self.name} at {self.position}"
+
+
+class RelatedTerm(models.Model):
+    """
+    Document frequency of a token over all articles, for related-article TF-IDF.
+    Snapshotted by full runs of ``refresh_related_articles``; incremental runs
+    weigh changed articles against the latest snapshot.
+    """
+    token = models.CharField(_("Token"), max_length=64, unique=True)
+    document_frequency = models.PositiveIntegerField(_("Document frequency"))
+
+    def __str__(self):
+        """Returns formatted string of the term."""
+        return f"{self.token} ({self.document_frequency})"
+
+
+class ArticleKeyword(models.Model):
+    """
+    One of an article's top TF-IDF terms, with its L2-normalized weight.
+    Two articles' text similarity is the dot product of their keyword
+    weights, found through the token index.
+    """
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="keywords")
+    token = models.CharField(_("Token"), max_length=64)
+    weight = models.FloatField(_("Weight"))
+
+    class Meta:
+        """Keeps one weight per article and token, indexed by token to find articles sharing it."""
+        unique_together = ["article", "token"]
+        indexes = [
+            models.Index(fields=["token"], name="articles_keyword_token_idx"),
+        ]
+
+    def __str__(self):
+        """Returns formatted string of the keyword."""
+        return f"{self.token} in {self.article_id} ({self.weight:.3f})"
+
+
+class RelatedArticle(models.Model):
+    """
+    A precomputed nearest neighbour of an article, written by ``refresh_related_articles``.
+    Each article keeps its ``RELATED_ARTICLES_LIMIT`` best neighbours, so
+    serving them is one range scan of the (article, -score) index.
+    """
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="related_links")
+    related = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="related_to")
+    score = models.FloatField(_("Score"))
+    computed = models.DateTimeField(_("Computed at"))
+
+    class Meta:
+        """Keeps one score per pair, indexed for best-first reads."""
+        unique_together = ["article", "related"]
+        indexes = [
+            models.Index(fields=["article", "-score"], name="articles_related_rank_idx"),
+        ]
+
+    def __str__(self):
+        """Returns formatted string of the neighbour."""
+        return f"{self.related_id} related to {self.article_id} ({self.score:.3f})"
+
+
+class TrendingBucket(models.Model):
+    """
+    Engagement events of an article during one hour, folded in by ``refresh_trending``.
+    Buckets are the event deltas trending scores are computed from, so the
+    raw view, clap, rating and comment tables are only read once per event;
+    buckets older than the longest trending window are dropped.
+    """
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="trending_buckets")
+    hour = models.DateTimeField(_("Hour"))
+    views = models.PositiveIntegerField(_("Views"), default=0)
+    claps = models.PositiveIntegerField(_("Claps"), default=0)
+    ratings = models.PositiveIntegerField(_("Ratings"), default=0)
+    comments = models.PositiveIntegerField(_("Comments"), default=0)
+
+    class Meta:
+        """Keeps one bucket per article and hour, indexed by hour for window scans and pruning."""
+        unique_together = ["article", "hour"]
+        indexes = [
+            models.Index(fields=["hour"], name="articles_trending_hour_idx"),
+        ]
+
+    def __str__(self):
+        """Returns formatted string of the bucket."""
+        return f"{self.article_id} at {self.hour:%Y-%m-%d %H}:00"
+
+
+class TrendingScore(models.Model):
+    """
+    Trending score of an article over one window, written by ``refresh_trending``.
+    Only the ``TRENDING_LIMIT`` best articles of each window are stored, so
+    the trending listing is one range scan of the (window, -score) index.
+    """
+    window = models.CharField(_("Window"), max_length=8)
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="trending_scores")
+    score = models.FloatField(_("Score"))
+    computed = models.DateTimeField(_("Computed at"))
+
+    class Meta:
+        """Keeps one score per window and article, indexed for best-first reads."""
+        unique_together = ["window", "article"]
+        indexes = [
+            models.Index(fields=["window", "-score"], name="articles_trending_rank_idx"),
+        ]
+
+    def __str__(self):
+        """Returns formatted string of the score."""
+        return f"{self.article_id} trending {self.window} ({self.score:.3f})"
+
+
+class StatsRollup(models.Model):
+    """
+    Abstract engagement totals of an article over one time bucket.
+    Rollups are filled by ``rollup_stats`` from the raw view, clap and rating
+    rows, so statistics endpoints never aggregate the raw tables. The author
+    is copied in to sum an author's articles from one index range.
+    """
+    article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name="+")
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    views = models.PositiveIntegerField(_("Views"), default=0)
+    claps = models.PositiveIntegerField(_("Claps"), default=0)
+    ratings = models.PositiveIntegerField(_("Ratings"), default=0)
+    rating_sum = models.PositiveIntegerField(_("Sum of ratings"), default=0)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        """Returns formatted string of the rollup."""
+        return f"{self.article_id} at {self.start}"
+
+
+class ArticleStatsHourly(StatsRollup):
+    """Engagement totals of an article during one hour."""
+    start = models.DateTimeField(_("Hour"))
+
+    class Meta:
+        """Keeps one row per article and hour, indexed for author summaries."""
+        unique_together = ["article", "start"]
+        indexes = [
+            models.Index(fields=["author", "start"], name="articles_stats_hour_author_idx"),
+        ]
+
+
+class ArticleStatsDaily(StatsRollup):
+    """Engagement totals of an article during one day (UTC)."""
+    start = models.DateField(_("Day"))
+
+    class Meta:
+        """Keeps one row per article and day, indexed for author summaries."""
+        unique_together = ["article", "start"]
+        indexes = [
+            models.Index(fields=["author", "start"], name="articles_stats_day_author_idx"),
+        ]
@@ -1,16 +1,50 @@
 from rest_framework.pagination import PageNumberPagination
 
+from common.paginations import KeysetPagination
 
-class ArticlePagination(PageNumberPagination):
+
+class ArticlePagination(KeysetPagination):
     """Custom pagination class for Article API endpoints.
     
-    Provides configurable pagination with:
+    Provides configurable keyset pagination with:
     - Default page size of 2 items
     - Client-configurable page size via query parameter
     - Maximum allowed page size of 10 items
     
-    Inherits from DRF's PageNumberPagination to implement page-number style pagination.
+    Inherits from KeysetPagination: pages are addressed by opaque cursors over
+    ``(created, pkid)``, served by the ``articles_created_pkid_idx`` index,
+    and no count query is run.
+    """
+    page_size = 2
+    page_size_query_param = "size"
+    max_page_size = 10
+
+
+class CommentPagination(KeysetPagination):
+    """Keyset pagination of an article's top-level comments, oldest first.
+    
+    Served by the ``articles_comment_thread_idx`` index.
+    """
+    page_size = 10
+    page_size_query_param = "size"
+    max_page_size = 50
+    ordering = ("created", "pkid")
+
+
+class CommentThreadPagination(CommentPagination):
+    """Keyset pagination of a comment's replies in thread (path) order.
+    
+    Served by the ``articles_comment_path_idx`` index.
+    """
+    ordering = ("path", "pkid")
+
+
+class ArticleSearchPagination(PageNumberPagination):
+    """Pagination settings for the relevance-ranked search endpoint.
+    
+    Search hits are ordered by score rather than by a column, so they are
+    addressed by page number and the backend applies the offset.
     """
     page_size = 2
     page_size_query_param = "size"
-    max_page_size = 10
\ No newline at end of file
+    max_page_size = 10
@@ -0,0 +1,378 @@
+import heapq
+import math
+from collections import Counter, defaultdict
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from articles.models import Article, ArticleKeyword, Clap, JobCheckpoint, RelatedArticle, RelatedTerm, TaggedArticle
+from articles.search import tokenize
+
+
+JOB_NAME = "related_articles"
+
+# Title tokens count as many times as body tokens, like the search index.
+TITLE_WEIGHT = 3
+
+# Changes committed while the previous run was starting are picked up again.
+CHECKPOINT_OVERLAP = timedelta(minutes=1)
+
+# Largest IN list sent to the database at once.
+LOOKUP_CHUNK = 500
+
+
+def _chunks(values, size):
+    """Yields successive lists of at most ``size`` values."""
+    iterator = iter(values)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _terms(article):
+    """Returns the term frequencies of an article's title and body.
+
+    Args:
+        article (dict): ``title`` and ``body`` of the article
+
+    Returns:
+        Counter: Token mapped to its weighted number of occurrences
+    """
+    counts = Counter(token[:64] for token in tokenize(article["body"]))
+    for token in tokenize(article["title"]):
+        counts[token[:64]] += TITLE_WEIGHT
+    return counts
+
+
+def snapshot_document_frequencies(batch_size=500):
+    """Recounts the document frequency of every token into ``RelatedTerm``.
+
+    Articles are streamed in primary-key batches; only the token counter is
+    held in memory, so the footprint grows with the vocabulary rather than
+    with the corpus. Tokens of a single article can never relate two
+    articles and are not stored.
+
+    Args:
+        batch_size (int, optional): Articles read per query. Defaults to 500.
+
+    Returns:
+        int: Number of terms stored
+    """
+    frequencies = Counter()
+    last_pkid = 0
+    while True:
+        articles = list(
+            Article.objects.filter(pkid__gt=last_pkid).order_by("pkid")
+            .values("pkid", "title", "body")[:batch_size]
+        )
+        if not articles:
+            break
+        for article in articles:
+            frequencies.update(_terms(article).keys())
+        last_pkid = articles[-1]["pkid"]
+
+    with transaction.atomic():
+        RelatedTerm.objects.all().delete()
+        RelatedTerm.objects.bulk_create(
+            (RelatedTerm(token=token, document_frequency=total)
+             for token, total in frequencies.items() if total > 1),
+            batch_size=1000,
+        )
+    return sum(1 for total in frequencies.values() if total > 1)
+
+
+def extract_keywords(article_pkids):
+    """Recomputes the stored TF-IDF keywords of a batch of articles.
+
+    Each article keeps its ``RELATED_ARTICLES_KEYWORDS`` heaviest terms,
+    weighted ``(1 + log tf) * log(N / df)`` and L2-normalized, so the dot
+    product of two keyword sets is their cosine similarity. Terms found in
+    more than ``RELATED_ARTICLES_MAX_FANOUT`` articles are skipped: they say
+    little about the topic and would make every lookup through them large.
+
+    Args:
+        article_pkids (list): Articles to recompute
+
+    Returns:
+        dict: Article pkid mapped to its new ``{token: weight}`` keywords
+    """
+    articles = list(Article.objects.filter(pkid__in=article_pkids).values("pkid", "title", "body"))
+    terms = {article["pkid"]: _terms(article) for article in articles}
+    tokens = set().union(*terms.values())
+    frequencies = {}
+    for chunk in _chunks(tokens, LOOKUP_CHUNK):
+        frequencies.update(
+            RelatedTerm.objects.filter(token__in=chunk).values_list("token", "document_frequency")
+        )
+    total = max(Article.objects.count(), 2)
+
+    keywords = {}
+    for pkid, counts in terms.items():
+        weighted = (
+            (token, (1 + math.log(count)) * math.log(total / frequencies[token]))
+            for token, count in counts.items()
+            if frequencies.get(token, settings.RELATED_ARTICLES_MAX_FANOUT + 1) <= settings.RELATED_ARTICLES_MAX_FANOUT
+        )
+        top = heapq.nlargest(settings.RELATED_ARTICLES_KEYWORDS, weighted, key=lambda item: item[1])
+        norm = math.sqrt(sum(weight * weight for _, weight in top)) or 1
+        keywords[pkid] = {token: weight / norm for token, weight in top if weight > 0}
+
+    with transaction.atomic():
+        ArticleKeyword.objects.filter(article__in=article_pkids).delete()
+        ArticleKeyword.objects.bulk_create(
+            (ArticleKeyword(article_id=pkid, token=token, weight=weight)
+             for pkid, weights in keywords.items() for token, weight in weights.items()),
+            batch_size=1000,
+        )
+    return keywords
+
+
+def text_similarities(article_pkids):
+    """Computes the TF-IDF cosine between each article and every article sharing a keyword.
+
+    This is the sparse product of the batch's keyword rows with the keyword
+    matrix, evaluated through the token index: one query fetches the
+    postings of every token of the batch.
+
+    Args:
+        article_pkids (list): Articles to compare
+
+    Returns:
+        dict: Article pkid mapped to a Counter of other pkid -> cosine
+    """
+    keywords = defaultdict(dict)
+    for pkid, token, weight in ArticleKeyword.objects.filter(article__in=article_pkids).values_list(
+        "article_id", "token", "weight"
+    ):
+        keywords[pkid][token] = weight
+    postings = defaultdict(list)
+    tokens = set().union(*keywords.values()) if keywords else set()
+    for chunk in _chunks(tokens, LOOKUP_CHUNK):
+        for token, pkid, weight in ArticleKeyword.objects.filter(token__in=chunk).values_list(
+            "token", "article_id", "weight"
+        ):
+            postings[token].append((pkid, weight))
+
+    scores = {pkid: Counter() for pkid in article_pkids}
+    for pkid, weights in keywords.items():
+        for token, weight in weights.items():
+            for other, other_weight in postings[token]:
+                if other != pkid:
+                    scores[pkid][other] += weight * other_weight
+    return scores
+
+
+def tag_similarities(article_pkids):
+    """Computes the tag overlap between each article and every article sharing a tag.
+
+    Overlap is the cosine of the binary tag vectors,
+    ``shared / sqrt(|tags(a)| * |tags(b)|)``. Tags on more than
+    ``RELATED_ARTICLES_MAX_FANOUT`` articles are skipped.
+
+    Args:
+        article_pkids (list): Articles to compare
+
+    Returns:
+        dict: Article pkid mapped to a Counter of other pkid -> overlap
+    """
+    items = TaggedArticle.objects.all()
+    tags = defaultdict(set)
+    for pkid, tag_id in items.filter(content_object_id__in=article_pkids).values_list("content_object_id", "tag_id"):
+        tags[pkid].add(tag_id)
+    tag_ids = set().union(*tags.values()) if tags else set()
+    narrow = set(
+        items.filter(tag_id__in=tag_ids).values("tag_id").annotate(total=Count("pk"))
+        .filter(total__lte=settings.RELATED_ARTICLES_MAX_FANOUT).values_list("tag_id", flat=True)
+    )
+    tagged = defaultdict(list)
+    for pkid, tag_id in items.filter(tag_id__in=narrow).values_list("content_object_id", "tag_id"):
+        tagged[tag_id].append(pkid)
+    sizes = dict(
+        items.filter(content_object_id__in={pkid for pkids in tagged.values() for pkid in pkids})
+        .values("content_object_id").annotate(total=Count("pk")).values_list("content_object_id", "total")
+    )
+
+    scores = {pkid: Counter() for pkid in article_pkids}
+    for pkid, tag_ids in tags.items():
+        for tag_id in tag_ids & narrow:
+            for other in tagged[tag_id]:
+                if other != pkid:
+                    scores[pkid][other] += 1
+        for other, shared in scores[pkid].items():
+            scores[pkid][other] = shared / math.sqrt(sizes[pkid] * sizes[other])
+    return scores
+
+
+def clap_similarities(article_pkids):
+    """Computes the clap co-occurrence between each article and every article clapped by the same readers.
+
+    Co-occurrence is the cosine of the binary clapper vectors,
+    ``shared clappers / sqrt(clap_count(a) * clap_count(b))``, counted by
+    one self-join of the clap table grouped by article pair. Readers with
+    more than ``RELATED_ARTICLES_MAX_FANOUT`` claps are skipped; only the
+    claps of the batch's own clappers are counted to find them, through the
+    clap user index, rather than grouping the whole clap table per batch.
+
+    Args:
+        article_pkids (list): Articles to compare
+
+    Returns:
+        dict: Article pkid mapped to a Counter of other pkid -> co-occurrence
+    """
+    readers = (
+        Clap.objects.filter(user_id__in=Clap.objects.filter(article__in=article_pkids).values("user_id"))
+        .values("user_id").annotate(total=Count("pk"))
+        .filter(total__lte=settings.RELATED_ARTICLES_MAX_FANOUT).values("user_id")
+    )
+    rows = (
+        Clap.objects.filter(user__claps__article__in=article_pkids, user_id__in=readers)
+        .values(source=F("user__claps__article"), other=F("article_id"))
+        .annotate(shared=Count("pk"))
+        .values_list("source", "other", "shared")
+    )
+    shared = {pkid: Counter() for pkid in article_pkids}
+    for source, other, total in rows:
+        if source != other:
+            shared[source][other] = total
+    others = {other for counter in shared.values() for other in counter}
+    claps = dict(Article.objects.filter(pkid__in=others | set(article_pkids)).values_list("pkid", "clap_count"))
+
+    return {
+        pkid: Counter({
+            other: total / math.sqrt(claps[pkid] * claps[other])
+            for other, total in counter.items() if claps.get(pkid) and claps.get(other)
+        })
+        for pkid, counter in shared.items()
+    }
+
+
+def compute_related(article_pkids, symmetric=False):
+    """Recomputes the stored related articles of a batch of articles.
+
+    Text, tag and clap similarities are combined with the
+    ``RELATED_ARTICLES_*_WEIGHT`` settings and the best
+    ``RELATED_ARTICLES_LIMIT`` replace each article's previous neighbours.
+
+    When ``symmetric`` is set, as in incremental runs, the batch is also
+    removed from other articles' lists and re-inserted where it now ranks,
+    each list being trimmed back to the limit; lists that lose an entry this
+    way fill up again on the next full run.
+
+    Args:
+        article_pkids (list): Articles to recompute
+        symmetric (bool, optional): Update the other articles' lists too. Defaults to False.
+
+    Returns:
+        int: Number of neighbours written for the batch
+    """
+    signals = [
+        (settings.RELATED_ARTICLES_TEXT_WEIGHT, text_similarities(article_pkids)),
+        (settings.RELATED_ARTICLES_TAG_WEIGHT, tag_similarities(article_pkids)),
+        (settings.RELATED_ARTICLES_CLAP_WEIGHT, clap_similarities(article_pkids)),
+    ]
+    limit = settings.RELATED_ARTICLES_LIMIT
+    now = timezone.now()
+    neighbours = []
+    for pkid in article_pkids:
+        combined = Counter()
+        for weight, scores in signals:
+            for other, score in scores[pkid].items():
+                combined[other] += weight * score
+        for other, score in heapq.nlargest(limit, combined.items(), key=lambda item: item[1]):
+            neighbours.append(RelatedArticle(article_id=pkid, related_id=other, score=score, computed=now))
+
+    with transaction.atomic():
+        RelatedArticle.objects.filter(article__in=article_pkids).delete()
+        RelatedArticle.objects.bulk_create(neighbours)
+        if symmetric:
+            batch = set(article_pkids)
+            RelatedArticle.objects.filter(related__in=article_pkids).exclude(article__in=article_pkids).delete()
+            reverse = [
+                RelatedArticle(article_id=link.related_id, related_id=link.article_id, score=link.score, computed=now)
+                for link in neighbours if link.related_id not in batch
+            ]
+            RelatedArticle.objects.bulk_create(reverse)
+            trim_related({link.article_id for link in reverse})
+    return len(neighbours)
+
+
+def trim_related(article_pkids):
+    """Caps the related lists of the given articles at ``RELATED_ARTICLES_LIMIT``, dropping the weakest.
+
+    Args:
+        article_pkids (Iterable[int]): Articles whose lists may have grown
+    """
+    limit = settings.RELATED_ARTICLES_LIMIT
+    for chunk in _chunks(article_pkids, LOOKUP_CHUNK):
+        expired = list(
+            RelatedArticle.objects.filter(article__in=chunk)
+            .annotate(position=Window(
+                RowNumber(),
+                partition_by=[F("article_id")],
+                order_by=[F("score").desc(), F("related_id").desc()],
+            ))
+            .filter(position__gt=limit)
+            .values_list("pk", flat=True)
+        )
+        RelatedArticle.objects.filter(pk__in=expired).delete()
+
+
+def changed_articles(since):
+    """Returns the articles whose related lists may be stale.
+
+    Those are the articles edited or retagged since ``since`` (tag changes
+    touch ``updated``, see ``signals.index_retagged_article``) and the
+    articles clapped since then.
+
+    Args:
+        since (datetime): Previous high-water mark
+
+    Returns:
+        list: Article pkids, sorted
+    """
+    since -= CHECKPOINT_OVERLAP
+    edited = Article.objects.filter(updated__gt=since).values_list("pkid", flat=True)
+    clapped = Clap.objects.filter(created__gt=since).values_list("article_id", flat=True)
+    return sorted(set(edited) | set(clapped))
+
+
+def refresh_related_articles(full=False, batch_size=100):
+    """Brings the related-articles index up to date.
+
+    A full run, also done when the job never completed before, snapshots
+    the document frequencies and recomputes every article. Otherwise only
+    the articles changed since the job's checkpoint are recomputed, and
+    their neighbours' lists are patched symmetrically. Keywords are all
+    refreshed before any similarity is computed, so changed articles see
+    each other's new text.
+
+    Memory is bounded by the batch: at most ``batch_size`` x
+    ``RELATED_ARTICLES_KEYWORDS`` x ``RELATED_ARTICLES_MAX_FANOUT`` postings
+    are loaded at once, whatever the corpus size.
+
+    Args:
+        full (bool, optional): Recompute every article. Defaults to False.
+        batch_size (int, optional): Articles computed per batch. Defaults to 100.
+
+    Returns:
+        int: Number of articles recomputed
+    """
+    started = timezone.now()
+    position = None if full else JobCheckpoint.position_of(JOB_NAME)
+    if position is None:
+        snapshot_document_frequencies()
+        pkids = list(Article.objects.order_by("pkid").values_list("pkid", flat=True))
+    else:
+        pkids = changed_articles(position)
+
+    for chunk in _chunks(pkids, batch_size):
+        extract_keywords(chunk)
+    for chunk in _chunks(pkids, batch_size):
+        compute_related(chunk, symmetric=position is not None)
+
+    JobCheckpoint.advance(JOB_NAME, started)
+    return len(pkids)
@@ -0,0 +1,950 @@
+import html
+import logging
+import math
+import re
+import sqlite3
+from collections import defaultdict, namedtuple
+from contextlib import closing
+from functools import lru_cache, reduce
+from itertools import islice
+from operator import and_
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.core.cache import cache
+from django.db import connections, router, transaction
+from django.db.models import Avg, Count, Exists, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+from django.utils.module_loading import import_string
+
+from articles.models import Article, SearchDocument, SearchPosting, SearchTerm
+
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+")
+_CLAUSE_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+SearchHit = namedtuple("SearchHit", ["pkid", "score", "highlight"])
+SearchHit.__doc__ = """One ranked search result.
+
+Attributes:
+    pkid (int): Primary key of the matching article
+    score (float): Relevance score, higher is better
+    highlight (dict): Field name mapped to a list of highlighted fragments
+"""
+
+SearchResult = namedtuple("SearchResult", ["total", "hits", "facets"])
+SearchResult.__doc__ = """A page of search results.
+
+Attributes:
+    total (int): Number of matching articles
+    hits (list): ``SearchHit`` instances of the requested page, best first
+    facets (dict): Facet name mapped to a list of ``{"value", "count"}`` buckets
+"""
+
+
+def tokenize(text):
+    """Splits text into lowercase word tokens.
+
+    Args:
+        text (str): Text to tokenize
+
+    Returns:
+        list: Lowercase tokens in order of appearance
+    """
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def parse_query(query):
+    """Parses a query string into clauses that must all match.
+
+    Args:
+        query (str): User supplied query, e.g. ``'djan* "query planner" index'``
+
+    Returns:
+        list: ``(kind, value)`` tuples where kind is ``"term"`` or ``"prefix"``
+            with a token value, or ``"phrase"`` with a list of tokens
+    """
+    clauses = []
+    for phrase, word in _CLAUSE_RE.findall(query or ""):
+        if phrase:
+            tokens = tokenize(phrase)
+            if len(tokens) > 1:
+                clauses.append(("phrase", tokens))
+            elif tokens:
+                clauses.append(("term", tokens[0]))
+            continue
+        tokens = tokenize(word)
+        if not tokens:
+            continue
+        if word.endswith("*"):
+            clauses.extend(("term", token) for token in tokens[:-1])
+            clauses.append(("prefix", tokens[-1]))
+        else:
+            clauses.extend(("term", token) for token in tokens)
+    return clauses
+
+
+def clause_tokens(clauses):
+    """Flattens parsed clauses into the tokens to highlight."""
+    return [token for kind, value in clauses for token in (value if kind == "phrase" else [value])]
+
+
+class BaseSearchBackend:
+    """Interface implemented by article search backends.
+
+    Backends rank articles for the search endpoint, restrict the article list
+    endpoint through ``filter_queryset`` and keep their index in sync through
+    ``index_article`` / ``remove_article``. The signal handlers in
+    ``articles.signals`` call those after each commit, or inside the writing
+    transaction when the backend is ``transactional`` (its index lives in the
+    same database as the articles).
+    """
+    highlight_tag = "em"
+    facet_size = 10
+    transactional = False
+    max_filter_hits = 1000
+
+    def search(self, query, offset=0, limit=10):
+        """Runs a ranked full-text query.
+
+        Args:
+            query (str): User supplied query string
+            offset (int, optional): Number of hits to skip. Defaults to 0.
+            limit (int, optional): Maximum number of hits returned. Defaults to 10.
+
+        Returns:
+            SearchResult: Total, ranked hits and facets
+        """
+        raise NotImplementedError
+
+    def filter_queryset(self, queryset, query):
+        """Restricts an article queryset to the articles matching a query.
+
+        The default implementation keeps the best ``max_filter_hits`` hits of
+        ``search``; backends that can express the match in SQL override it.
+
+        Args:
+            queryset (QuerySet): Articles to restrict
+            query (str): User supplied query string
+
+        Returns:
+            QuerySet: Matching articles, in the queryset's own ordering
+        """
+        hits = self.search(query, limit=self.max_filter_hits).hits
+        return queryset.filter(pkid__in=[hit.pkid for hit in hits])
+
+    def rebuild(self, batch_size=500):
+        """Re-indexes every article from scratch.
+
+        Args:
+            batch_size (int, optional): Articles processed per chunk. Defaults to 500.
+
+        Returns:
+            int: Number of indexed articles
+        """
+        return 0
+
+    def index_article(self, article):
+        """Adds or refreshes an article in the index.
+
+        Args:
+            article (Article): The saved article
+        """
+
+    def remove_article(self, article):
+        """Removes an article from the index.
+
+        Args:
+            article (Article): The deleted article
+        """
+
+    def facets_for(self, pkids):
+        """Counts tags and authors over a set of matching articles.
+
+        Args:
+            pkids (Iterable[int]): Primary keys of the matching articles
+
+        Returns:
+            dict: ``tags`` and ``authors`` facet buckets, largest first
+        """
+        matches = Article.objects.filter(pkid__in=pkids)
+        tags = (
+            matches.filter(tags__isnull=False)
+            .values("tags__name")
+            .annotate(count=Count("pkid"))
+            .order_by("-count", "tags__name")[:self.facet_size]
+        )
+        authors = (
+            matches.values("author__first_name", "author__last_name")
+            .annotate(count=Count("pkid"))
+            .order_by("-count", "author__first_name")[:self.facet_size]
+        )
+        return {
+            "tags": [{"value": row["tags__name"], "count": row["count"]} for row in tags],
+            "authors": [
+                {"value": f'{row["author__first_name"]} {row["author__last_name"]}', "count": row["count"]}
+                for row in authors
+            ],
+        }
+
+    def highlighted_hits(self, ranked, terms):
+        """Builds search hits with title and body fragments for a page of matches.
+
+        Args:
+            ranked (list): ``(pkid, score)`` pairs, best first
+            terms (Iterable[str]): Lowercase query terms to highlight
+
+        Returns:
+            list: ``SearchHit`` instances in the given order
+        """
+        articles = Article.objects.only("pkid", "title", "body").in_bulk(
+            [pkid for pkid, _ in ranked], field_name="pkid"
+        )
+        hits = []
+        for pkid, score in ranked:
+            highlight = {}
+            article = articles.get(pkid)
+            for field in ("title", "body"):
+                fragment = self.highlight(getattr(article, field, ""), terms)
+                if fragment:
+                    highlight[field] = [fragment]
+            hits.append(SearchHit(pkid, score, highlight))
+        return hits
+
+    def highlight(self, text, terms, fragment_size=150):
+        """Returns the first fragment of ``text`` with the query terms emphasised.
+
+        Args:
+            text (str): Field content
+            terms (Iterable[str]): Lowercase query terms
+            fragment_size (int, optional): Approximate fragment length. Defaults to 150.
+
+        Returns:
+            str: HTML-escaped fragment, or None if no term occurs in the text
+        """
+        pattern = re.compile(
+            r"\b(" + "|".join(re.escape(term) for term in terms) + r")\w*", re.IGNORECASE
+        )
+        match = pattern.search(text or "")
+        if not match:
+            return None
+        start = max(0, match.start() - fragment_size // 3)
+        fragment = html.escape(text[start:start + fragment_size])
+        tag = self.highlight_tag
+        return pattern.sub(lambda m: f"<{tag}>{m.group(0)}</{tag}>", fragment)
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+    """Search backend running directly against the articles table.
+
+    Local stand-in for Elasticsearch used in development and tests. Every
+    query term must occur in the title, body or author name; matches are
+    ranked by term frequency with title matches weighted ``title_weight``
+    times. Scoring happens in Python over at most ``max_candidates`` rows.
+    """
+    title_weight = 3
+    max_candidates = 1000
+
+    def match(self, terms):
+        """Builds the filter requiring every term in the title, body or author name.
+
+        Args:
+            terms (list): Lowercase query terms
+
+        Returns:
+            Q: Combined filter
+        """
+        return reduce(and_, [
+            Q(title__icontains=term) | Q(body__icontains=term) | Q(author__first_name__icontains=term)
+            | Q(author__last_name__icontains=term)
+            for term in terms
+        ])
+
+    def filter_queryset(self, queryset, query):
+        terms = tokenize(query)
+        if not terms:
+            return queryset
+        return queryset.filter(self.match(terms))
+
+    def search(self, query, offset=0, limit=10):
+        terms = tokenize(query)
+        if not terms:
+            return SearchResult(0, [], {})
+
+        candidates = (
+            Article.objects.filter(self.match(terms))
+            .only("pkid", "title", "body", "created")
+            .order_by("-created", "-pkid")[:self.max_candidates]
+        )
+
+        scored = []
+        for article in candidates:
+            title, body = article.title.lower(), article.body.lower()
+            score = sum(
+                self.title_weight * title.count(term) + body.count(term) for term in terms
+            )
+            highlight = {}
+            for field in ("title", "body"):
+                fragment = self.highlight(getattr(article, field), terms)
+                if fragment:
+                    highlight[field] = [fragment]
+            scored.append(SearchHit(article.pkid, float(score), highlight))
+        scored.sort(key=lambda hit: hit.score, reverse=True)
+
+        return SearchResult(
+            total=len(scored),
+            hits=scored[offset:offset + limit],
+            facets=self.facets_for([hit.pkid for hit in scored]),
+        )
+
+
+class ElasticsearchSearchBackend(BaseSearchBackend):
+    """Search backend querying the ``ArticleDocument`` Elasticsearch index.
+
+    Uses a ``multi_match`` query (title and tags boosted over body), native
+    highlighting and terms aggregations for the tag and author facets.
+    """
+
+    @property
+    def document(self):
+        """Returns the ArticleDocument class, imported lazily."""
+        from articles.documents import ArticleDocument
+
+        return ArticleDocument
+
+    def search(self, query, offset=0, limit=10):
+        tag = self.highlight_tag
+        search = (
+            self.document.search()
+            .query(
+                "multi_match",
+                query=query,
+                fields=["title^3", "tags^2", "body", "author_name"],
+            )
+            .highlight("title", "body", fragment_size=150, number_of_fragments=1)
+            .highlight_options(pre_tags=[f"<{tag}>"], post_tags=[f"</{tag}>"], encoder="html")
+            .extra(track_total_hits=True)
+        )
+        search.aggs.bucket("tags", "terms", field="tags", size=self.facet_size)
+        search.aggs.bucket("authors", "terms", field="author_name.raw", size=self.facet_size)
+        response = search[offset:offset + limit].execute()
+
+        hits = []
+        for hit in response:
+            highlight = hit.meta.highlight.to_dict() if "highlight" in hit.meta else {}
+            hits.append(SearchHit(int(hit.meta.id), hit.meta.score, highlight))
+        facets = {
+            name: [
+                {"value": bucket.key, "count": bucket.doc_count}
+                for bucket in response.aggregations[name].buckets
+            ]
+            for name in ("tags", "authors")
+        }
+        return SearchResult(response.hits.total.value, hits, facets)
+
+    def rebuild(self, batch_size=500):
+        document = self.document()
+        document._index.create(ignore=400)
+        document.update(document.get_indexing_queryset())
+        return Article.objects.count()
+
+    def index_article(self, article):
+        self.document().update(article)
+
+    def remove_article(self, article):
+        self.document().update(article, action="delete", raise_on_error=False)
+
+
+class InvertedIndexSearchBackend(BaseSearchBackend):
+    """Search backend using the built-in inverted index tables.
+
+    ``SearchTerm`` holds one row per token with its document frequency,
+    ``SearchPosting`` one row per (token, article) with the weighted term
+    frequency and token positions, and ``SearchDocument`` the weighted length
+    of every article. The index is maintained inside the transaction that
+    saves or deletes an article.
+
+    Queries are a conjunction of clauses: plain words, ``prefix*`` words
+    (expanded to the ``max_prefix_expansions`` most frequent matching tokens
+    through the token index) and ``"quoted phrases"`` (tokens at adjacent
+    positions). Posting lists are read rarest clause first, restricting later
+    reads to the surviving candidates, and matches are ranked with Okapi BM25.
+    """
+    transactional = True
+    title_weight = 3
+    k1 = 1.2
+    b = 0.75
+    max_prefix_expansions = 50
+    max_candidate_filter = 5000
+    max_facet_documents = 1000
+    token_max_length = 64
+    stats_cache_key = "articles:search:inverted:stats"
+    stats_cache_timeout = 60
+
+    def analyze(self, article):
+        """Tokenizes an article into weighted term frequencies and positions.
+
+        Title tokens come first; body positions start one past the title so
+        phrases never span both fields.
+
+        Args:
+            article (Article): Article with title and body loaded
+
+        Returns:
+            tuple: Weighted length and a dict of token to ``[frequency, positions]``
+        """
+        postings = {}
+        title_tokens = tokenize(article.title)
+        body_tokens = tokenize(article.body)
+        fields = (
+            (enumerate(title_tokens), self.title_weight),
+            (enumerate(body_tokens, len(title_tokens) + 1), 1),
+        )
+        for tokens, weight in fields:
+            for position, token in tokens:
+                entry = postings.setdefault(token[:self.token_max_length], [0, []])
+                entry[0] += weight
+                entry[1].append(position)
+        length = len(title_tokens) * self.title_weight + len(body_tokens)
+        return length, postings
+
+    def _term_ids(self, tokens):
+        """Returns the ids of the given tokens, creating missing terms.
+
+        Args:
+            tokens (Iterable[str]): Tokens to resolve
+
+        Returns:
+            dict: Token mapped to SearchTerm primary key
+        """
+        tokens = list(tokens)
+        SearchTerm.objects.bulk_create(
+            [SearchTerm(token=token) for token in tokens], ignore_conflicts=True, batch_size=500
+        )
+        term_ids = {}
+        for start in range(0, len(tokens), 500):
+            term_ids.update(
+                SearchTerm.objects.filter(token__in=tokens[start:start + 500]).values_list("token", "pk")
+            )
+        return term_ids
+
+    def _insert_postings(self, rows):
+        """Inserts postings with one ``executemany`` per chunk.
+
+        Rebuilding writes hundreds of thousands of postings; skipping model
+        instantiation keeps that bound by the database rather than the ORM.
+
+        Args:
+            rows (Iterable[tuple]): ``(term_id, article_id, term_frequency, positions)`` tuples
+        """
+        connection = connections[router.db_for_write(SearchPosting)]
+        meta = SearchPosting._meta
+        positions_field = meta.get_field("positions")
+        columns = [meta.get_field(name).column for name in ("term", "article", "term_frequency", "positions")]
+        sql = "INSERT INTO {} ({}) VALUES (%s, %s, %s, %s)".format(
+            connection.ops.quote_name(meta.db_table),
+            ", ".join(connection.ops.quote_name(column) for column in columns),
+        )
+        rows = iter(rows)
+        with connection.cursor() as cursor:
+            while True:
+                chunk = [
+                    (term_id, article_id, frequency, positions_field.get_db_prep_save(positions, connection))
+                    for term_id, article_id, frequency, positions in islice(rows, 5000)
+                ]
+                if not chunk:
+                    break
+                cursor.executemany(sql, chunk)
+
+    def _remove_postings(self, pkid):
+        """Deletes the postings of an article and decrements their terms' frequencies."""
+        term_ids = list(SearchPosting.objects.filter(article_id=pkid).values_list("term_id", flat=True))
+        if term_ids:
+            SearchPosting.objects.filter(article_id=pkid).delete()
+            SearchTerm.objects.filter(pk__in=term_ids).update(
+                document_frequency=F("document_frequency") - 1
+            )
+
+    def index_article(self, article):
+        length, postings = self.analyze(article)
+        with transaction.atomic():
+            self._remove_postings(article.pkid)
+            term_ids = self._term_ids(postings)
+            self._insert_postings(
+                (term_ids[token], article.pkid, frequency, positions)
+                for token, (frequency, positions) in postings.items()
+            )
+            SearchTerm.objects.filter(pk__in=term_ids.values()).update(
+                document_frequency=F("document_frequency") + 1
+            )
+            SearchDocument.objects.update_or_create(article_id=article.pkid, defaults={"length": length})
+        cache.delete(self.stats_cache_key)
+
+    def remove_article(self, article):
+        with transaction.atomic():
+            self._remove_postings(article.pkid)
+            SearchDocument.objects.filter(article_id=article.pkid).delete()
+        cache.delete(self.stats_cache_key)
+
+    def rebuild(self, batch_size=500):
+        indexed = 0
+        with transaction.atomic():
+            SearchPosting.objects.all().delete()
+            SearchDocument.objects.all().delete()
+            SearchTerm.objects.all().delete()
+            last_pkid = 0
+            while True:
+                articles = list(
+                    Article.objects.filter(pkid__gt=last_pkid)
+                    .order_by("pkid")
+                    .only("pkid", "title", "body")[:batch_size]
+                )
+                if not articles:
+                    break
+                analyzed = [(article.pkid, *self.analyze(article)) for article in articles]
+                term_ids = self._term_ids({token for _, _, postings in analyzed for token in postings})
+                self._insert_postings(
+                    (term_ids[token], pkid, frequency, positions)
+                    for pkid, _, postings in analyzed
+                    for token, (frequency, positions) in postings.items()
+                )
+                SearchDocument.objects.bulk_create(
+                    [SearchDocument(article_id=pkid, length=length) for pkid, length, _ in analyzed],
+                    batch_size=2000,
+                )
+                indexed += len(articles)
+                last_pkid = articles[-1].pkid
+
+            postings = (
+                SearchPosting.objects.filter(term=OuterRef("pk"))
+                .order_by()
+                .values("term")
+                .annotate(total=Count("pk"))
+                .values("total")
+            )
+            SearchTerm.objects.update(
+                document_frequency=Coalesce(Subquery(postings, output_field=IntegerField()), Value(0))
+            )
+        cache.delete(self.stats_cache_key)
+        return indexed
+
+    def parse_query(self, query):
+        """Parses a query with ``parse_query``, truncating tokens like the indexer does."""
+        limit = self.token_max_length
+        return [
+            (kind, [token[:limit] for token in value] if kind == "phrase" else value[:limit])
+            for kind, value in parse_query(query)
+        ]
+
+    def collection_stats(self):
+        """Returns the number of indexed articles and their average weighted length.
+
+        Returns:
+            tuple: ``(document_count, average_length)``, cached briefly
+        """
+        stats = cache.get(self.stats_cache_key)
+        if stats is None:
+            aggregate = SearchDocument.objects.aggregate(count=Count("pk"), average=Avg("length"))
+            stats = (aggregate["count"], aggregate["average"] or 0.0)
+            cache.set(self.stats_cache_key, stats, self.stats_cache_timeout)
+        return stats
+
+    def _resolve_clauses(self, clauses):
+        """Maps every clause to its term ids and document frequencies.
+
+        Returns:
+            list: ``(kind, value, terms)`` tuples where terms maps term id to
+                document frequency (phrase values become their ordered term
+                ids), or None when some clause cannot match
+        """
+        exact_tokens = set()
+        for kind, value in clauses:
+            if kind == "term":
+                exact_tokens.add(value)
+            elif kind == "phrase":
+                exact_tokens.update(value)
+        exact = {
+            token: (pk, frequency)
+            for token, pk, frequency in SearchTerm.objects.filter(token__in=exact_tokens)
+            .values_list("token", "pk", "document_frequency")
+        }
+
+        resolved = []
+        for kind, value in clauses:
+            if kind == "prefix":
+                terms = dict(
+                    SearchTerm.objects.filter(token__startswith=value, document_frequency__gt=0)
+                    .order_by("-document_frequency")
+                    .values_list("pk", "document_frequency")[:self.max_prefix_expansions]
+                )
+            else:
+                tokens = [value] if kind == "term" else value
+                if any(token not in exact for token in tokens):
+                    return None
+                terms = dict(exact[token] for token in tokens)
+                if kind == "phrase":
+                    value = [exact[token][0] for token in tokens]
+            if not terms:
+                return None
+            resolved.append((kind, value, terms))
+        return resolved
+
+    def _match_clause(self, kind, value, terms, candidates):
+        """Reads the postings of one clause.
+
+        Args:
+            kind (str): Clause kind
+            value: Clause token, or the ordered term ids of a phrase
+            terms (dict): Term id mapped to document frequency
+            candidates (set): Articles matched so far, or None for the first clause
+
+        Returns:
+            dict: Article pkid mapped to ``(length, [(term_id, frequency), ...])``
+        """
+        postings = SearchPosting.objects.filter(term_id__in=terms)
+        if candidates is not None and len(candidates) <= self.max_candidate_filter:
+            postings = postings.filter(article_id__in=candidates)
+        fields = ["article_id", "term_id", "term_frequency", "article__search_document__length"]
+        if kind == "phrase":
+            fields.append("positions")
+
+        matches = defaultdict(lambda: [0, []])
+        positions = defaultdict(dict)
+        for row in postings.values_list(*fields).iterator(chunk_size=5000):
+            article_id, term_id, frequency, length = row[:4]
+            if candidates is not None and article_id not in candidates:
+                continue
+            matches[article_id][0] = length or 0
+            matches[article_id][1].append((term_id, frequency))
+            if kind == "phrase":
+                positions[article_id][term_id] = row[4]
+
+        if kind == "phrase":
+            matches = {
+                article_id: match for article_id, match in matches.items()
+                if self._has_phrase(positions[article_id], value)
+            }
+        return matches
+
+    @staticmethod
+    def _has_phrase(positions, ordered_ids):
+        """Returns True if the terms occur at consecutive positions."""
+        if any(term_id not in positions for term_id in ordered_ids):
+            return False
+        following = [set(positions[term_id]) for term_id in ordered_ids[1:]]
+        return any(
+            all(start + offset in later for offset, later in enumerate(following, 1))
+            for start in positions[ordered_ids[0]]
+        )
+
+    def matching_scores(self, query):
+        """Returns the BM25 score of every article matching a query.
+
+        Args:
+            query (str): User supplied query string
+
+        Returns:
+            tuple: ``(scores, tokens)`` with article pkid mapped to score and the
+                query tokens used for highlighting
+        """
+        clauses = self.parse_query(query)
+        resolved = self._resolve_clauses(clauses) if clauses else None
+        if not resolved:
+            return {}, []
+
+        document_count, average_length = self.collection_stats()
+        resolved.sort(key=lambda clause: min(clause[2].values()))
+        frequencies = {}
+        candidates = None
+        clause_matches = []
+        for kind, value, terms in resolved:
+            frequencies.update(terms)
+            matches = self._match_clause(kind, value, terms, candidates)
+            candidates = set(matches) if candidates is None else candidates & set(matches)
+            clause_matches.append(matches)
+            if not candidates:
+                return {}, []
+
+        scores = defaultdict(float)
+        for matches in clause_matches:
+            for article_id in candidates:
+                length, postings = matches[article_id]
+                norm = self.k1 * (1 - self.b + self.b * length / (average_length or 1))
+                for term_id, frequency in postings:
+                    df = frequencies[term_id]
+                    idf = math.log(1 + (document_count - df + 0.5) / (df + 0.5))
+                    scores[article_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        return scores, clause_tokens(clauses)
+
+    def search(self, query, offset=0, limit=10):
+        scores, tokens = self.matching_scores(query)
+        if not scores:
+            return SearchResult(0, [], {})
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        return SearchResult(
+            total=len(ranked),
+            hits=self.highlighted_hits(ranked[offset:offset + limit], tokens),
+            facets=self.facets_for([pkid for pkid, _ in ranked[:self.max_facet_documents]]),
+        )
+
+    def filter_queryset(self, queryset, query):
+        """Restricts an article queryset to the articles matching every clause.
+
+        Clauses are resolved to term ids through the token index first. A
+        clause with few postings becomes a ``pkid IN (postings)`` filter; a
+        frequent one becomes a correlated ``EXISTS`` probe of the unique
+        (term, article) index, which lets a paginated list stop after the
+        first page instead of materialising a huge posting list. Phrase
+        adjacency cannot be expressed in SQL, so queries containing phrases
+        are matched in Python and filtered by primary key.
+        """
+        clauses = self.parse_query(query)
+        if not clauses:
+            return queryset
+        if any(kind == "phrase" for kind, _ in clauses):
+            scores, _ = self.matching_scores(query)
+            return queryset.filter(pkid__in=list(scores))
+
+        resolved = self._resolve_clauses(clauses)
+        if resolved is None:
+            return queryset.none()
+        for _, _, terms in resolved:
+            postings = SearchPosting.objects.filter(term_id__in=list(terms))
+            if sum(terms.values()) <= self.max_candidate_filter:
+                queryset = queryset.filter(pkid__in=postings.values("article_id"))
+            else:
+                queryset = queryset.filter(Exists(postings.filter(article_id=OuterRef("pkid"))))
+        return queryset
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """Search backend using PostgreSQL full-text search.
+
+    Matches against ``Article.search_vector``, a ``tsvector`` of the title
+    (weight A) and body (weight B) kept current by a database trigger and
+    served by a GIN index (migration ``0007``). Query clauses are compiled
+    into a ``tsquery``: words are ANDed, ``prefix*`` becomes ``:*`` and
+    ``"quoted phrases"`` use the ``<->`` followed-by operator. Matches are
+    ordered by ``SearchRank``.
+    """
+    transactional = True
+    config = "english"
+
+    def vector(self):
+        """Returns the expression the trigger stores in ``search_vector``."""
+        return (
+            SearchVector("title", weight="A", config=self.config)
+            + SearchVector("body", weight="B", config=self.config)
+        )
+
+    def to_search_query(self, clauses):
+        """Compiles parsed clauses into a raw ``tsquery``.
+
+        Args:
+            clauses (list): Clauses returned by ``parse_query``
+
+        Returns:
+            SearchQuery: Query matching every clause
+        """
+        parts = []
+        for kind, value in clauses:
+            if kind == "term":
+                parts.append(f"'{value}'")
+            elif kind == "prefix":
+                parts.append(f"'{value}':*")
+            else:
+                parts.append("(" + " <-> ".join(f"'{token}'" for token in value) + ")")
+        return SearchQuery(" & ".join(parts), search_type="raw", config=self.config)
+
+    def search(self, query, offset=0, limit=10):
+        clauses = parse_query(query)
+        if not clauses:
+            return SearchResult(0, [], {})
+
+        search_query = self.to_search_query(clauses)
+        matches = Article.objects.filter(search_vector=search_query)
+        ranked = (
+            matches.annotate(rank=SearchRank(F("search_vector"), search_query))
+            .order_by("-rank", "-pkid")
+            .values_list("pkid", "rank")[offset:offset + limit]
+        )
+        return SearchResult(
+            total=matches.count(),
+            hits=self.highlighted_hits(list(ranked), clause_tokens(clauses)),
+            facets=self.facets_for(matches.values("pkid")),
+        )
+
+    def filter_queryset(self, queryset, query):
+        clauses = parse_query(query)
+        if not clauses:
+            return queryset
+        return queryset.filter(search_vector=self.to_search_query(clauses))
+
+    def rebuild(self, batch_size=500):
+        indexed = 0
+        last_pkid = 0
+        while True:
+            pkids = list(
+                Article.objects.filter(pkid__gt=last_pkid)
+                .order_by("pkid")
+                .values_list("pkid", flat=True)[:batch_size]
+            )
+            if not pkids:
+                break
+            Article.objects.filter(pkid__in=pkids).update(search_vector=self.vector())
+            indexed += len(pkids)
+            last_pkid = pkids[-1]
+        return indexed
+
+
+@lru_cache(maxsize=None)
+def sqlite_has_fts5():
+    """Returns True if the SQLite library linked into Python supports FTS5."""
+    with closing(sqlite3.connect(":memory:")) as db:
+        try:
+            db.execute("CREATE VIRTUAL TABLE probe USING fts5(content)")
+        except sqlite3.OperationalError:
+            return False
+    return True
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """Search backend using an SQLite FTS5 table.
+
+    The ``articles_article_fts`` virtual table (migration ``0007``) holds the
+    title and body of every article keyed by ``rowid = pkid``, tokenized with
+    the Porter stemmer. It is maintained on save and delete inside the writing
+    transaction; bulk writes that bypass signals need ``rebuild_search_index``.
+    Query clauses compile to an FTS5 ``MATCH`` expression and matches are
+    ranked with FTS5's ``bm25()``, title weighted over body.
+    """
+    transactional = True
+    table = "articles_article_fts"
+    title_weight = 3.0
+
+    @property
+    def connection(self):
+        """Returns the connection holding the articles table."""
+        return connections[router.db_for_write(Article)]
+
+    def to_match(self, clauses):
+        """Compiles parsed clauses into an FTS5 query string.
+
+        Args:
+            clauses (list): Clauses returned by ``parse_query``
+
+        Returns:
+            str: FTS5 expression matching every clause
+        """
+        parts = []
+        for kind, value in clauses:
+            if kind == "term":
+                parts.append(f'"{value}"')
+            elif kind == "prefix":
+                parts.append(f'"{value}"*')
+            else:
+                parts.append('"' + " ".join(value) + '"')
+        return " AND ".join(parts)
+
+    def search(self, query, offset=0, limit=10):
+        clauses = parse_query(query)
+        if not clauses:
+            return SearchResult(0, [], {})
+
+        match = self.to_match(clauses)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT COUNT(*) FROM {self.table} WHERE {self.table} MATCH %s", [match]
+            )
+            total = cursor.fetchone()[0]
+            cursor.execute(
+                f"SELECT rowid, -bm25({self.table}, %s, 1.0) AS score FROM {self.table} "
+                f"WHERE {self.table} MATCH %s ORDER BY score DESC, rowid DESC LIMIT %s OFFSET %s",
+                [self.title_weight, match, limit, offset],
+            )
+            ranked = cursor.fetchall()
+        return SearchResult(
+            total=total,
+            hits=self.highlighted_hits(ranked, clause_tokens(clauses)),
+            facets=self.facets_for(self.filter_queryset(Article.objects.all(), query).values("pkid")),
+        )
+
+    def filter_queryset(self, queryset, query):
+        clauses = parse_query(query)
+        if not clauses:
+            return queryset
+        matches = RawSQL(
+            f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s",
+            [self.to_match(clauses)],
+            output_field=IntegerField(),
+        )
+        return queryset.filter(pkid__in=matches)
+
+    def index_article(self, article):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [article.pkid])
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, title, body) VALUES (%s, %s, %s)",
+                [article.pkid, article.title, article.body],
+            )
+
+    def remove_article(self, article):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [article.pkid])
+
+    def rebuild(self, batch_size=500):
+        with transaction.atomic(using=self.connection.alias), self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+            cursor.execute(
+                f"INSERT INTO {self.table} (rowid, title, body) "
+                f"SELECT pkid, title, body FROM {Article._meta.db_table}"
+            )
+            return cursor.rowcount
+
+
+SEARCH_BACKENDS = {
+    "database": DatabaseSearchBackend,
+    "elasticsearch": ElasticsearchSearchBackend,
+    "inverted": InvertedIndexSearchBackend,
+    "postgres": PostgresSearchBackend,
+    "sqlite": SQLiteSearchBackend,
+}
+
+
+def detect_search_backend():
+    """Returns the name of the best search backend for the articles database.
+
+    Returns:
+        str: ``"postgres"`` on PostgreSQL, ``"sqlite"`` on SQLite builds with
+            FTS5, ``"database"`` otherwise
+    """
+    vendor = connections[router.db_for_read(Article)].vendor
+    if vendor == "postgresql":
+        return "postgres"
+    if vendor == "sqlite" and sqlite_has_fts5():
+        return "sqlite"
+    return "database"
+
+
+def get_search_backend(name=None):
+    """Returns a search backend instance.
+
+    Args:
+        name (str, optional): A key of ``SEARCH_BACKENDS``, ``"auto"`` (see
+            ``detect_search_backend``) or the dotted path of a ``BaseSearchBackend``
+            subclass. Defaults to the ``ARTICLE_SEARCH_BACKEND`` setting.
+
+    Returns:
+        BaseSearchBackend: Backend instance
+    """
+    name = name or getattr(settings, "ARTICLE_SEARCH_BACKEND", "auto")
+    if name == "auto":
+        name = detect_search_backend()
+    backend_class = SEARCH_BACKENDS.get(name) or import_string(name)
+    return backend_class()
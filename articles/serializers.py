@@ -1,18 +1,26 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
+from taggit.serializers import TaggitSerializer, TagListSerializerField
 from articles.models import Article, ArticleView, Rating, Bookmark, Clap, Comment
 
 
-class ArticleInSerializer(serializers.ModelSerializer):
+class ArticleInSerializer(TaggitSerializer, serializers.ModelSerializer):
     """Serializer for creating/updating Articles (input).
     
     Fields:
         title (str): Article title
         body (str): Main content of the article
         image (ImageField): Banner image for the article
+        tags (list): Tag names; replaces the article's tags when given
     """
+    tags = TagListSerializerField(required=False)
+
     class Meta:
         model = Article
-        fields = ["title", "body", "image"]
+        fields = ["title", "body", "image", "tags"]
 
 
 class ArticleOutSerializer(serializers.ModelSerializer):
@@ -24,24 +32,65 @@ class ArticleOutSerializer(serializers.ModelSerializer):
         image (ImageField): Banner image
         views_count (int): Read-only count of views
         time_reading (int): Estimated reading time in minutes
+        word_count (int): Number of words in the body
         author (int): Primary key of author
         username (str): First name of the author
+        clap_count (int): Number of claps
+        bookmark_count (int): Number of bookmarks
+        comment_count (int): Number of comments
+        rating_count (int): Number of ratings
+        average_rating (float): Mean rating or None
+        rating_histogram (dict): Number of ratings of each value, 1 to 5
+        rating_score (float): Bayesian-smoothed rating used by ``?ordering=-rating_score``
+        tags (list): Tag names, read from the prefetch of ``with_list_stats``
+    
+    The engagement fields are read from counters stored on the article.
+    When the context holds a ``viewer_state`` mapping (see
+    ``articles.mixins.ViewerStateMixin``), ``has_clapped``, ``has_bookmarked``
+    and ``my_rating`` are added from it.
     """
     views_count = serializers.ReadOnlyField()
     time_reading = serializers.ReadOnlyField()
     username = serializers.CharField(source="author.first_name")
+    average_rating = serializers.ReadOnlyField()
+    rating_histogram = serializers.ReadOnlyField()
+    tags = serializers.SlugRelatedField(many=True, read_only=True, slug_field="name")
 
     class Meta:
         model = Article
         fields = ["title", "body", "image", "views_count", 
-                 "time_reading", "author", "username"]
+                 "time_reading", "word_count", "author", "username",
+                 "clap_count", "bookmark_count", "comment_count",
+                 "rating_count", "average_rating", "rating_histogram",
+                 "rating_score", "tags"]
+
+    def to_representation(self, instance):
+        """Serializes the article, adding the viewer state when available."""
+        data = super().to_representation(instance)
+        viewer_state = self.context.get("viewer_state")
+        if viewer_state is not None and instance.pkid in viewer_state:
+            data.update(viewer_state[instance.pkid])
+        return data
+
+
+class ScoredArticleSerializer(ArticleOutSerializer):
+    """Serializer for an article in a ranked listing (related, trending).
+
+    Fields:
+        id (UUID): Public id of the article
+        score (float): Ranking score annotated on the queryset, higher first
+    """
+    score = serializers.FloatField(read_only=True)
+
+    class Meta(ArticleOutSerializer.Meta):
+        fields = ["id", "score", *ArticleOutSerializer.Meta.fields]
 
 
 class RatingSerializer(serializers.ModelSerializer):
     """Serializer for Rating model.
     
     Fields:
-        rating (str): Rating value (1-5)
+        rating (int): Rating value, 1 to 5
         review (str): Text review
         article (int): Primary key of related article
     """
@@ -50,6 +99,18 @@ class RatingSerializer(serializers.ModelSerializer):
         fields = ["rating", "review", "article"]
         
 
+class RatingInSerializer(serializers.ModelSerializer):
+    """Serializer for submitting a rating; the article comes from the URL.
+    
+    Fields:
+        rating (int): Rating value, 1 to 5
+        review (str): Text review
+    """
+    class Meta:
+        model = Rating
+        fields = ["rating", "review"]
+
+
 class BookmarkSerializer(serializers.ModelSerializer):
     """Serializer for Bookmark model.
     
@@ -77,9 +138,140 @@ class CommentSerializer(serializers.ModelSerializer):
     
     Fields:
         article (int): Primary key of commented article
+        parent (UUID): Public id of the comment replied to, omitted for top-level comments
         title (str): Comment title/heading
         content (str): Main comment text
+
+    The parent must belong to the commented article (the ``article`` in the
+    context when the view takes it from the URL) and be less than
+    ``COMMENTS_MAX_DEPTH`` levels deep.
     """
+    parent = serializers.SlugRelatedField(
+        slug_field="id", queryset=Comment.objects.all(), required=False, allow_null=True
+    )
+
     class Meta:
         model = Comment 
-        fields = ["article", "title", "content"]
\ No newline at end of file
+        fields = ["article", "parent", "title", "content"]
+
+    def validate(self, attrs):
+        """Checks that a reply stays in the article's thread and within the depth limit."""
+        parent = attrs.get("parent")
+        if parent is not None:
+            article = self.context.get("article", attrs.get("article"))
+            if article is not None and parent.article_id != article.pkid:
+                raise serializers.ValidationError({"parent": "The comment replied to is on another article."})
+            if parent.depth + 1 > settings.COMMENTS_MAX_DEPTH:
+                raise serializers.ValidationError({"parent": "This thread is nested too deeply."})
+        return attrs
+
+
+class CommentReplySerializer(serializers.ModelSerializer):
+    """Serializer for reading a comment inside a thread.
+    
+    Fields:
+        id (UUID): Public id of the comment
+        parent (UUID): Public id of the comment replied to, None for top-level comments
+        username (str): First name of the commenter
+        title (str): Comment title/heading
+        content (str): Main comment text
+        created (datetime): Posting time
+        depth (int): Nesting level, 0 for top-level comments
+        reply_count (int): Number of direct replies
+    """
+    parent = serializers.SlugRelatedField(slug_field="id", read_only=True)
+    username = serializers.CharField(source="user.first_name", read_only=True)
+    depth = serializers.ReadOnlyField()
+
+    class Meta:
+        model = Comment
+        fields = ["id", "parent", "username", "title", "content", "created", "depth", "reply_count"]
+
+
+class CommentOutSerializer(CommentReplySerializer):
+    """Serializer for a top-level comment with its first replies.
+    
+    Fields:
+        replies (list): The first ``COMMENTS_PREFETCHED_REPLIES`` direct
+            replies, oldest first, read from the ``first_replies`` prefetch
+    """
+    replies = CommentReplySerializer(source="first_replies", many=True, read_only=True)
+
+    class Meta(CommentReplySerializer.Meta):
+        fields = [*CommentReplySerializer.Meta.fields, "replies"]
+
+
+class CommentInSerializer(serializers.ModelSerializer):
+    """Serializer for submitting a comment; the article comes from the request path or operation.
+    
+    Fields:
+        title (str): Comment title/heading
+        content (str): Main comment text
+    """
+    class Meta:
+        model = Comment
+        fields = ["title", "content"]
+
+
+class EngagementOperationSerializer(serializers.Serializer):
+    """Serializer for one operation of a batch engagement request.
+    
+    Fields:
+        type (str): One of "clap", "bookmark", "rate" or "comment"
+        article (UUID): Public id of the article
+        rating (int): Rating value, 1 to 5, for "rate"
+        review (str): Text review, for "rate"
+        title (str): Comment title, for "comment"
+        content (str): Comment text, for "comment"
+    
+    The type specific fields are validated by ``RatingInSerializer`` and
+    ``CommentInSerializer`` and returned under ``values``.
+    """
+    payload_serializers = {
+        "rate": RatingInSerializer,
+        "comment": CommentInSerializer,
+    }
+
+    type = serializers.ChoiceField(choices=["clap", "bookmark", "rate", "comment"])
+    article = serializers.UUIDField()
+
+    def validate(self, attrs):
+        """Validates the fields required by the operation's type."""
+        payload_serializer = self.payload_serializers.get(attrs["type"])
+        if payload_serializer is None:
+            attrs["values"] = {}
+            return attrs
+        payload = payload_serializer(data=self.initial_data)
+        payload.is_valid(raise_exception=True)
+        attrs["values"] = dict(payload.validated_data)
+        return attrs
+
+
+class StatsQuerySerializer(serializers.Serializer):
+    """Validates the query parameters of the statistics endpoints.
+    
+    Fields:
+        from (date): First day of the range, defaults to ``STATS_DEFAULT_DAYS`` before ``to``
+        to (date): Last day of the range (included), defaults to today (UTC)
+        bucket (str): ``hour`` or ``day``; hourly ranges are limited to ``STATS_MAX_HOURLY_DAYS``
+    """
+    to = serializers.DateField(required=False)
+    bucket = serializers.ChoiceField(choices=["hour", "day"], default="day")
+
+    def get_fields(self):
+        """Adds the ``from`` field, whose name is a Python keyword."""
+        fields = super().get_fields()
+        fields["from"] = serializers.DateField(required=False)
+        return fields
+
+    def validate(self, attrs):
+        """Fills in the default range and checks its bounds."""
+        attrs.setdefault("to", timezone.now().date())
+        attrs.setdefault("from", attrs["to"] - timedelta(days=settings.STATS_DEFAULT_DAYS - 1))
+        if attrs["from"] > attrs["to"]:
+            raise serializers.ValidationError({"from": "The range must start before it ends."})
+        if attrs["bucket"] == "hour" and (attrs["to"] - attrs["from"]).days >= settings.STATS_MAX_HOURLY_DAYS:
+            raise serializers.ValidationError(
+                {"bucket": f"Hourly statistics cover at most {settings.STATS_MAX_HOURLY_DAYS} days."}
+            )
+        return attrs
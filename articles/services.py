@@ -1,19 +1,73 @@
 import re
 from math import ceil
-from typing import Union
+from typing import Iterable, Union
 
 
-def estimate_time_reading(article, words_per_minute: int = 250) -> int:
+WORDS_PER_MINUTE = 250
+_WORD_RE = re.compile(r"\w+")
+
+
+def count_words(text: Union[str, Iterable[str], None]) -> int:
+    """Counts the words in a text without building a list of them.
+
+    Matches are consumed one at a time from ``re.finditer``, so memory stays
+    constant however large the body is. The text may also be given as an
+    iterable of chunks (e.g. read from a file); a word split across two
+    chunks is counted once.
+
+    Args:
+        text (str | Iterable[str] | None): Text, or chunks of text, to count
+
+    Returns:
+        int: Number of words. Returns 0 for empty content.
+
+    Example:
+        >>> count_words("This is a sample article text.")
+        6
+        >>> count_words(["This is a sam", "ple article text."])
+        6
+    """
+    if not text:
+        return 0
+    chunks = (text,) if isinstance(text, str) else text
+
+    total = 0
+    previous_ended_in_word = False
+    for chunk in chunks:
+        if not chunk:
+            continue
+        total += sum(1 for _ in _WORD_RE.finditer(chunk))
+        if previous_ended_in_word and _WORD_RE.match(chunk[0]):
+            total -= 1
+        previous_ended_in_word = bool(_WORD_RE.match(chunk[-1]))
+    return total
+
+
+def reading_time_from_word_count(word_count: int, words_per_minute: int = WORDS_PER_MINUTE) -> int:
+    """Converts a word count into a reading time in minutes, rounded up.
+
+    Args:
+        word_count (int): Number of words in the content
+        words_per_minute (int, optional): Average reading speed in WPM.
+            Defaults to 250 (average adult reading speed).
+
+    Returns:
+        int: Estimated reading time in minutes, rounded up. Returns 0 for no words.
+    """
+    return ceil(word_count / words_per_minute)
+
+
+def estimate_time_reading(article, words_per_minute: int = WORDS_PER_MINUTE) -> int:
     """Estimates the reading time (in minutes) for an article's content, rounded up.
-    
-    Calculates based on word count and average reading speed. Uses regex to split
-    the content into words for accurate counting. Returns 0 for empty content.
+
+    Calculates based on word count and average reading speed. Words are
+    counted with ``count_words``. Returns 0 for empty content.
 
     Args:
         article (Article): Article instance containing the body text to analyze
-        words_per_minute (int, optional): Average reading speed in WPM. 
+        words_per_minute (int, optional): Average reading speed in WPM.
             Defaults to 250 (average adult reading speed).
-            
+
     Returns:
         int: Estimated reading time in minutes, rounded up. Returns 0 if article body is empty.
 
@@ -22,10 +76,4 @@ def estimate_time_reading(article, words_per_minute: int = 250) -> int:
         >>> estimate_time_reading(article)
         1  # For 25 words at 250 WPM, the estimated time would be 0.1, rounded up to 1
     """
-    if not article.body:
-        return 0
-    
-    words = re.findall(r"\b\w+\b", article.body)  # More precise word matching
-    total_words = len(words)
-    estimated_time = total_words / words_per_minute
-    return ceil(estimated_time)  # Use ceil to round up to the nearest integer
+    return reading_time_from_word_count(count_words(article.body), words_per_minute)
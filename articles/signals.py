@@ -0,0 +1,453 @@
+# signals.py
+import logging
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from django.core.cache import cache
+
+from articles.cache import POPULAR_TAGS_CACHE_KEY, article_cache
+from articles.feeds import backfill_timeline, fan_out_article, remove_from_timelines
+from articles.models import Article, Bookmark, Clap, Comment, Rating, TagCount, TaggedArticle, engagement_deltas
+from articles.search import get_search_backend
+from profiles.models import Profile
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+ENGAGEMENT_MODELS = [Rating, Bookmark, Clap, Comment]
+
+
+def _cascaded_from(origin, *senders):
+    """
+    Tells whether a delete cascades from an instance or queryset of ``senders``.
+
+    Args:
+        origin: The ``origin`` sent with ``post_delete``.
+        *senders: Model classes.
+
+    Returns:
+        bool: True if the delete started from one of the models.
+    """
+    if isinstance(origin, models.QuerySet):
+        return issubclass(origin.model, senders)
+    return isinstance(origin, senders)
+
+
+def _schedule_sync(article, removed=False):
+    """
+    Runs the index update now for transactional backends, else after commit.
+
+    Args:
+        article (Article): The changed article.
+        removed (bool): True if the article is being deleted.
+    """
+    if get_search_backend().transactional:
+        _sync_search_index(article, removed=removed)
+    else:
+        transaction.on_commit(partial(_sync_search_index, article, removed=removed))
+
+
+def _sync_search_index(article, removed=False):
+    """
+    Pushes one article change to the configured search backend.
+
+    Failures of external backends are logged rather than raised so an
+    unavailable search cluster never breaks article writes; the index can be
+    rebuilt afterwards. Transactional backends raise, rolling the write back
+    together with the index change.
+
+    Args:
+        article (Article): The changed article.
+        removed (bool): True if the article was deleted.
+    """
+    backend = get_search_backend()
+    if backend.transactional:
+        if removed:
+            backend.remove_article(article)
+        else:
+            backend.index_article(article)
+        return
+    try:
+        if removed:
+            backend.remove_article(article)
+        else:
+            backend.index_article(article)
+    except Exception:
+        logger.exception("Failed to update the search index for article %s", article.pkid)
+
+
+def _invalidate_articles(pkids, **kwargs):
+    """
+    Invalidates the cached responses of articles given by primary key.
+
+    Args:
+        pkids (list): Primary keys of the changed articles.
+        **kwargs: Options of ``ArticleCache.invalidate``.
+    """
+    for article_id in Article.objects.filter(pkid__in=pkids).values_list("id", flat=True):
+        article_cache.invalidate(article_id, **kwargs)
+
+
+@receiver(post_save, sender=Article)
+def index_saved_article(sender, instance, **kwargs):
+    """
+    Signal receiver that re-indexes a saved article.
+
+    Args:
+        sender: The model class that sent the signal (Article).
+        instance: The saved Article instance.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    _schedule_sync(instance)
+
+
+@receiver(pre_delete, sender=Article)
+def unindex_deleting_article(sender, instance, **kwargs):
+    """
+    Signal receiver that drops an article from a transactional index.
+
+    Runs before the delete so the index rows are removed while the article
+    row they reference still exists.
+
+    Args:
+        sender: The model class that sent the signal (Article).
+        instance: The Article being deleted.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    if get_search_backend().transactional:
+        _sync_search_index(instance, removed=True)
+
+
+@receiver(post_delete, sender=Article)
+def unindex_deleted_article(sender, instance, **kwargs):
+    """
+    Signal receiver that removes a deleted article from an external index
+    once its transaction commits.
+
+    Args:
+        sender: The model class that sent the signal (Article).
+        instance: The deleted Article instance.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    if not get_search_backend().transactional:
+        transaction.on_commit(partial(_sync_search_index, instance, removed=True))
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def index_retagged_article(sender, instance, action, **kwargs):
+    """
+    Signal receiver that re-indexes an article after its tags change, and
+    invalidates its cached responses once the transaction commits.
+
+    ``updated`` is touched with a plain UPDATE, without ``post_save``, so
+    incremental jobs keyed on it, like the related-articles refresh, pick the
+    new tags up.
+
+    Args:
+        sender: The tag through model.
+        instance: The Article whose tags changed.
+        action (str): The m2m_changed action name.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    if action in ("post_add", "post_remove", "post_clear") and isinstance(instance, Article):
+        instance.updated = timezone.now()
+        Article.objects.filter(pkid=instance.pkid).update(updated=instance.updated)
+        _schedule_sync(instance)
+        transaction.on_commit(partial(article_cache.invalidate, instance.id))
+
+
+def _invalidate_popular_tags():
+    """Drops the cached popular tags once the transaction commits."""
+    transaction.on_commit(partial(cache.delete, POPULAR_TAGS_CACHE_KEY))
+
+
+@receiver(m2m_changed, sender=Article.tags.through)
+def count_retagged_article(sender, instance, action, pk_set, **kwargs):
+    """
+    Signal receiver that keeps the per-tag article counts in step with tag changes.
+
+    taggit sends only the tags actually added or removed in ``pk_set``; a
+    clear sends none, so the tags are read before it.
+
+    Args:
+        sender: The tag through model.
+        instance: The Article whose tags changed.
+        action (str): The m2m_changed action name.
+        pk_set (set): Primary keys of the tags added or removed.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    if not isinstance(instance, Article):
+        return
+    if action == "pre_clear":
+        instance._cleared_tag_ids = _tag_ids(instance)
+    elif action in ("post_add", "post_remove", "post_clear"):
+        tag_ids = getattr(instance, "_cleared_tag_ids", set()) if action == "post_clear" else pk_set
+        TagCount.adjust(tag_ids or (), 1 if action == "post_add" else -1)
+        _invalidate_popular_tags()
+
+
+@receiver(pre_delete, sender=Article)
+def collect_deleting_article_tags(sender, instance, **kwargs):
+    """
+    Signal receiver that notes the tags of an article before the cascade removes them.
+
+    Args:
+        sender: The model class that sent the signal (Article).
+        instance: The Article being deleted.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    instance._deleted_tag_ids = _tag_ids(instance)
+
+
+@receiver(post_delete, sender=Article)
+def count_deleted_article_tags(sender, instance, **kwargs):
+    """
+    Signal receiver that decrements the counts of a deleted article's tags.
+
+    Args:
+        sender: The model class that sent the signal (Article).
+        instance: The deleted Article instance.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    tag_ids = getattr(instance, "_deleted_tag_ids", None)
+    if tag_ids:
+        TagCount.adjust(tag_ids, -1)
+        _invalidate_popular_tags()
+
+
+def _tag_ids(article):
+    """Returns the primary keys of an article's tags."""
+    return set(TaggedArticle.objects.filter(content_object=article).values_list("tag_id", flat=True))
+
+
+@receiver(post_save, sender=Article)
+def fan_out_published_article(sender, instance, created, **kwargs):
+    """
+    Signal receiver that copies a new article into its followers' timelines
+    once the transaction commits.
+
+    Args:
+        sender: The model class that sent the signal (Article).
+        instance: The saved Article instance.
+        created (bool): True if the article was just created.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    if created:
+        transaction.on_commit(partial(fan_out_article, instance))
+
+
+@receiver(m2m_changed, sender=Profile.followers.through)
+def sync_timelines_on_follow(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Signal receiver that backfills or cleans timelines when follows change.
+
+    ``follower.following.add(profile)`` arrives with ``reverse=True`` and the
+    follower as instance; ``profile.followers.add(follower)`` arrives with
+    ``reverse=False`` and the followed profile as instance.
+
+    Args:
+        sender: The follow through model.
+        instance: The Profile whose relation changed.
+        action (str): The m2m_changed action name.
+        reverse (bool): True if the change was made from the ``following`` side.
+        pk_set (set): Primary keys of the profiles on the other side.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    if action == "post_clear":
+        if reverse:
+            remove_from_timelines(owner_ids=[instance.user_id])
+        else:
+            remove_from_timelines(author_ids=[instance.user_id])
+        return
+    if action not in ("post_add", "post_remove") or not pk_set:
+        return
+
+    other_user_ids = list(Profile.objects.filter(pk__in=pk_set).values_list("user_id", flat=True))
+    if reverse:
+        pairs = [(instance.user_id, other_user_ids)]
+    else:
+        pairs = [(owner_id, [instance.user_id]) for owner_id in other_user_ids]
+    for owner_id, author_ids in pairs:
+        if action == "post_add":
+            backfill_timeline(owner_id, author_ids)
+        else:
+            remove_from_timelines(owner_ids=[owner_id], author_ids=author_ids)
+
+
+@receiver([post_save, post_delete], sender=Article)
+def invalidate_cached_article(sender, instance, **kwargs):
+    """
+    Signal receiver that bumps the cache version of a changed article and
+    the list generation once the transaction commits.
+
+    Args:
+        sender: The model class that sent the signal (Article).
+        instance: The saved or deleted Article instance.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    transaction.on_commit(partial(article_cache.invalidate, instance.id))
+
+
+@receiver(post_save, sender=Rating)
+@receiver(post_save, sender=Bookmark)
+@receiver(post_save, sender=Clap)
+@receiver(post_save, sender=Comment)
+def count_added_engagement(sender, instance, created, **kwargs):
+    """
+    Signal receiver that increments the article's engagement counters.
+
+    The ``F()`` update runs inside the transaction of the insert, so the row
+    and the counter commit or roll back together.
+
+    Args:
+        sender: The engagement model class.
+        instance: The saved engagement.
+        created (bool): True if the engagement was just created.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    if created:
+        Article.objects.filter(pkid=instance.article_id).add_engagement(**engagement_deltas(instance))
+
+
+@receiver(post_delete, sender=Rating)
+@receiver(post_delete, sender=Bookmark)
+@receiver(post_delete, sender=Clap)
+@receiver(post_delete, sender=Comment)
+def count_removed_engagement(sender, instance, origin=None, **kwargs):
+    """
+    Signal receiver that decrements the article's engagement counters.
+
+    Rows removed by deleting their article need no counting, and rows
+    removed by deleting their user are recounted once per user by
+    ``recount_deleted_user_engagement``, so neither runs an update per row.
+
+    Args:
+        sender: The engagement model class.
+        instance: The deleted engagement.
+        origin: The instance or queryset whose delete removed the engagement.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    if _cascaded_from(origin, Article, User):
+        return
+    Article.objects.filter(pkid=instance.article_id).add_engagement(**engagement_deltas(instance, sign=-1))
+
+
+@receiver([post_save, post_delete], sender=Rating)
+@receiver([post_save, post_delete], sender=Bookmark)
+@receiver([post_save, post_delete], sender=Clap)
+@receiver([post_save, post_delete], sender=Comment)
+def invalidate_cached_engagement(sender, instance, origin=None, **kwargs):
+    """
+    Signal receiver that invalidates the cached article whose clap, bookmark,
+    comment or rating statistics changed, and the viewer-state list pages of
+    the engaging user. Shared list pages pick the counters up within
+    ``ARTICLE_LIST_COUNTERS_TIMEOUT``.
+
+    The article's public id is taken from the loaded article when there is
+    one, and otherwise looked up after commit, so no article is loaded per
+    row. Rows deleted with their article are skipped, as the article's own
+    delete invalidates it; those deleted with their user are invalidated by
+    ``recount_deleted_user_engagement``.
+
+    Args:
+        sender: The engagement model class.
+        instance: The saved or deleted engagement.
+        origin: For deletes, the instance or queryset whose delete removed the engagement.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    if _cascaded_from(origin, Article, User):
+        return
+    options = {"lists": False, "viewer_id": instance.user_id}
+    if sender.article.is_cached(instance):
+        transaction.on_commit(partial(article_cache.invalidate, instance.article.id, **options))
+    else:
+        transaction.on_commit(partial(_invalidate_articles, [instance.article_id], **options))
+
+
+@receiver(post_save, sender=Comment)
+def count_added_reply(sender, instance, created, **kwargs):
+    """
+    Signal receiver that increments the reply count of the comment replied to.
+
+    Args:
+        sender: The Comment model class.
+        instance: The saved comment.
+        created (bool): True if the comment was just created.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    if created and instance.parent_id:
+        Comment.objects.filter(pkid=instance.parent_id).update(reply_count=F("reply_count") + 1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_removed_reply(sender, instance, origin=None, **kwargs):
+    """
+    Signal receiver that decrements the reply count of the comment replied to.
+
+    Replies deleted with their article are skipped, since the comments they
+    replied to are deleted too; those deleted with their user are recounted
+    by ``recount_deleted_user_engagement``.
+
+    Args:
+        sender: The Comment model class.
+        instance: The deleted comment.
+        origin: The instance or queryset whose delete removed the comment.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    if instance.parent_id and not _cascaded_from(origin, Article, User):
+        Comment.objects.filter(pkid=instance.parent_id).update(
+            reply_count=Greatest(F("reply_count") - 1, Value(0))
+        )
+
+
+@receiver(pre_delete, sender=User)
+def collect_deleting_user_engagement(sender, instance, **kwargs):
+    """
+    Signal receiver that notes what a deleted user's engagements counted towards.
+
+    Records the articles the user engaged with and the comments they replied
+    to, before the cascade removes the rows that tell.
+
+    Args:
+        sender: The user model class.
+        instance: The User being deleted.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    instance._engaged_article_pkids = {
+        article_id
+        for model in ENGAGEMENT_MODELS
+        for article_id in model.objects.filter(user=instance).values_list("article_id", flat=True).distinct()
+    }
+    instance._replied_comment_pkids = set(
+        Comment.objects.filter(user=instance, parent__isnull=False).values_list("parent_id", flat=True).distinct()
+    )
+
+
+@receiver(post_delete, sender=User)
+def recount_deleted_user_engagement(sender, instance, **kwargs):
+    """
+    Signal receiver that recounts what a deleted user's engagements counted towards.
+
+    Runs one recount per user instead of one update per deleted row, and
+    invalidates the cached responses of the recounted articles.
+
+    Args:
+        sender: The user model class.
+        instance: The deleted User instance.
+        **kwargs: Additional keyword arguments passed with the signal.
+    """
+    article_pkids = getattr(instance, "_engaged_article_pkids", None)
+    if article_pkids:
+        Article.objects.filter(pkid__in=article_pkids).recount_engagement()
+        transaction.on_commit(partial(_invalidate_articles, list(article_pkids), lists=False))
+    comment_pkids = getattr(instance, "_replied_comment_pkids", None)
+    if comment_pkids:
+        Comment.objects.filter(pkid__in=comment_pkids).recount_replies()
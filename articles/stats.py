@@ -0,0 +1,224 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from datetime import timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Count, F, Min, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from articles.models import Article, ArticleStatsDaily, ArticleStatsHourly, ArticleView, Clap, JobCheckpoint, Rating
+
+
+JOB_NAME = "stats_rollups"
+
+# Events newer than this are left for the next run, so rows of transactions
+# still in flight when the job reads are not skipped past the high-water mark.
+SETTLE_DELAY = timedelta(minutes=1)
+
+# Time range aggregated and committed at once, bounding each step's work.
+SLICE = timedelta(days=1)
+
+STATS_COLUMNS = ["views", "claps", "ratings", "rating_sum"]
+
+# Raw event tables, with the rollup columns they feed and how.
+STATS_SOURCES = [
+    (ArticleView, {"views": Count("pk")}),
+    (Clap, {"claps": Count("pk")}),
+    (Rating, {"ratings": Count("pk"), "rating_sum": Sum("rating")}),
+]
+
+
+def add_to_rollup(rollup, totals, columns):
+    """Adds totals to rollup rows, creating missing rows.
+
+    Args:
+        rollup (Model): ``ArticleStatsHourly`` or ``ArticleStatsDaily``
+        totals (dict): ``(article_pkid, author_pk, start)`` mapped to a dict of column deltas
+        columns (list): Columns present in the deltas
+    """
+    existing = {
+        (row["article_id"], row["start"]): row
+        for row in rollup.objects.filter(
+            article_id__in={article_id for article_id, _, _ in totals},
+            start__in={start for _, _, start in totals},
+        ).values("article_id", "start", *columns)
+    }
+    rows = []
+    for (article_id, author_id, start), deltas in totals.items():
+        current = existing.get((article_id, start), {})
+        values = {column: current.get(column, 0) + deltas[column] for column in columns}
+        rows.append(rollup(article_id=article_id, author_id=author_id, start=start, **values))
+    rollup.objects.bulk_create(rows, update_conflicts=True, unique_fields=["article", "start"], update_fields=columns)
+
+
+def roll_up_range(model, aggregates, start, end):
+    """Adds the events of one table created in ``(start, end]`` to the hourly and daily rollups.
+
+    The events are grouped by article and hour in the database, over an
+    index range on ``created``; daily totals are summed from those hourly
+    groups.
+
+    Args:
+        model (Model): Event model
+        aggregates (dict): Rollup column mapped to the aggregate computing it
+        start (datetime): Exclusive lower bound
+        end (datetime): Inclusive upper bound
+
+    Returns:
+        int: Number of hourly groups added
+    """
+    groups = (
+        model.objects.filter(created__gt=start, created__lte=end)
+        .values("article_id", article_author=F("article__author_id"), hour=TruncHour("created"))
+        .annotate(**aggregates)
+        .order_by()
+    )
+    columns = list(aggregates)
+    hourly, daily = {}, defaultdict(lambda: dict.fromkeys(columns, 0))
+    for group in groups:
+        deltas = {column: group[column] or 0 for column in columns}
+        hourly[(group["article_id"], group["article_author"], group["hour"])] = deltas
+        day = daily[(group["article_id"], group["article_author"], group["hour"].date())]
+        for column in columns:
+            day[column] += deltas[column]
+    if hourly:
+        add_to_rollup(ArticleStatsHourly, hourly, columns)
+        add_to_rollup(ArticleStatsDaily, daily, columns)
+    return len(hourly)
+
+
+def add_views(deltas, moment):
+    """Adds views counted outside ArticleView to the rollups of an hour and day.
+
+    Used by the ``sketch`` views mode, which writes no ArticleView rows
+    for ``rollup_stats`` to read. Missing rows are created first, then
+    counts are incremented with ``F()`` updates, one per distinct amount, so
+    concurrent ingestion workers never overwrite each other.
+
+    Args:
+        deltas (dict): Article pkid mapped to its number of new views
+        moment (datetime): Time of the views
+    """
+    if not deltas:
+        return
+    authors = dict(Article.objects.filter(pkid__in=deltas).values_list("pkid", "author_id"))
+    hour = moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+    by_amount = defaultdict(list)
+    for article_id, views in deltas.items():
+        if article_id in authors:
+            by_amount[views].append(article_id)
+    with transaction.atomic():
+        for rollup, start in ((ArticleStatsHourly, hour), (ArticleStatsDaily, hour.date())):
+            rollup.objects.bulk_create(
+                [rollup(article_id=article_id, author_id=author_id, start=start) for article_id, author_id in authors.items()],
+                ignore_conflicts=True,
+            )
+            for views, article_ids in by_amount.items():
+                rollup.objects.filter(article_id__in=article_ids, start=start).update(views=F("views") + views)
+
+
+def rollup_stats(until=None):
+    """Brings the hourly and daily rollups up to date.
+
+    Each event table keeps its own high-water mark on ``created`` in
+    ``JobCheckpoint``; events created after it and up to ``until`` are
+    aggregated one ``SLICE`` at a time, each slice committing together with
+    its new mark, so an interrupted run never counts an event twice. A table
+    rolled up for the first time starts at its oldest event.
+
+    Args:
+        until (datetime, optional): Upper bound of the events rolled up.
+            Defaults to ``SETTLE_DELAY`` before the current time.
+
+    Returns:
+        int: Number of hourly groups added
+    """
+    until = until or timezone.now() - SETTLE_DELAY
+    added = 0
+    for model, aggregates in STATS_SOURCES:
+        name = f"{JOB_NAME}:{model._meta.model_name}"
+        position = JobCheckpoint.position_of(name)
+        if position is None:
+            first = model.objects.aggregate(first=Min("created"))["first"]
+            if first is None:
+                JobCheckpoint.advance(name, position=until)
+                continue
+            position = first - timedelta(microseconds=1)
+        while position < until:
+            end = min(position + SLICE, until)
+            with transaction.atomic():
+                added += roll_up_range(model, aggregates, position, end)
+                JobCheckpoint.advance(name, position=end)
+            position = end
+    return added
+
+
+def rollups_between(bucket, first_day, last_day):
+    """Returns the rollup rows of a range of whole days.
+
+    Args:
+        bucket (str): ``"hour"`` or ``"day"``
+        first_day (date): First day of the range
+        last_day (date): Last day of the range, included
+
+    Returns:
+        QuerySet: ``ArticleStatsHourly`` or ``ArticleStatsDaily`` rows in the range
+    """
+    if bucket == "day":
+        return ArticleStatsDaily.objects.filter(start__range=(first_day, last_day))
+    start = datetime.combine(first_day, time.min, tzinfo=dt_timezone.utc)
+    end = datetime.combine(last_day + timedelta(days=1), time.min, tzinfo=dt_timezone.utc)
+    return ArticleStatsHourly.objects.filter(start__gte=start, start__lt=end)
+
+
+def _sums():
+    """Returns the aggregates summing every rollup column, named ``total_<column>``."""
+    return {f"total_{column}": Sum(column) for column in STATS_COLUMNS}
+
+
+def _entry(row, **extra):
+    """Builds a stats entry from summed rollup columns, with the mean rating instead of its sum."""
+    entry = {**extra, **{column: row[f"total_{column}"] or 0 for column in STATS_COLUMNS}}
+    rating_sum = entry.pop("rating_sum")
+    entry["average_rating"] = rating_sum / entry["ratings"] if entry["ratings"] else None
+    return entry
+
+
+def stats_series(rollups, bucket):
+    """Sums rollup rows per bucket and over the whole range.
+
+    Args:
+        rollups (QuerySet): Filtered ``ArticleStatsHourly`` or ``ArticleStatsDaily`` rows
+        bucket (str): ``"hour"`` or ``"day"``, the key of each entry's start
+
+    Returns:
+        dict: ``series`` (one entry per bucket with engagement, oldest first)
+            and ``totals``
+    """
+    rows = list(rollups.values("start").annotate(**_sums()).order_by("start"))
+    totals = {
+        f"total_{column}": sum(row[f"total_{column}"] or 0 for row in rows) for column in STATS_COLUMNS
+    }
+    return {
+        "series": [_entry(row, **{bucket: row["start"]}) for row in rows],
+        "totals": _entry(totals),
+    }
+
+
+def top_articles(rollups, limit=10):
+    """Sums rollup rows per article, most viewed first.
+
+    Args:
+        rollups (QuerySet): Filtered rollup rows
+        limit (int, optional): Number of articles returned. Defaults to 10.
+
+    Returns:
+        list: ``id``, ``title`` and totals of each article
+    """
+    rows = (
+        rollups.values(article_uuid=F("article__id"), article_title=F("article__title"))
+        .annotate(**_sums())
+        .order_by("-total_views", "-total_claps")[:limit]
+    )
+    return [_entry(row, id=row["article_uuid"], title=row["article_title"]) for row in rows]
@@ -1,9 +1,18 @@
 import pytest
-from articles.models import Article, ArticleView, Rating, Bookmark, Clap, Comment
-from articles.services import estimate_time_reading
+from django.utils import timezone
+from articles.models import Article, ArticleStatsDaily, ArticleStatsHourly, ArticleView, ArticleViewSketch, Rating, Bookmark, Clap, Comment, SearchTerm, TrendingBucket
+from articles.ingestion import ViewEvent
+from articles.sketches import HyperLogLog
+from articles.documents import ArticleDocument
+from articles.search import InvertedIndexSearchBackend, SQLiteSearchBackend, get_search_backend, sqlite_has_fts5
+from articles.services import count_words, estimate_time_reading
 from articles.factories import ArticleFactory, ArticleViewFactory,BookmarkFactory, ClapFactory, CommentFactory, RatingFactory
 from users.factories import UserFactory
 from math import ceil
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from articles.buffers import views_count_buffer
 
 
 @pytest.mark.django_db
@@ -22,9 +31,116 @@ def test_article_views_count():
     article = ArticleFactory()
 
     assert article.views_count == 0
-    ArticleView.objects.create(article=article, user=article.author, viewer_ip='192.168.1.1')
+    ArticleView.record_view(article=article, user=article.author, viewer_ip='192.168.1.1')
+    views_count_buffer.flush()
+    article.refresh_from_db()
     assert article.views_count == 1
 
+
+@pytest.mark.django_db
+def test_views_count_buffer_batches_increments():
+    article = ArticleFactory()
+    views_count_buffer.increment(article.pkid)
+    views_count_buffer.increment(article.pkid, 2)
+    assert views_count_buffer.pending(article.pkid) == 3
+
+    article.refresh_from_db()
+    assert article.views_count == 0
+    views_count_buffer.flush()
+    article.refresh_from_db()
+    assert article.views_count == 3
+    assert views_count_buffer.pending(article.pkid) == 0
+
+
+@pytest.mark.django_db
+def test_reconcile_views_count_command():
+    article = ArticleFactory()
+    ArticleViewFactory(article=article)
+    ArticleViewFactory(article=article)
+    Article.objects.filter(pkid=article.pkid).update(views_count=42)
+
+    call_command("reconcile_views_count", batch_size=1)
+    article.refresh_from_db()
+    assert article.views_count == 2
+
+@pytest.mark.django_db
+def test_engagement_counters_follow_writes_and_deletes():
+    article = ArticleFactory()
+    clap = ClapFactory(article=article)
+    BookmarkFactory(article=article)
+    CommentFactory(article=article)
+    RatingFactory(article=article, rating=4)
+    RatingFactory(article=article, rating=5)
+    article.refresh_from_db()
+    assert (article.clap_count, article.bookmark_count, article.comment_count) == (1, 1, 1)
+    assert (article.rating_count, article.rating_sum, article.average_rating) == (2, 9, 4.5)
+
+    clap.delete()
+    article.refresh_from_db()
+    assert article.clap_count == 0
+
+@pytest.mark.django_db
+def test_cascaded_engagement_deletes_do_not_update_per_row():
+    article = ArticleFactory()
+    other = ArticleFactory()
+    clappers = UserFactory.create_batch(20)
+    for user in clappers:
+        ClapFactory(article=article, user=user)
+    root = CommentFactory(article=article)
+    CommentFactory.create_batch(5, article=article, parent=root)
+
+    small = ArticleFactory()
+    ClapFactory(article=small)
+    CommentFactory(article=small, parent=CommentFactory(article=small))
+    with CaptureQueriesContext(connection) as few:
+        small.delete()
+    with CaptureQueriesContext(connection) as queries:
+        article.delete()
+    assert len(queries) == len(few) < 30
+    assert not any(query['sql'].startswith('UPDATE "articles_article"') for query in queries.captured_queries)
+
+    user = clappers[0]
+    ClapFactory(article=other, user=user)
+    CommentFactory(article=other, user=user, parent=CommentFactory(article=other))
+    other.refresh_from_db()
+    assert (other.clap_count, other.comment_count) == (1, 2)
+    user.delete()
+    other.refresh_from_db()
+    assert (other.clap_count, other.comment_count) == (0, 1)
+    assert Comment.objects.get(article=other).reply_count == 0
+
+@pytest.mark.django_db
+def test_recount_engagement_command():
+    article = ArticleFactory()
+    ClapFactory.create_batch(2, article=article)
+    RatingFactory(article=article, rating=3)
+    Article.objects.filter(pkid=article.pkid).update(clap_count=42, rating_sum=0, rating_count=0)
+
+    call_command("recount_engagement", batch_size=1)
+    article.refresh_from_db()
+    assert article.clap_count == 2
+    assert article.average_rating == 3
+
+@pytest.mark.django_db
+def test_rating_histogram_and_bayesian_score(settings):
+    settings.RATING_PRIOR_MEAN = 3.0
+    settings.RATING_PRIOR_WEIGHT = 2
+    article = ArticleFactory()
+    assert article.rating_score == 0
+    RatingFactory(article=article, rating=5)
+    rating = RatingFactory(article=article, rating=5)
+    RatingFactory(article=article, rating=2)
+    article.refresh_from_db()
+    assert article.rating_histogram == {1: 0, 2: 1, 3: 0, 4: 0, 5: 2}
+    assert article.rating_score == pytest.approx((2 * 3.0 + 12) / (2 + 3))
+
+    rating.delete()
+    Article.objects.filter(pkid=article.pkid).update(rating_5_count=9, rating_score=0)
+    call_command("recount_engagement")
+    article.refresh_from_db()
+    assert article.rating_histogram[5] == 1
+    assert article.rating_score == pytest.approx((2 * 3.0 + 7) / (2 + 2))
+
 @pytest.mark.django_db
 def test_article_view_record_view():
     # First view
@@ -37,11 +153,33 @@ def test_article_view_record_view():
     assert ArticleView.objects.count() == 1  # No new record should be created
 
 
+@pytest.mark.django_db
+def test_record_views_counts_only_inserted_rows():
+    article, other = ArticleFactory(), ArticleFactory()
+    reader = UserFactory()
+    ArticleView.record_view(article=article, user=reader, viewer_ip='10.0.0.1')
+    views_count_buffer.clear()
+
+    # A row written by another worker between the lookup and the insert.
+    assert ArticleView._insert_new([(article.pkid, reader.pk, '10.0.0.1'), (other.pkid, reader.pk, '10.0.0.1')]) == [other.pkid]
+
+    events = [
+        ViewEvent(article.pkid, reader.pk, '10.0.0.1'),
+        ViewEvent(article.pkid, reader.pk, None),
+        ViewEvent(other.pkid, article.author.pk, '10.0.0.1'),
+    ]
+    assert ArticleView.record_views(events) == 2
+    assert ArticleView.record_views(events) == 0
+    assert views_count_buffer.pending(article.pkid) == 1
+    assert views_count_buffer.pending(other.pkid) == 1
+    views_count_buffer.clear()
+
+
 @pytest.mark.django_db
 def test_rating_creation():
     rating = RatingFactory(review="Excellent article!")
     assert isinstance(rating, Rating)
-    assert rating.rating == '5'
+    assert rating.rating == 5
     assert rating.review == 'Excellent article!'
     assert rating.__str__() == f"Rating {rating.rating} for {rating.article} by {rating.user}"
 
@@ -94,4 +232,214 @@ def test_estimate_time_reading():
     expected_time = ceil(10 / 10)  # 1.0
     assert time == expected_time
 
-    
\ No newline at end of file
+    
+
+def test_hyperloglog_estimate_within_error_bound():
+    sketch = HyperLogLog()
+    for viewer in range(20000):
+        sketch.add(f"{viewer}|10.0.0.1")
+    sketch.add("1|10.0.0.1")  # duplicates do not change the estimate
+
+    assert abs(sketch.count() - 20000) / 20000 < 0.05
+    assert HyperLogLog.from_bytes(sketch.to_bytes()).count() == sketch.count()
+
+
+def test_hyperloglog_merge_is_a_union():
+    monday, tuesday = HyperLogLog(), HyperLogLog()
+    for viewer in range(100):
+        monday.add(str(viewer))
+    for viewer in range(50, 150):
+        tuesday.add(str(viewer))
+
+    assert monday.merge(tuesday).count() == pytest.approx(150, abs=5)
+
+
+@pytest.mark.django_db
+def test_record_views_in_sketch_mode(settings):
+    settings.ARTICLE_VIEWS_MODE = "sketch"
+    article = ArticleFactory()
+    viewers = UserFactory.create_batch(3)
+
+    ArticleView.record_views([ViewEvent(article.pkid, user.pk, '127.0.0.1') for user in viewers])
+    ArticleView.record_views([ViewEvent(article.pkid, viewers[0].pk, '127.0.0.1')])
+
+    article.refresh_from_db()
+    assert article.views_count == 3
+    assert ArticleView.objects.count() == 0
+    assert ArticleViewSketch.objects.get(article=article).day == timezone.localdate()
+    assert ArticleViewSketch.estimate(article) == 3
+    # Without ArticleView rows, trending and stats are fed from the sketch.
+    assert TrendingBucket.objects.get(article=article).views == 3
+    assert ArticleStatsHourly.objects.get(article=article).views == 3
+    assert ArticleStatsDaily.objects.get(article=article, author=article.author).views == 3
+
+    settings.ARTICLE_VIEWS_AUDIT_LOG = True
+    ArticleView.record_views([ViewEvent(article.pkid, viewers[1].pk, '10.0.0.1')])
+    assert ArticleView.objects.count() == 1
+
+
+def test_count_words_streams_chunks():
+    assert count_words("This is a sample article text.") == 6
+    assert count_words(["This is a sam", "ple article text."]) == 6
+    assert count_words(["word ", "word"]) == 2
+    assert count_words("") == 0
+    assert count_words(None) == 0
+
+
+@pytest.mark.django_db
+def test_reading_stats_stored_on_save():
+    article = ArticleFactory(body="word " * 1000)
+    assert article.word_count == 1000
+    assert article.time_reading == 4
+
+    article.title = "Only the title changed"
+    article.word_count = 0
+    article.save()
+    assert article.word_count == 0  # body unchanged, nothing recomputed
+
+    article.body = "word " * 251
+    article.save(update_fields=["body"])
+    article.refresh_from_db()
+    assert article.word_count == 251
+    assert article.reading_time_minutes == 2
+
+
+@pytest.mark.django_db
+def test_backfill_reading_time_command():
+    articles = ArticleFactory.create_batch(3, body="one two three")
+    Article.objects.update(word_count=0, reading_time_minutes=0)
+
+    call_command("backfill_reading_time", batch_size=2)
+    for article in articles:
+        article.refresh_from_db()
+        assert article.word_count == 3
+        assert article.reading_time_minutes == 1
+
+
+@pytest.mark.django_db
+def test_article_document_prepare():
+    article = ArticleFactory(title="Indexed article")
+    article.tags.add("search", "django")
+
+    data = ArticleDocument().prepare(article)
+    assert data["title"] == "Indexed article"
+    assert sorted(data["tags"]) == ["django", "search"]
+    assert data["author_name"] == article.author.full_name
+
+
+@pytest.mark.django_db
+def test_inverted_index_ranks_with_bm25(settings):
+    settings.ARTICLE_SEARCH_BACKEND = "inverted"
+    title_match = ArticleFactory(title="Django caching", body="Notes on caches.")
+    body_match = ArticleFactory(title="Notes", body="A long post that mentions django once among many other words.")
+    ArticleFactory(title="Unrelated", body="Nothing here.")
+
+    result = InvertedIndexSearchBackend().search("django")
+    assert result.total == 2
+    assert [hit.pkid for hit in result.hits] == [title_match.pkid, body_match.pkid]
+    assert result.hits[0].score > result.hits[1].score > 0
+    assert "<em>Django</em>" in result.hits[0].highlight["title"][0]
+
+
+@pytest.mark.django_db
+def test_inverted_index_prefix_and_phrase_queries(settings):
+    settings.ARTICLE_SEARCH_BACKEND = "inverted"
+    ordered = ArticleFactory(title="Query planner", body="The query planner picks an index.")
+    reversed_words = ArticleFactory(title="Planner", body="A planner for every query.")
+    backend = InvertedIndexSearchBackend()
+
+    assert {hit.pkid for hit in backend.search("plan*").hits} == {ordered.pkid, reversed_words.pkid}
+    assert [hit.pkid for hit in backend.search('"query planner"').hits] == [ordered.pkid]
+    assert backend.search('"planner query"').total == 0
+    assert backend.search("plan* missing").total == 0
+
+
+@pytest.mark.django_db
+def test_inverted_index_maintained_on_save_and_delete(settings):
+    settings.ARTICLE_SEARCH_BACKEND = "inverted"
+    backend = InvertedIndexSearchBackend()
+    article = ArticleFactory(title="Original", body="postgres tuning")
+    other = ArticleFactory(title="Other", body="postgres replication")
+    assert SearchTerm.objects.get(token="postgres").document_frequency == 2
+
+    article.body = "sqlite tuning"
+    article.save()
+    assert backend.search("postgres").total == 1
+    assert backend.search("sqlite").total == 1
+    assert SearchTerm.objects.get(token="postgres").document_frequency == 1
+
+    other.delete()
+    assert backend.search("postgres").total == 0
+    assert SearchTerm.objects.get(token="postgres").document_frequency == 0
+
+    call_command("rebuild_search_index", backend="inverted")
+    assert SearchTerm.objects.get(token="tuning").document_frequency == 1
+    assert [hit.pkid for hit in backend.search("tuning").hits] == [article.pkid]
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(not sqlite_has_fts5(), reason="SQLite built without FTS5")
+def test_sqlite_fts5_backend(settings):
+    settings.ARTICLE_SEARCH_BACKEND = "auto"
+    backend = get_search_backend()
+    assert isinstance(backend, SQLiteSearchBackend)
+    title_match = ArticleFactory(title="Indexing strategies", body="Notes on tables.")
+    body_match = ArticleFactory(title="Notes", body="A post about indexing large tables of text.")
+
+    result = backend.search("indexing")
+    assert [hit.pkid for hit in result.hits] == [title_match.pkid, body_match.pkid]
+    assert backend.search("index*").total == 2
+    assert [hit.pkid for hit in backend.search('"large tables"').hits] == [body_match.pkid]
+
+    body_match.body = "Rewritten."
+    body_match.save()
+    assert backend.search("tables").total == 1
+    title_match.delete()
+    assert backend.search("tables").total == 0
+
+
+@pytest.mark.django_db
+def test_comment_threads_paths_and_reply_counts():
+    root = CommentFactory()
+    reply = CommentFactory(article=root.article, parent=root)
+    nested = CommentFactory(article=root.article, parent=reply)
+    sibling = CommentFactory(article=root.article)
+    CommentFactory(article=root.article, parent=sibling)
+
+    assert nested.path.startswith(reply.path) and reply.path.startswith(root.path)
+    assert (root.depth, reply.depth, nested.depth) == (0, 1, 2)
+    assert list(Comment.objects.subtree(root)) == [reply, nested]
+    root.refresh_from_db()
+    assert root.reply_count == 1
+    assert root.article.comments.top_level().count() == 2
+
+    nested.delete()
+    reply.refresh_from_db()
+    assert reply.reply_count == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != "postgresql", reason="Collation of comment paths only differs on PostgreSQL")
+def test_comment_subtree_under_database_collation():
+    root = CommentFactory()
+    reply = CommentFactory(article=root.article, parent=root)
+    grandchild = CommentFactory(article=root.article, parent=reply)
+    CommentFactory(article=root.article)
+
+    # "/" is ignored at the first level of non-C collations such as
+    # en_US.UTF-8, so a subtree bounded by path order would lose grandchild.
+    assert list(Comment.objects.subtree(root)) == [reply, grandchild]
+    assert list(Comment.objects.subtree(reply)) == [grandchild]
+
+
+@pytest.mark.django_db
+def test_assign_paths_fills_bulk_inserted_comments():
+    parent = CommentFactory()
+    Comment.objects.bulk_create([
+        Comment(article=parent.article, user=parent.user, title="a", content="b"),
+        Comment(article=parent.article, user=parent.user, parent=parent, title="c", content="d"),
+    ])
+    assert Comment.objects.filter(path="").assign_paths() == 2
+    top, reply = Comment.objects.exclude(pkid=parent.pkid).order_by("pkid")
+    assert top.path == f"{top.pkid:012d}/"
+    assert reply.path == f"{parent.path}{reply.pkid:012d}/"
@@ -35,6 +35,18 @@ class TestArticleInSerializer:
         assert not serializer.is_valid()
         assert 'title' in serializer.errors
 
+    def test_article_in_serializer_sets_and_replaces_tags(self):
+        user = UserFactory()
+        serializer = ArticleInSerializer(data={'title': 'Tagged', 'body': 'Body', 'tags': ['django', 'python']})
+        assert serializer.is_valid(), serializer.errors
+        article = serializer.save(author=user)
+        assert sorted(article.tags.names()) == ['django', 'python']
+
+        serializer = ArticleInSerializer(article, data={'tags': ['rest']}, partial=True)
+        assert serializer.is_valid(), serializer.errors
+        serializer.save()
+        assert list(article.tags.names()) == ['rest']
+
 
 @pytest.mark.django_db
 class TestArticleOutSerializer:
@@ -62,7 +74,7 @@ class TestRatingSerializer:
         serializer = RatingSerializer(data=rating_data)
         assert serializer.is_valid()
         rating = serializer.save(user=user)  # Changed from author to user
-        assert rating.rating == '5'
+        assert rating.rating == 5
         assert rating.review == 'Excellent article!'
         assert rating.article == article
 
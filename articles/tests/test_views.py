@@ -1,10 +1,19 @@
+import time
+
 import pytest
 from rest_framework import status
 from rest_framework.test import APIClient
-from articles.models import Article, Rating, Bookmark, Clap, Comment
+from articles.models import Article, ArticleView, Rating, Bookmark, Clap, Comment, TimelineEntry
+from articles.buffers import views_count_buffer
+from articles.cache import article_cache
+from articles.ingestion import ViewEvent, view_events
 from users.factories import UserFactory
-from articles.factories import ArticleFactory, RatingFactory, BookmarkFactory, ClapFactory, CommentFactory
+from articles.factories import ArticleFactory, ArticleViewFactory, RatingFactory, BookmarkFactory, ClapFactory, CommentFactory
 from django.urls import reverse
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from articles.services import estimate_time_reading
 
 
@@ -38,6 +47,15 @@ class TestArticleCreateAPIView:
         response = client.post(reverse('articles:article-create'), article_data, format='json')
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
+    def test_create_article_with_tags(self):
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+
+        article_data = {'title': 'Tagged', 'body': 'Body', 'tags': ['django', 'python']}
+        response = client.post(reverse('articles:article-create'), article_data, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert sorted(Article.objects.get().tags.names()) == ['django', 'python']
+
 
 @pytest.mark.django_db
 class TestArticleRetrieveUpdateDestroy:
@@ -178,6 +196,75 @@ class TestClapAPIView:
         assert response.status_code == status.HTTP_403_FORBIDDEN
         assert 'You cannot clap for your own article' in str(response.data)
 
+    def test_clap_is_one_statement_and_idempotent(self):
+        user = UserFactory()
+        article = ArticleFactory()
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('articles:article-clap', kwargs={'article_id': article.id})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(url)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert article.title in response.data['message']
+        inserts = [query['sql'] for query in queries if query['sql'].startswith('INSERT')]
+        assert len(inserts) == 1 and 'ON CONFLICT DO NOTHING' in inserts[0]
+
+        response = client.post(url)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Clap.objects.count() == 1
+        article.refresh_from_db()
+        assert article.clap_count == 1
+
+    def test_clap_unknown_article(self):
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+        url = reverse('articles:article-clap', kwargs={'article_id': '00000000-0000-0000-0000-000000000000'})
+        assert client.post(url).status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestEngagementBatchAPIView:
+    def test_mixed_batch_reports_each_operation(self, django_capture_on_commit_callbacks):
+        user = UserFactory()
+        article, own = ArticleFactory(), ArticleFactory(author=user)
+        ClapFactory(user=user, article=ArticleFactory())
+        existing = Clap.objects.get(user=user).article
+        client = APIClient()
+        client.force_authenticate(user=user)
+        operations = [
+            {'type': 'clap', 'article': str(article.id)},
+            {'type': 'clap', 'article': str(article.id)},
+            {'type': 'bookmark', 'article': str(own.id)},
+            {'type': 'rate', 'article': str(article.id), 'rating': '4', 'review': 'Good'},
+            {'type': 'comment', 'article': str(article.id), 'title': 'Hi', 'content': 'Nice'},
+            {'type': 'clap', 'article': str(own.id)},
+            {'type': 'clap', 'article': str(existing.id)},
+            {'type': 'clap', 'article': '00000000-0000-0000-0000-000000000000'},
+            {'type': 'rate', 'article': str(article.id)},
+        ]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                response = client.post(reverse('articles:engagement-batch'), {'operations': operations}, format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['status'] for item in response.data['results']] == [201, 400, 201, 201, 201, 403, 400, 404, 400]
+        assert 'rating' in response.data['results'][8]['errors']
+        assert len([query for query in queries if query['sql'].startswith('INSERT')]) == 4
+
+        article.refresh_from_db()
+        assert (article.clap_count, article.comment_count, article.average_rating) == (1, 1, 4)
+        assert Bookmark.objects.filter(user=user, article=own).exists()
+
+    def test_batch_size_is_limited(self, settings):
+        settings.ENGAGEMENT_BATCH_MAX_OPERATIONS = 1
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+        article = ArticleFactory()
+        operations = [{'type': 'bookmark', 'article': str(article.id)}] * 2
+        response = client.post(reverse('articles:engagement-batch'), {'operations': operations}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
 
 @pytest.mark.django_db
 class TestCommentAPIView:
@@ -235,3 +322,644 @@ def test_estimate_time_reading():
     article.save()
     time = estimate_time_reading(article, words_per_minute=250)
     assert time == 4  # 1000 / 250 = 4.0
+
+
+@pytest.mark.django_db
+class TestArticleViewIngestion:
+    def test_get_article_queues_view_event(self):
+        user = UserFactory()
+        article = ArticleFactory()
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.get(reverse('articles:article-retrieve', kwargs={'id': article.id}))
+        assert response.status_code == status.HTTP_200_OK
+        assert ArticleView.objects.count() == 0
+
+        assert view_events.drain() == 1
+        assert ArticleView.objects.filter(article=article, user=user).count() == 1
+        article.refresh_from_db()
+        assert article.views_count == 1
+
+    def test_duplicate_view_events_are_collapsed(self):
+        user = UserFactory()
+        article = ArticleFactory()
+        ArticleView.record_view(article, user, '127.0.0.1')
+        views_count_buffer.flush()
+
+        for _ in range(3):
+            view_events.enqueue(ViewEvent(article.pkid, user.pk, '127.0.0.1'))
+        view_events.enqueue(ViewEvent(article.pkid, user.pk, '10.0.0.1'))
+
+        assert view_events.drain() == 1
+        assert ArticleView.objects.filter(article=article).count() == 2
+        article.refresh_from_db()
+        assert article.views_count == 2
+
+
+@pytest.mark.django_db
+class TestArticleListQueryCount:
+    def _list_queries(self, client, url, size):
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, {'size': size})
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == size
+        return len(queries)
+
+    def test_article_list_query_count_is_constant(self):
+        user = UserFactory()
+        for article in ArticleFactory.create_batch(10):
+            ClapFactory(article=article)
+            CommentFactory(article=article)
+            RatingFactory(article=article)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('articles:article-create')
+
+        assert self._list_queries(client, url, 2) == self._list_queries(client, url, 10)
+
+    def test_list_stats_annotations(self):
+        user = UserFactory()
+        article = ArticleFactory()
+        ClapFactory(article=article)
+        RatingFactory(article=article, rating=4)
+        RatingFactory(article=article, rating=5)
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.get(reverse('articles:article-create'))
+        item = response.data['results'][0]
+        assert item['clap_count'] == 1
+        assert item['comment_count'] == 0
+        assert item['average_rating'] == 4.5
+
+    def test_bookmarked_query_count_is_constant(self):
+        user = UserFactory()
+        for article in ArticleFactory.create_batch(6):
+            BookmarkFactory(article=article, user=user)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('articles:user-bookmarks')
+
+        with CaptureQueriesContext(connection) as few:
+            client.get(url, {'size': 10})
+        BookmarkFactory.create_batch(6, user=user)
+        with CaptureQueriesContext(connection) as many:
+            response = client.get(url, {'size': 10})
+        assert len(response.data['results']) == 10
+        assert len(few) == len(many)
+
+
+@pytest.mark.django_db
+class TestViewerState:
+    def test_viewer_state_uses_three_queries_per_page(self):
+        user = UserFactory()
+        clapped, rated, plain = ArticleFactory(), ArticleFactory(), ArticleFactory()
+        ClapFactory(user=user, article=clapped)
+        BookmarkFactory(user=user, article=clapped)
+        RatingFactory(user=user, article=rated, rating=3)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('articles:article-create')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, {'viewer_state': '1', 'size': 10})
+        states = {item['title']: item for item in response.data['results']}
+        assert states[clapped.title]['has_clapped'] and states[clapped.title]['has_bookmarked']
+        assert states[rated.title]['my_rating'] == 3
+        assert not states[plain.title]['has_clapped'] and states[plain.title]['my_rating'] is None
+        engagement_tables = ('"articles_clap"', '"articles_bookmark"', '"articles_rating"')
+        assert len([q for q in queries if any(table in q['sql'] for table in engagement_tables)]) == 3
+
+        other = APIClient()
+        other.force_authenticate(user=UserFactory())
+        item = other.get(url, {'viewer_state': '1'}).data['results'][0]
+        assert item['has_clapped'] is False
+        assert 'has_clapped' not in client.get(url).data['results'][0]
+
+    def test_viewer_state_on_bookmarks(self):
+        user = UserFactory()
+        BookmarkFactory(user=user)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.get(reverse('articles:user-bookmarks'), {'viewer_state': 'true'})
+        assert response.data['results'][0]['has_bookmarked'] is True
+
+
+@pytest.mark.django_db
+class TestArticleResponseCache:
+    def test_detail_is_cached_until_the_article_changes(self, django_capture_on_commit_callbacks):
+        user = UserFactory()
+        article = ArticleFactory(author=user, title='Cached title')
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('articles:article-retrieve', kwargs={'id': article.id})
+
+        client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        assert response.data['title'] == 'Cached title'
+        assert not any('articles_article' in query['sql'] for query in queries)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            client.patch(url, {'title': 'Fresh title'}, format='json')
+        assert client.get(url).data['title'] == 'Fresh title'
+
+    def test_list_counters_refresh_within_the_counter_window(self, settings, monkeypatch, django_capture_on_commit_callbacks):
+        settings.ARTICLE_LIST_COUNTERS_TIMEOUT = 60
+        user = UserFactory()
+        article = ArticleFactory()
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('articles:article-create')
+
+        response = client.get(url)
+        assert response.data['results'][0]['clap_count'] == 0
+        with CaptureQueriesContext(connection) as queries:
+            client.get(url)
+        assert not any('articles_article' in query['sql'] for query in queries)
+
+        assert client.get(url, {'viewer_state': '1'}).data['results'][0]['has_clapped'] is False
+        with django_capture_on_commit_callbacks(execute=True):
+            ClapFactory(article=article, user=user)
+        assert client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == status.HTTP_304_NOT_MODIFIED
+        assert client.get(url, {'viewer_state': '1'}).data['results'][0]['has_clapped'] is True
+
+        now = time.time()
+        monkeypatch.setattr(time, 'time', lambda: now + 60)
+        assert client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code == status.HTTP_200_OK
+        assert client.get(url).data['results'][0]['clap_count'] == 1
+        assert client.get(url, {'title': 'no such title'}).data['results'] == []
+
+
+@pytest.mark.django_db
+class TestArticleConditionalRequests:
+    def test_detail_returns_304_for_matching_validators(self, django_capture_on_commit_callbacks):
+        user = UserFactory()
+        article = ArticleFactory()
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('articles:article-retrieve', kwargs={'id': article.id})
+
+        response = client.get(url)
+        etag = response['ETag']
+        assert 'Last-Modified' not in response
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+        assert client.get(url, HTTP_IF_MATCH='"stale"').status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert client.get(url, HTTP_IF_MATCH=etag).status_code == status.HTTP_200_OK
+
+        with django_capture_on_commit_callbacks(execute=True):
+            ClapFactory(article=article)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+    def test_detail_304_on_cache_miss_skips_loading_the_article(self):
+        user = UserFactory()
+        article = ArticleFactory()
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('articles:article-retrieve', kwargs={'id': article.id})
+        etag = client.get(url)['ETag']
+
+        key = article_cache.detail_key(article.id, 'http://testserver/')
+        caches['default'].delete(key)
+        caches['local'].delete(key)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        article_queries = [query['sql'] for query in queries if 'articles_article' in query['sql']]
+        assert len(article_queries) == 1
+        assert '"body"' not in article_queries[0]
+
+    def test_list_returns_304_until_the_collection_changes(self, django_capture_on_commit_callbacks):
+        user = UserFactory()
+        ArticleFactory()
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('articles:article-create')
+
+        etag = client.get(url)['ETag']
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+        with django_capture_on_commit_callbacks(execute=True):
+            ArticleFactory()
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+class TestArticleCursorPagination:
+    def test_pages_walk_every_article_once_without_count(self):
+        user = UserFactory()
+        articles = ArticleFactory.create_batch(7)
+        Article.objects.update(created=timezone.now())  # ties are broken by pkid
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        titles = []
+        url, params = reverse('articles:article-create'), {'size': 3}
+        while url:
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url, params)
+            assert not any('COUNT(*)' in query['sql'] for query in queries)
+            titles.extend(item['title'] for item in response.data['results'])
+            url, params = response.data['next'], None
+        assert titles == [article.title for article in sorted(articles, key=lambda a: a.pkid, reverse=True)]
+
+    def test_ordering_param_and_invalid_cursor(self):
+        user = UserFactory()
+        articles = ArticleFactory.create_batch(3)
+        client = APIClient()
+        client.force_authenticate(user=user)
+        url = reverse('articles:article-create')
+
+        response = client.get(url, {'ordering': 'pkid', 'size': 2})
+        assert [item['title'] for item in response.data['results']] == [a.title for a in articles[:2]]
+        response = client.get(response.data['next'])
+        assert [item['title'] for item in response.data['results']] == [articles[2].title]
+        assert response.data['next'] is None
+
+        assert client.get(url, {'cursor': 'not-a-cursor'}).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_ordering_by_rating_score(self):
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+        unrated, single, many = ArticleFactory.create_batch(3)
+        RatingFactory(article=single, rating=5)
+        RatingFactory.create_batch(4, article=many, rating=5)
+
+        response = client.get(reverse('articles:article-create'), {'ordering': '-rating_score', 'size': 3})
+        assert [item['title'] for item in response.data['results']] == [many.title, single.title, unrated.title]
+        assert response.data['results'][0]['rating_histogram'][5] == 4
+
+
+@pytest.mark.django_db
+class TestArticleSearchAPIView:
+    def test_search_ranks_highlights_and_facets(self, settings):
+        settings.ARTICLE_SEARCH_BACKEND = 'database'
+        user = UserFactory()
+        title_match = ArticleFactory(title='Django performance', body='Tuning tips.')
+        body_match = ArticleFactory(title='Other', body='Some notes about django.')
+        ArticleFactory(title='Unrelated', body='Nothing to see here.')
+        title_match.tags.add('python')
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.get(reverse('articles:article-search'), {'q': 'django'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 2
+        results = response.data['results']
+        assert [result['title'] for result in results] == [title_match.title, body_match.title]
+        assert '<em>Django</em>' in results[0]['highlight']['title'][0]
+        assert response.data['facets']['tags'] == [{'value': 'python', 'count': 1}]
+
+    def test_search_requires_every_term(self, settings):
+        settings.ARTICLE_SEARCH_BACKEND = 'database'
+        user = UserFactory()
+        ArticleFactory(title='Django performance', body='Tuning tips.')
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.get(reverse('articles:article-search'), {'q': 'django flask'})
+        assert response.data['count'] == 0
+        assert response.data['results'] == []
+
+    def test_list_search_uses_configured_backend(self, settings):
+        settings.ARTICLE_SEARCH_BACKEND = 'inverted'
+        user = UserFactory()
+        match = ArticleFactory(title='Indexes', body='Posting lists and ranking.')
+        ArticleFactory(title='Other', body='Something else.')
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        response = client.get(reverse('articles:article-create'), {'search': 'post*'})
+        assert response.status_code == status.HTTP_200_OK
+        assert [result['title'] for result in response.data['results']] == [match.title]
+
+
+@pytest.mark.django_db
+class TestFeedAPIView:
+    def _feed_titles(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.get(reverse('articles:article-feed'), {'size': 10})
+        assert response.status_code == status.HTTP_200_OK
+        return [item['title'] for item in response.data['results']]
+
+    def test_new_articles_fan_out_to_followers(self, django_capture_on_commit_callbacks):
+        reader, author, stranger = UserFactory(), UserFactory(), UserFactory()
+        reader.profile.follow(author.profile)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            first = ArticleFactory(author=author)
+            second = ArticleFactory(author=author)
+            ArticleFactory(author=stranger)
+
+        assert TimelineEntry.objects.filter(owner=reader).count() == 2
+        assert self._feed_titles(reader) == [second.title, first.title]
+
+    def test_follow_backfills_and_unfollow_cleans(self):
+        reader, author = UserFactory(), UserFactory()
+        article = ArticleFactory(author=author)
+
+        reader.profile.follow(author.profile)
+        assert self._feed_titles(reader) == [article.title]
+
+        reader.profile.unfollow(author.profile)
+        assert self._feed_titles(reader) == []
+        assert not TimelineEntry.objects.filter(owner=reader).exists()
+
+    def test_high_follower_authors_are_pulled_at_read_time(self, settings, django_capture_on_commit_callbacks):
+        settings.FEED_FANOUT_MAX_FOLLOWERS = 1
+        reader, other, celebrity = UserFactory(), UserFactory(), UserFactory()
+        reader.profile.follow(celebrity.profile)
+        other.profile.follow(celebrity.profile)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            article = ArticleFactory(author=celebrity)
+
+        assert not TimelineEntry.objects.exists()
+        assert self._feed_titles(reader) == [article.title]
+
+    def test_timelines_are_trimmed(self, settings, django_capture_on_commit_callbacks):
+        settings.FEED_TIMELINE_LENGTH = 3
+        settings.FEED_TIMELINE_TRIM_SLACK = 1
+        reader, author = UserFactory(), UserFactory()
+        reader.profile.follow(author.profile)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            articles = ArticleFactory.create_batch(5, author=author)
+
+        kept = TimelineEntry.objects.filter(owner=reader)
+        assert kept.count() <= 4
+        assert set(kept.values_list('article_id', flat=True)) >= {a.pkid for a in articles[-3:]}
+
+
+@pytest.mark.django_db
+class TestRelatedArticlesAPIView:
+    def _related(self, article, user=None):
+        client = APIClient()
+        client.force_authenticate(user=user or UserFactory())
+        response = client.get(reverse('articles:article-related', kwargs={'article_id': article.id}))
+        assert response.status_code == status.HTTP_200_OK
+        return [item['title'] for item in response.data]
+
+    def test_related_articles_rank_text_tags_and_claps(self):
+        from articles.related import refresh_related_articles
+        python = ArticleFactory(title='Django ORM', body='python django queryset orm migrations')
+        similar = ArticleFactory(title='Django views', body='python django queryset views templates')
+        tagged = ArticleFactory(title='Gardening', body='tomatoes soil compost')
+        ArticleFactory(title='Cooking', body='pasta sauce basil')
+        python.tags.add('backend')
+        tagged.tags.add('backend')
+
+        assert refresh_related_articles(full=True) == 4
+        assert self._related(python) == [similar.title, tagged.title]
+
+        reader = UserFactory()
+        with CaptureQueriesContext(connection) as queries:
+            self._related(similar, reader)
+        assert len(queries) == 2  # articles, then their tags
+
+    def test_incremental_refresh_updates_neighbours(self):
+        from articles.related import refresh_related_articles
+        python = ArticleFactory(title='Django ORM', body='python django queryset orm')
+        other = ArticleFactory(title='Knitting', body='wool needles yarn')
+        ArticleFactory(title='Django views', body='python django queryset views')
+        ArticleFactory(title='Cooking', body='pasta sauce basil')
+        refresh_related_articles(full=True)
+        Article.objects.update(updated=timezone.now() - timezone.timedelta(hours=1))
+        assert other.title not in self._related(python)
+
+        clapper = UserFactory()
+        ClapFactory(user=clapper, article=python)
+        ClapFactory(user=clapper, article=other)
+        assert refresh_related_articles() == 2
+        assert other.title in self._related(python)
+
+    def test_incremental_refresh_picks_up_retagged_articles(self):
+        from articles.related import refresh_related_articles
+        knitting = ArticleFactory(title='Knitting', body='wool needles yarn')
+        cooking = ArticleFactory(title='Cooking', body='pasta sauce basil')
+        ArticleFactory(title='Gardening', body='soil seeds water')
+        refresh_related_articles(full=True)
+        Article.objects.update(updated=timezone.now() - timezone.timedelta(hours=1))
+        assert cooking.title not in self._related(knitting)
+
+        knitting.tags.add('hobbies')
+        cooking.tags.add('hobbies')
+        assert refresh_related_articles() == 2
+        assert self._related(knitting) == [cooking.title]
+
+    def test_related_articles_404_for_unknown_article(self):
+        import uuid
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+        response = client.get(reverse('articles:article-related', kwargs={'article_id': uuid.uuid4()}))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestCommentThreads:
+    def test_list_prefetches_first_replies_in_constant_queries(self, settings):
+        settings.COMMENTS_PREFETCHED_REPLIES = 2
+        article = ArticleFactory()
+        roots = [CommentFactory(article=article) for _ in range(3)]
+        replies = [CommentFactory(article=article, parent=roots[0]) for _ in range(3)]
+        CommentFactory(article=article, parent=replies[0])
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('articles:article-comments', kwargs={'article_id': article.id}))
+        assert response.status_code == status.HTTP_200_OK
+        assert len(queries) == 2
+        first = response.data['results'][0]
+        assert [item['id'] for item in response.data['results']] == [str(root.id) for root in roots]
+        assert first['reply_count'] == 3
+        assert [item['id'] for item in first['replies']] == [str(reply.id) for reply in replies[:2]]
+        assert first['replies'][0]['reply_count'] == 1
+
+    def test_reply_and_read_subtree(self):
+        article = ArticleFactory()
+        root = CommentFactory(article=article)
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+
+        response = client.post(
+            reverse('articles:article-comment', kwargs={'article_id': article.id}),
+            {'article': article.pkid, 'parent': str(root.id), 'title': 'Re', 'content': 'Agreed'},
+            format='json',
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        reply = Comment.objects.get(parent=root)
+        CommentFactory(article=article, parent=reply)
+
+        response = client.get(reverse('articles:comment-replies', kwargs={'article_id': article.id, 'comment_id': root.id}))
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['depth'] for item in response.data['results']] == [1, 2]
+        assert str(response.data['results'][0]['parent']) == str(root.id)
+
+    def test_reply_to_comment_of_another_article_is_rejected(self):
+        article = ArticleFactory()
+        foreign = CommentFactory()
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+        response = client.post(
+            reverse('articles:article-comment', kwargs={'article_id': article.id}),
+            {'article': article.pkid, 'parent': str(foreign.id), 'title': 'Re', 'content': 'Hm'},
+            format='json',
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'parent' in response.data
+
+
+@pytest.mark.django_db
+class TestTrendingAPIView:
+    def _trending(self, params=None):
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+        return client.get(reverse('articles:article-trending'), params or {})
+
+    def test_trending_ranks_recent_engagement(self):
+        from articles.models import TrendingBucket
+        from articles.trending import refresh_trending
+        quiet, busy, stale = ArticleFactory(), ArticleFactory(), ArticleFactory()
+        ClapFactory(article=quiet)
+        ClapFactory.create_batch(2, article=busy)
+        CommentFactory(article=busy)
+        old = ClapFactory.create_batch(3, article=stale)
+        Clap.objects.filter(pkid__in=[clap.pkid for clap in old]).update(created=timezone.now() - timezone.timedelta(days=2))
+
+        read, stored = refresh_trending(until=timezone.now())
+        assert read == 7
+        assert stored['24h'] == 2
+        response = self._trending()
+        assert response.status_code == status.HTTP_200_OK
+        assert [item['title'] for item in response.data] == [busy.title, quiet.title]
+
+        ClapFactory.create_batch(3, article=quiet)
+        # Events still inside the settle delay wait for the next run.
+        assert refresh_trending()[0] == 0
+        assert refresh_trending(until=timezone.now())[0] == 3
+        assert TrendingBucket.objects.get(article=quiet).claps == 4
+        assert [item['title'] for item in self._trending({'window': '1h'}).data] == [quiet.title, busy.title]
+
+    def test_trending_is_two_queries_and_validates_window(self):
+        from articles.trending import refresh_trending
+        ClapFactory()
+        refresh_trending(until=timezone.now())
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse('articles:article-trending'), {'size': 1})
+        assert len(response.data) == 1
+        assert len(queries) == 2  # articles, then their tags
+        assert self._trending({'window': '2y'}).status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestArticleStats:
+    def _get(self, user, url, params):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client.get(url, params)
+
+    def test_stats_read_incremental_rollups(self):
+        from articles.stats import rollup_stats
+        author = UserFactory()
+        article, other = ArticleFactory(author=author), ArticleFactory(author=author)
+        yesterday = timezone.now() - timezone.timedelta(days=1)
+        old = ClapFactory.create_batch(2, article=article)
+        Clap.objects.filter(pkid__in=[clap.pkid for clap in old]).update(created=yesterday)
+        RatingFactory(article=article, rating=4)
+        RatingFactory(article=article, rating=2)
+        ArticleViewFactory(article=other)
+
+        now = timezone.now()
+        assert rollup_stats(until=now) == 3
+        ClapFactory(article=article)
+        rollup_stats(until=timezone.now())
+
+        url = reverse('articles:article-stats', kwargs={'article_id': article.id})
+        response = self._get(author, url, {'from': yesterday.date().isoformat(), 'bucket': 'day'})
+        assert response.status_code == status.HTTP_200_OK
+        assert [entry['claps'] for entry in response.data['series']] == [2, 1]
+        assert response.data['totals']['claps'] == 3
+        assert response.data['totals']['average_rating'] == 3
+
+        hourly = self._get(author, url, {'from': yesterday.date().isoformat(), 'bucket': 'hour'})
+        assert sum(entry['claps'] for entry in hourly.data['series']) == 3
+
+        summary = self._get(author, reverse('articles:author-stats'), {'from': yesterday.date().isoformat()})
+        assert summary.data['totals']['views'] == 1
+        assert summary.data['totals']['claps'] == 3
+        assert [item['title'] for item in summary.data['top_articles']] == [other.title, article.title]
+
+    def test_stats_are_private_and_validated(self):
+        article = ArticleFactory()
+        url = reverse('articles:article-stats', kwargs={'article_id': article.id})
+        assert self._get(UserFactory(), url, {}).status_code == status.HTTP_403_FORBIDDEN
+        response = self._get(article.author, url, {'from': '2026-02-01', 'to': '2026-01-01'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = self._get(article.author, url, {'from': '2025-01-01', 'to': '2026-01-01', 'bucket': 'hour'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestArticleTags:
+    def _client(self):
+        client = APIClient()
+        client.force_authenticate(user=UserFactory())
+        return client
+
+    def _titles(self, params):
+        response = self._client().get(reverse('articles:article-create'), params)
+        assert response.status_code == status.HTTP_200_OK
+        return sorted(item['title'] for item in response.data['results'])
+
+    def test_tags_filter_matches_any_or_all(self):
+        both = ArticleFactory(title='Both')
+        both.tags.add('django', 'python')
+        ArticleFactory(title='Django').tags.add('django')
+        ArticleFactory(title='Untagged')
+
+        assert self._titles({'tags': 'django,python'}) == ['Both', 'Django']
+        assert self._titles({'tags': 'django, python', 'tags_match': 'all'}) == ['Both']
+        assert self._titles({'tags': 'rust'}) == []
+
+    def test_list_prefetches_tags_in_one_query(self):
+        for article in ArticleFactory.create_batch(6):
+            article.tags.add('django', 'python')
+        client = self._client()
+        url = reverse('articles:article-create')
+
+        with CaptureQueriesContext(connection) as few:
+            client.get(url, {'size': 2})
+        with CaptureQueriesContext(connection) as many:
+            response = client.get(url, {'size': 6})
+        assert sorted(response.data['results'][0]['tags']) == ['django', 'python']
+        assert len(few) == len(many)
+
+    def test_popular_tags_are_counted_and_cached(self, django_capture_on_commit_callbacks):
+        caches['default'].delete('articles:popular_tags')
+        with django_capture_on_commit_callbacks(execute=True):
+            django_articles = ArticleFactory.create_batch(2)
+            for article in django_articles:
+                article.tags.add('django')
+            python = ArticleFactory()
+            python.tags.add('python', 'rust')
+        client = self._client()
+        url = reverse('articles:popular-tags')
+
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert [(tag['name'], tag['count']) for tag in response.data] == [('django', 2), ('python', 1), ('rust', 1)]
+        with CaptureQueriesContext(connection) as queries:
+            assert client.get(url).data == response.data
+        assert not queries.captured_queries
+
+        with django_capture_on_commit_callbacks(execute=True):
+            django_articles[0].tags.set(['rust'])
+            python.tags.clear()
+            django_articles[1].delete()
+        assert [(tag['name'], tag['count']) for tag in client.get(url).data] == [('rust', 1)]
@@ -0,0 +1,205 @@
+import heapq
+from collections import Counter, defaultdict
+from datetime import timedelta
+from itertools import takewhile
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from articles.models import ArticleView, Clap, Comment, JobCheckpoint, Rating, TrendingBucket, TrendingScore
+
+
+JOB_NAME = "trending"
+
+# Primary keys are handed out before commit, so a row may become visible
+# after a higher one was read. Events younger than this are left for the
+# next run, letting their transactions commit before the mark passes them.
+SETTLE_DELAY = timedelta(minutes=1)
+
+# Append-only event tables folded into buckets, with the bucket column they feed.
+EVENT_SOURCES = [
+    (ArticleView, "views"),
+    (Clap, "claps"),
+    (Rating, "ratings"),
+    (Comment, "comments"),
+]
+
+BUCKET_COLUMNS = [column for _, column in EVENT_SOURCES]
+
+
+def _hour(moment):
+    """Truncates a datetime to the start of its hour."""
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def longest_window():
+    """Returns the length of the longest trending window."""
+    return timedelta(hours=max(hours for hours, _ in settings.TRENDING_WINDOWS.values()))
+
+
+def add_to_buckets(column, deltas):
+    """Adds event counts to hourly buckets, creating missing buckets.
+
+    Args:
+        column (str): Bucket column the events count towards
+        deltas (Counter): ``(article_pkid, hour)`` mapped to a number of new events
+    """
+    existing = {
+        (article_id, hour): total
+        for article_id, hour, total in TrendingBucket.objects.filter(
+            article_id__in={article_id for article_id, _ in deltas},
+            hour__in={hour for _, hour in deltas},
+        ).values_list("article_id", "hour", column)
+    }
+    TrendingBucket.objects.bulk_create(
+        [
+            TrendingBucket(article_id=article_id, hour=hour, **{column: existing.get((article_id, hour), 0) + total})
+            for (article_id, hour), total in deltas.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["article", "hour"],
+        update_fields=[column],
+    )
+
+
+def add_views(deltas, moment):
+    """Adds views counted outside ArticleView to the buckets of an hour.
+
+    Used by the ``sketch`` views mode, which writes no ArticleView rows
+    for ``collect_events`` to read. Missing buckets are created first, then
+    counts are incremented with ``F()`` updates, one per distinct amount, so
+    concurrent ingestion workers never overwrite each other.
+
+    Args:
+        deltas (dict): Article pkid mapped to its number of new views
+        moment (datetime): Time of the views
+    """
+    if not deltas:
+        return
+    hour = _hour(moment)
+    by_amount = defaultdict(list)
+    for article_id, views in deltas.items():
+        by_amount[views].append(article_id)
+    with transaction.atomic():
+        TrendingBucket.objects.bulk_create(
+            [TrendingBucket(article_id=article_id, hour=hour) for article_id in deltas],
+            ignore_conflicts=True,
+        )
+        for views, article_ids in by_amount.items():
+            TrendingBucket.objects.filter(article_id__in=article_ids, hour=hour).update(views=F("views") + views)
+
+
+def collect_events(batch_size=5000, until=None):
+    """Folds the events recorded since the last run into hourly buckets.
+
+    Each event table is read from its own primary-key high-water mark, so
+    only new rows are read; the mark moves forward in the same transaction
+    as the bucket update. Reading stops at the first event created at or
+    after ``until``, so the mark never passes a row whose transaction may
+    still be in flight. An event is counted once as long as it commits
+    within ``SETTLE_DELAY`` of its creation time; one committing later
+    than that is missed. Events older than the longest window are skipped.
+    Views only exist as rows in the ``exact`` views mode (or with
+    ``ARTICLE_VIEWS_AUDIT_LOG``); otherwise ``ArticleView.record_views``
+    adds them through ``add_views``.
+
+    Args:
+        batch_size (int, optional): Events read per query. Defaults to 5000.
+        until (datetime, optional): Upper bound of the events folded in.
+            Defaults to ``SETTLE_DELAY`` before the current time.
+
+    Returns:
+        int: Number of events read
+    """
+    now = timezone.now()
+    until = until or now - SETTLE_DELAY
+    cutoff = now - longest_window()
+    read = 0
+    for model, column in EVENT_SOURCES:
+        name = f"{JOB_NAME}:{column}"
+        last_pkid = JobCheckpoint.last_pkid_of(name)
+        while True:
+            rows = list(
+                model.objects.filter(pkid__gt=last_pkid).order_by("pkid")
+                .values_list("pkid", "article_id", "created")[:batch_size]
+            )
+            settled = list(takewhile(lambda row: row[2] < until, rows))
+            if not settled:
+                break
+            deltas = Counter(
+                (article_id, _hour(created)) for _, article_id, created in settled if created >= cutoff
+            )
+            last_pkid = settled[-1][0]
+            with transaction.atomic():
+                if deltas:
+                    add_to_buckets(column, deltas)
+                JobCheckpoint.advance(name, last_pkid=last_pkid)
+            read += len(settled)
+            if len(settled) < len(rows):
+                break
+    return read
+
+
+def compute_scores(now=None):
+    """Recomputes the stored top articles of every trending window.
+
+    An event contributes its ``TRENDING_WEIGHTS`` weight, halved every
+    half-life of the window since its hour, and only while it lies inside
+    the window. Scores are accumulated from the buckets of the longest
+    window, streamed in chunks, so the raw event tables are not read; only
+    one float per active article is held in memory.
+
+    Args:
+        now (datetime, optional): Reference time. Defaults to the current time.
+
+    Returns:
+        dict: Window name mapped to the number of articles stored
+    """
+    now = now or timezone.now()
+    weights = settings.TRENDING_WEIGHTS
+    windows = {
+        name: (_hour(now - timedelta(hours=hours)), half_life)
+        for name, (hours, half_life) in settings.TRENDING_WINDOWS.items()
+    }
+    scores = {name: Counter() for name in windows}
+    buckets = (
+        TrendingBucket.objects.filter(hour__gte=min(start for start, _ in windows.values()))
+        .values_list("article_id", "hour", *BUCKET_COLUMNS)
+    )
+    for article_id, hour, *counts in buckets.iterator(chunk_size=5000):
+        events = sum(weights[column] * count for column, count in zip(BUCKET_COLUMNS, counts))
+        # Events are taken to happen mid-hour.
+        age = max((now - hour).total_seconds() / 3600 - 0.5, 0)
+        for name, (start, half_life) in windows.items():
+            if hour >= start:
+                scores[name][article_id] += events * 0.5 ** (age / half_life)
+
+    stored = {}
+    with transaction.atomic():
+        for name, window_scores in scores.items():
+            top = heapq.nlargest(settings.TRENDING_LIMIT, window_scores.items(), key=lambda item: item[1])
+            TrendingScore.objects.filter(window=name).delete()
+            TrendingScore.objects.bulk_create(
+                TrendingScore(window=name, article_id=article_id, score=score, computed=now)
+                for article_id, score in top
+            )
+            stored[name] = len(top)
+        TrendingBucket.objects.filter(hour__lt=_hour(now - longest_window())).delete()
+    return stored
+
+
+def refresh_trending(batch_size=5000, until=None):
+    """Folds new events into buckets, then recomputes the trending scores.
+
+    Args:
+        batch_size (int, optional): Events read per query. Defaults to 5000.
+        until (datetime, optional): Upper bound of the events folded in.
+            Defaults to ``SETTLE_DELAY`` before the current time.
+
+    Returns:
+        tuple: Number of events read and the ``compute_scores`` result
+    """
+    read = collect_events(batch_size=batch_size, until=until)
+    return read, compute_scores()
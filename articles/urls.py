@@ -2,21 +2,21 @@ from django.urls import path
 from articles.views import (
     ArticleCreateAPIView,
     ArticleRetrieveUpdateDestroy,
+    ArticleSearchAPIView,
     RateArticleAPIView,
     BookmarkArticleAPIView,
     BookmarkedAPIView,
+    EngagementBatchAPIView,
+    FeedAPIView,
+    RelatedArticlesAPIView,
+    TrendingAPIView,
+    ArticleStatsAPIView,
+    AuthorStatsAPIView,
+    PopularTagsAPIView,
     ClapAPIView,
-    CommentAPIView
-)
-from django.urls import path
-from articles.views import (
-    ArticleCreateAPIView,
-    ArticleRetrieveUpdateDestroy,
-    RateArticleAPIView,
-    BookmarkArticleAPIView,
-    BookmarkedAPIView,
-    ClapAPIView,
-    CommentAPIView
+    CommentAPIView,
+    CommentListAPIView,
+    CommentRepliesAPIView,
 )
 
 app_name = "articles"
@@ -30,6 +30,41 @@ urlpatterns = [
         name="article-create"
     ),
 
+    # Full-text article search
+    path(
+        "search/",
+        ArticleSearchAPIView.as_view(),
+        name="article-search"
+    ),
+
+    # Home feed of followed authors
+    path(
+        "feed/",
+        FeedAPIView.as_view(),
+        name="article-feed"
+    ),
+
+    # Top articles by recent engagement
+    path(
+        "trending/",
+        TrendingAPIView.as_view(),
+        name="article-trending"
+    ),
+
+    # Most used tags with their article counts
+    path(
+        "tags/",
+        PopularTagsAPIView.as_view(),
+        name="popular-tags"
+    ),
+
+    # Engagement summary of the current user's articles
+    path(
+        "stats/",
+        AuthorStatsAPIView.as_view(),
+        name="author-stats"
+    ),
+
     # User's bookmarked articles
     path(
         "bookmarked/",
@@ -37,6 +72,13 @@ urlpatterns = [
         name="user-bookmarks"
     ),
 
+    # Batched interactions for clients replaying queued operations
+    path(
+        "engagements/batch/",
+        EngagementBatchAPIView.as_view(),
+        name="engagement-batch"
+    ),
+
     # Article interaction endpoints (rate, bookmark, comment, clap)
     path(
         "<uuid:article_id>/rate/",
@@ -53,12 +95,36 @@ urlpatterns = [
         CommentAPIView.as_view(),
         name="article-comment"
     ),
+    path(
+        "<uuid:article_id>/comments/",
+        CommentListAPIView.as_view(),
+        name="article-comments"
+    ),
+    path(
+        "<uuid:article_id>/comments/<uuid:comment_id>/replies/",
+        CommentRepliesAPIView.as_view(),
+        name="comment-replies"
+    ),
     path(
         "<uuid:article_id>/clap/",
         ClapAPIView.as_view(),
         name="article-clap"
     ),
 
+    # Engagement statistics of an article, for its author
+    path(
+        "<uuid:article_id>/stats/",
+        ArticleStatsAPIView.as_view(),
+        name="article-stats"
+    ),
+
+    # Precomputed related articles
+    path(
+        "<uuid:article_id>/related/",
+        RelatedArticlesAPIView.as_view(),
+        name="article-related"
+    ),
+
     # Article retrieve/update/delete (keep this last to avoid URL matching issues)
     path(
         "<uuid:id>/",
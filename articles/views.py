@@ -1,19 +1,33 @@
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from articles.serializers import ArticleInSerializer, ArticleOutSerializer, RatingSerializer, BookmarkSerializer, ClapSerializer, CommentSerializer
+from articles.serializers import ArticleInSerializer, ArticleOutSerializer, RatingInSerializer, BookmarkSerializer, ClapSerializer, CommentSerializer, CommentOutSerializer, CommentReplySerializer, EngagementOperationSerializer, ScoredArticleSerializer, StatsQuerySerializer
+from django.core.cache import cache
+from django.db.models import F, Prefetch
 from rest_framework.generics import RetrieveUpdateDestroyAPIView, ListAPIView, GenericAPIView, CreateAPIView, ListCreateAPIView
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
-from articles.models import Article, ArticleView, Rating, Bookmark, Clap, Comment
+from articles.models import Article, Rating, Bookmark, Clap, Comment, TagCount
 from rest_framework.response import Response
 from rest_framework import status
-from articles.paginations import ArticlePagination
+from articles.paginations import ArticlePagination, ArticleSearchPagination, CommentPagination, CommentThreadPagination
 from articles.permissions import IsAuthorOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
-from articles.filters import ArticleFilter
-from articles.exceptions import CantClapOwnArticle, CantRateOwnArticle, CantCommentOwnArticle
+from rest_framework.filters import OrderingFilter
+from articles.filters import ArticleFilter, ArticleSearchFilter
+from articles.exceptions import CantClapOwnArticle, CantRateOwnArticle, CantCommentOwnArticle, NotArticleAuthor
+from articles.ingestion import ViewEvent, view_events
+from articles.search import get_search_backend
+from articles.feeds import feed_queryset
+from articles.stats import rollups_between, stats_series, top_articles
+from articles.cache import POPULAR_TAGS_CACHE_KEY, article_cache
+from articles.engagements import write_engagement, write_engagements
+from articles.mixins import ViewerStateMixin
+from common.conditional import ConditionalListMixin, make_etag, not_modified, set_validators
 
 
-class ArticleCreateAPIView(ListCreateAPIView):
+class ArticleCreateAPIView(ViewerStateMixin, ListCreateAPIView):
     """
     API endpoint that allows:
     - Listing all articles (GET)
@@ -21,17 +35,17 @@ class ArticleCreateAPIView(ListCreateAPIView):
     
     Features:
     - Pagination support
-    - Filtering, searching and ordering
+    - Filtering, searching and ordering (?ordering=-rating_score for best rated)
+    - Optional per-user engagement state (?viewer_state=1)
     - Different serializers for input/output
     - Automatic author assignment on creation
     """
     permission_classes = [IsAuthenticated]
     pagination_class = ArticlePagination
-    queryset = Article.objects.select_related("author")
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    queryset = Article.objects.with_list_stats()
+    filter_backends = [DjangoFilterBackend, ArticleSearchFilter, OrderingFilter]
     filterset_class = ArticleFilter
-    search_fields = ["body"]
-    ordering_fields = ["pkid"]
+    ordering_fields = ["pkid", "rating_score"]
     
     def get_serializer_class(self):
         """Returns appropriate serializer based on request method"""
@@ -39,12 +53,82 @@ class ArticleCreateAPIView(ListCreateAPIView):
             return ArticleOutSerializer
         return ArticleInSerializer
 
+    def list(self, request, *args, **kwargs):
+        """Returns a page of articles, served from the versioned cache when possible.
+
+        Pages are keyed by their query parameters (filters, search, ordering,
+        cursor and size), the list generation, which every article change
+        bumps, and a window of ``ARTICLE_LIST_COUNTERS_TIMEOUT`` seconds, so
+        engagement and view counters are at most that stale. Pages with the
+        viewer state are also keyed by the user's viewer generation, which
+        their own engagements bump. The key doubles as a weak collection
+        ETag, so a client revalidating an unchanged page gets a 304 without
+        any cache or database read.
+        """
+        variant = request.build_absolute_uri("/")
+        viewer_id = request.user.pk if self.wants_viewer_state() else None
+        key = article_cache.list_key("articles", request.query_params, variant, viewer_id)
+        etag = make_etag(key, weak=True)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        data = article_cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            article_cache.set(key, data)
+        return set_validators(Response(data), etag)
+
     def perform_create(self, serializer):
         """Automatically sets the author to the current user"""
         author = self.request.user
         serializer.save(author=author)
 
 
+class ArticleSearchAPIView(GenericAPIView):
+    """
+    API endpoint for full-text article search
+    
+    GET /articles/search/?q=<query>&page=<n>&size=<n>
+    - Ranks articles by relevance using the configured search backend
+    - Returns highlighted title/body fragments per result
+    - Returns tag and author facets over all matches
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = ArticleOutSerializer
+    pagination_class = ArticleSearchPagination
+
+    def get(self, request, *args, **kwargs):
+        """Handles a search query"""
+        query = request.query_params.get("q", "").strip()
+        paginator = self.pagination_class()
+        size = paginator.get_page_size(request)
+        try:
+            page = max(int(request.query_params.get(paginator.page_query_param, 1)), 1)
+        except ValueError:
+            page = 1
+
+        result = get_search_backend().search(query, offset=(page - 1) * size, limit=size)
+        articles = Article.objects.with_list_stats().in_bulk(
+            [hit.pkid for hit in result.hits], field_name="pkid"
+        )
+        results = []
+        for hit in result.hits:
+            article = articles.get(hit.pkid)
+            if article is None:
+                continue
+            data = self.get_serializer(article).data
+            data["score"] = hit.score
+            data["highlight"] = hit.highlight
+            results.append(data)
+
+        return Response({
+            "count": result.total,
+            "page": page,
+            "results": results,
+            "facets": result.facets,
+        })
+
+
 class ArticleRetrieveUpdateDestroy(RetrieveUpdateDestroyAPIView):
     """
     API endpoint that allows:
@@ -54,11 +138,11 @@ class ArticleRetrieveUpdateDestroy(RetrieveUpdateDestroyAPIView):
     
     Features:
     - Author permission checks
-    - Article view tracking
+    - Asynchronous article view tracking
     - Different serializers for read/write operations
     """
     permission_classes = [IsAuthorOrReadOnly]
-    queryset = Article.objects.select_related("author")
+    queryset = Article.objects.with_list_stats()
     lookup_field = "id"
 
     def get_serializer_class(self):
@@ -67,13 +151,106 @@ class ArticleRetrieveUpdateDestroy(RetrieveUpdateDestroyAPIView):
             return ArticleOutSerializer
         return ArticleInSerializer
 
-    def get(self, request, *args, **kwargs):
-        """Records article view before returning response"""
-        user = request.user 
-        article = self.get_object()
-        viewer_ip = request.META.get("REMOTE_ADDR")
-        ArticleView.record_view(article, user, viewer_ip)
-        return super().get(request, *args, **kwargs)
+    def retrieve(self, request, *args, **kwargs):
+        """Queues an article view event and returns the serialized article.
+        
+        The view itself is written later by the ingestion worker, so read
+        latency does not depend on write contention on ArticleView. The
+        serialized article is cached under its id and current version, so
+        repeated reads skip the query and serialization entirely.
+
+        Responses carry a strong ETag built from the article's id, ``updated``
+        timestamp and cache version. No ``Last-Modified`` is sent, since
+        engagements change the body without touching ``updated``. Matching
+        ``If-None-Match`` requests get a 304; on a cache miss they are
+        resolved with a single narrow query on the validator columns, before
+        the article is loaded or serialized.
+        """
+        article_id = kwargs[self.lookup_field]
+        version = article_cache.version(article_id)
+        key = article_cache.detail_key(article_id, request.build_absolute_uri("/"), version)
+        entry = article_cache.get(key)
+        if entry is None:
+            state = Article.objects.filter(id=article_id).values("pkid", "updated").first()
+            if state is None:
+                raise Http404
+            etag = make_etag(article_id, state["updated"].isoformat(), version)
+            response = not_modified(request, etag)
+            if response is not None:
+                self.track_view(request, state["pkid"])
+                return response
+            article = self.get_object()
+            entry = {
+                "pkid": article.pkid,
+                "data": self.get_serializer(article).data,
+                "etag": make_etag(article_id, article.updated.isoformat(), version),
+            }
+            article_cache.set(key, entry)
+        self.track_view(request, entry["pkid"])
+        response = not_modified(request, entry["etag"])
+        if response is not None:
+            return response
+        return set_validators(Response(entry["data"]), entry["etag"])
+
+    def track_view(self, request, pkid):
+        """Queues a view event for authenticated readers.
+
+        Args:
+            request (Request): Current request
+            pkid (int): Primary key of the viewed article
+        """
+        user = request.user
+        if user.is_authenticated:
+            view_events.enqueue(
+                ViewEvent(pkid, user.pk, request.META.get("REMOTE_ADDR"))
+            )
+
+
+class EngagementBatchAPIView(GenericAPIView):
+    """
+    API endpoint for replaying queued engagements in one request
+    
+    POST /articles/engagements/batch/
+    - Accepts {"operations": [...]} with up to ENGAGEMENT_BATCH_MAX_OPERATIONS
+      clap, bookmark, rate and comment operations
+    - Resolves every article with one query and writes each kind of
+      engagement with one bulk insert
+    - Applies the same own-article and duplicate rules as the single endpoints
+    - Returns one result per operation, in order, with its own status code
+    """
+    serializer_class = EngagementOperationSerializer
+
+    def post(self, request):
+        """Handles a batch of engagement operations"""
+        operations = request.data.get("operations") if isinstance(request.data, dict) else None
+        if not isinstance(operations, list) or not operations:
+            return Response(
+                {"message": "Expected a non-empty list of operations"},
+                status.HTTP_400_BAD_REQUEST
+            )
+        limit = settings.ENGAGEMENT_BATCH_MAX_OPERATIONS
+        if len(operations) > limit:
+            return Response(
+                {"message": f"A batch accepts at most {limit} operations"},
+                status.HTTP_400_BAD_REQUEST
+            )
+
+        results = [None] * len(operations)
+        valid = []
+        for index, operation in enumerate(operations):
+            serializer = self.get_serializer(data=operation)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                results[index] = {"status": status.HTTP_400_BAD_REQUEST, "errors": serializer.errors}
+        written = write_engagements(request.user, [operation for _, operation in valid])
+        for (index, _), result in zip(valid, written):
+            results[index] = result
+
+        return Response(
+            {"results": [{"index": index, **result} for index, result in enumerate(results)]},
+            status=status.HTTP_200_OK
+        )
 
 
 class RateArticleAPIView(GenericAPIView):
@@ -85,27 +262,23 @@ class RateArticleAPIView(GenericAPIView):
     - Prevents authors from rating their own articles
     - Prevents duplicate ratings
     """
-    serializer_class = RatingSerializer
+    serializer_class = RatingInSerializer
     
     def post(self, request, article_id):
         """Handles article rating submission"""
-        user = request.user 
-        article = get_object_or_404(Article, id=article_id)
-        
-        if article.author == user:
-            raise CantRateOwnArticle
-            
-        if Rating.objects.filter(user=user, article=article).exists():
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        result = write_engagement(
+            Rating, request.user, article_id,
+            own_article_error=CantRateOwnArticle, **serializer.validated_data
+        )
+        if not result.created:
             return Response(
-                {"message": f"You already rated this article {article.title}"},
+                {"message": f"You already rated this article {result.title}"},
                 status.HTTP_400_BAD_REQUEST
             )
-            
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        serializer.save(user=user, article=article)
         return Response(
-            {"message": f"You rated this article {article.title}"},
+            {"message": f"You rated this article {result.title}"},
             status=status.HTTP_201_CREATED
         )
 
@@ -122,37 +295,110 @@ class BookmarkArticleAPIView(GenericAPIView):
     
     def post(self, request, article_id):
         """Handles article bookmark submission"""
-        user = request.user 
-        article = get_object_or_404(Article, id=article_id)
-        
-        if Bookmark.objects.filter(user=user, article=article).exists():
+        result = write_engagement(Bookmark, request.user, article_id)
+        if not result.created:
             return Response(
-                {"message": f"You already bookmarked this article {article.title}"},
+                {"message": f"You already bookmarked this article {result.title}"},
                 status.HTTP_400_BAD_REQUEST
             )
-            
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        serializer.save(user=user, article=article)
         return Response(
-            {"message": f"You bookmarked this article {article.title}"},
+            {"message": f"You bookmarked this article {result.title}"},
             status=status.HTTP_201_CREATED
         )
 
 
-class BookmarkedAPIView(ListAPIView):
+class BookmarkedAPIView(ViewerStateMixin, ConditionalListMixin, ListAPIView):
     """
     API endpoint for listing user's bookmarked articles
     
     GET /articles/bookmarked/
-    - Returns paginated list of articles bookmarked by current user
+    - Returns cursor-paginated list of articles bookmarked by current user
+    - Adds the user's clap, bookmark and rating state with ?viewer_state=1
     """
     serializer_class = ArticleOutSerializer
+    pagination_class = ArticlePagination
     
     def get_queryset(self):
         """Returns queryset of articles bookmarked by current user"""
         user = self.request.user 
-        return Article.objects.filter(bookmarks__user=user)
+        return Article.objects.with_list_stats().filter(bookmarks__user=user)
+
+
+class TrendingAPIView(ListAPIView):
+    """
+    API endpoint for trending articles
+
+    GET /articles/trending/?window=24h&size=20
+    - Returns the best articles of a TRENDING_WINDOWS window (default
+      TRENDING_DEFAULT_WINDOW), by time-decayed views, claps, ratings and comments
+    - Reads one indexed range of the trending score table; the table is
+      maintained by the refresh_trending command
+    """
+    serializer_class = ScoredArticleSerializer
+    pagination_class = None
+
+    def get_queryset(self):
+        """Returns the top articles of the requested window, annotated with their score"""
+        window = self.request.query_params.get("window", settings.TRENDING_DEFAULT_WINDOW)
+        if window not in settings.TRENDING_WINDOWS:
+            raise ValidationError({"window": f"Choose one of {', '.join(settings.TRENDING_WINDOWS)}."})
+        try:
+            size = int(self.request.query_params.get("size", settings.TRENDING_LIMIT))
+        except ValueError:
+            raise ValidationError({"size": "A number is required."})
+        return (
+            Article.objects.with_list_stats()
+            .filter(trending_scores__window=window)
+            .annotate(score=F("trending_scores__score"))
+            .order_by("-score")[:max(1, min(size, settings.TRENDING_LIMIT))]
+        )
+
+
+class RelatedArticlesAPIView(ListAPIView):
+    """
+    API endpoint for the articles related to an article
+
+    GET /articles/<uuid:article_id>/related/
+    - Returns the precomputed nearest neighbours of the article, closest first
+    - Reads one indexed range of the related-articles table; the table is
+      maintained by the refresh_related_articles command
+    """
+    serializer_class = ScoredArticleSerializer
+    pagination_class = None
+
+    def get_queryset(self):
+        """Returns the related articles, annotated with their score"""
+        return (
+            Article.objects.with_list_stats()
+            .filter(related_to__article__id=self.kwargs["article_id"])
+            .annotate(score=F("related_to__score"))
+            .order_by("-score")
+        )
+
+    def list(self, request, *args, **kwargs):
+        """Lists the related articles, or 404 if the article does not exist"""
+        response = super().list(request, *args, **kwargs)
+        if not response.data and not Article.objects.filter(id=kwargs["article_id"]).exists():
+            raise Http404
+        return response
+
+
+class FeedAPIView(ConditionalListMixin, ListAPIView):
+    """
+    API endpoint for the current user's home feed
+    
+    GET /articles/feed/
+    - Returns cursor-paginated articles from followed authors, newest first
+    - Reads the user's materialized timeline, merging authors with very
+      large audiences at read time
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = ArticleOutSerializer
+    pagination_class = ArticlePagination
+
+    def get_queryset(self):
+        """Returns the articles of the current user's feed"""
+        return feed_queryset(self.request.user)
 
 
 class ClapAPIView(GenericAPIView):
@@ -168,23 +414,14 @@ class ClapAPIView(GenericAPIView):
     
     def post(self, request, article_id):
         """Handles article clap submission"""
-        user = request.user 
-        article = get_object_or_404(Article, id=article_id)
-        
-        if article.author == user:
-            raise CantClapOwnArticle
-            
-        if Clap.objects.filter(user=user, article=article).exists():
+        result = write_engagement(Clap, request.user, article_id, own_article_error=CantClapOwnArticle)
+        if not result.created:
             return Response(
-                {"message": f"You already clapped on this article {article.title}"},
+                {"message": f"You already clapped on this article {result.title}"},
                 status.HTTP_400_BAD_REQUEST
             )
-            
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        serializer.save(user=user, article=article)
         return Response(
-            {"message": f"You clapped on this article {article.title}"},
+            {"message": f"You clapped on this article {result.title}"},
             status=status.HTTP_201_CREATED
         )
 
@@ -195,6 +432,7 @@ class CommentAPIView(GenericAPIView):
     
     POST /articles/<uuid:article_id>/comment/
     - Allows authenticated users to comment on articles
+    - Replies to another comment of the article when ``parent`` is given
     - Prevents authors from commenting on their own articles
     """
     serializer_class = CommentSerializer
@@ -207,10 +445,148 @@ class CommentAPIView(GenericAPIView):
         if article.author == user:
             raise CantCommentOwnArticle
             
-        serializer = self.get_serializer(data=request.data)
+        serializer = self.get_serializer(
+            data=request.data, context={**self.get_serializer_context(), "article": article}
+        )
         serializer.is_valid(raise_exception=True)
-        serializer.save(user=user, article=article)
+        with transaction.atomic():
+            serializer.save(user=user, article=article)
         return Response(
             {"message": f"You commented on this article {article.title}"},
             status=status.HTTP_201_CREATED
-        )
\ No newline at end of file
+        )
+
+
+class CommentListAPIView(ListAPIView):
+    """
+    API endpoint for reading an article's comment threads
+
+    GET /articles/<uuid:article_id>/comments/
+    - Returns cursor-paginated top-level comments, oldest first
+    - Embeds the first COMMENTS_PREFETCHED_REPLIES replies of each comment,
+      loaded for the whole page by one windowed prefetch query
+    - Each comment carries its stored reply_count
+    """
+    serializer_class = CommentOutSerializer
+    pagination_class = CommentPagination
+
+    def get_queryset(self):
+        """Returns the article's top-level comments with their first replies"""
+        replies = (
+            Comment.objects.select_related("user", "parent")
+            .order_by("created", "pkid")[:settings.COMMENTS_PREFETCHED_REPLIES]
+        )
+        return (
+            Comment.objects.top_level()
+            .filter(article__id=self.kwargs["article_id"])
+            .select_related("user")
+            .prefetch_related(Prefetch("replies", queryset=replies, to_attr="first_replies"))
+        )
+
+    def list(self, request, *args, **kwargs):
+        """Lists the comments, or 404 if the article does not exist"""
+        response = super().list(request, *args, **kwargs)
+        if not response.data["results"] and not Article.objects.filter(id=kwargs["article_id"]).exists():
+            raise Http404
+        return response
+
+
+class CommentRepliesAPIView(ListAPIView):
+    """
+    API endpoint for the whole reply tree of a comment
+
+    GET /articles/<uuid:article_id>/comments/<uuid:comment_id>/replies/
+    - Returns every reply below the comment, at any depth, in thread order
+    - Reads one range of the comment path index per page
+    """
+    serializer_class = CommentReplySerializer
+    pagination_class = CommentThreadPagination
+
+    def get_queryset(self):
+        """Returns the subtree of the requested comment"""
+        comment = get_object_or_404(
+            Comment.objects.only("pkid", "article_id", "path"),
+            id=self.kwargs["comment_id"], article__id=self.kwargs["article_id"],
+        )
+        return Comment.objects.subtree(comment).select_related("user", "parent")
+
+
+class ArticleStatsAPIView(GenericAPIView):
+    """
+    API endpoint for the engagement statistics of one article
+
+    GET /articles/<uuid:article_id>/stats/?from=2026-10-01&to=2026-10-18&bucket=day
+    - Returns views, claps, ratings and average rating per hour or day, and
+      their totals over the range
+    - Reads only the rollup tables filled by the rollup_stats command
+    - Only the article's author may see them
+    """
+    serializer_class = StatsQuerySerializer
+
+    def get(self, request, article_id):
+        """Returns the article's statistics over the requested range"""
+        article = get_object_or_404(Article.objects.only("pkid", "author_id"), id=article_id)
+        if article.author_id != request.user.pk:
+            raise NotArticleAuthor
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        query = serializer.validated_data
+        rollups = rollups_between(query["bucket"], query["from"], query["to"]).filter(article_id=article.pkid)
+        return Response({
+            "article": article_id,
+            "bucket": query["bucket"],
+            "from": query["from"],
+            "to": query["to"],
+            **stats_series(rollups, query["bucket"]),
+        })
+
+
+class AuthorStatsAPIView(GenericAPIView):
+    """
+    API endpoint for the engagement summary of the current user's articles
+
+    GET /articles/stats/?from=2026-10-01&to=2026-10-18&bucket=day
+    - Returns views, claps, ratings and average rating per hour or day summed
+      over all the user's articles, their totals, and the most viewed articles
+    - Reads only the rollup tables, through their (author, start) index
+    """
+    serializer_class = StatsQuerySerializer
+
+    def get(self, request):
+        """Returns the user's summary over the requested range"""
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        query = serializer.validated_data
+        rollups = rollups_between(query["bucket"], query["from"], query["to"]).filter(author=request.user)
+        return Response({
+            "bucket": query["bucket"],
+            "from": query["from"],
+            "to": query["to"],
+            **stats_series(rollups, query["bucket"]),
+            "top_articles": top_articles(rollups),
+        })
+
+
+class PopularTagsAPIView(GenericAPIView):
+    """
+    API endpoint for the most used article tags
+
+    GET /articles/tags/
+    - Returns up to POPULAR_TAGS_LIMIT tags with their number of articles,
+      most used first
+    - Counts are read from the maintained TagCount rows, top of their index
+      first, and cached until tags change (or POPULAR_TAGS_CACHE_TIMEOUT)
+    """
+
+    def get(self, request):
+        """Returns the popular tags"""
+        tags = cache.get(POPULAR_TAGS_CACHE_KEY)
+        if tags is None:
+            tags = list(
+                TagCount.objects.filter(article_count__gt=0)
+                .order_by("-article_count", "tag")
+                .values(name=F("tag__name"), slug=F("tag__slug"), count=F("article_count"))
+                [:settings.POPULAR_TAGS_LIMIT]
+            )
+            cache.set(POPULAR_TAGS_CACHE_KEY, tags, settings.POPULAR_TAGS_CACHE_TIMEOUT)
+        return Response(tags)
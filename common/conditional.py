@@ -0,0 +1,87 @@
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(*parts, weak=False):
+    """Builds a quoted ETag from the parts identifying a representation.
+
+    Args:
+        *parts: Values that change whenever the representation changes,
+            e.g. the object's id and ``updated`` timestamp
+        weak (bool, optional): Mark the tag as weak (``W/``), for
+            representations that are only semantically equivalent. Defaults to False.
+
+    Returns:
+        str: ETag header value
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def set_validators(response, etag=None, last_modified=None):
+    """Adds ``ETag`` and ``Last-Modified`` headers to a response.
+
+    Args:
+        response (Response): Response to decorate
+        etag (str, optional): ETag header value
+        last_modified (datetime, optional): Last modification time
+
+    Returns:
+        Response: The same response
+    """
+    if etag:
+        response["ETag"] = etag
+    if last_modified:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified(request, etag=None, last_modified=None):
+    """Evaluates the request's preconditions against the current validators.
+
+    Follows RFC 9110 as implemented by Django's ``get_conditional_response``:
+    ``If-None-Match`` is compared with ``etag`` and, when absent,
+    ``If-Modified-Since`` with ``last_modified``; a failed ``If-Match`` or
+    ``If-Unmodified-Since`` yields 412 Precondition Failed.
+
+    Args:
+        request (Request): Current request
+        etag (str, optional): Current ETag of the resource
+        last_modified (datetime, optional): Current modification time of the resource
+
+    Returns:
+        Response: A 304 response carrying the validators, a 412 response,
+            or None if the full representation must be sent
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    conditional = get_conditional_response(request._request, etag=etag, last_modified=timestamp)
+    if conditional is None:
+        return None
+    if conditional.status_code != status.HTTP_304_NOT_MODIFIED:
+        return Response(status=conditional.status_code)
+    return set_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified)
+
+
+class ConditionalListMixin:
+    """Adds a collection ETag to list endpoints.
+
+    The tag is a weak hash of the serialized page, including its pagination
+    links, so clients revalidating with ``If-None-Match`` receive an empty
+    304 when nothing on the page changed.
+
+    The page is queried and serialized before the tag can be compared, so a
+    304 saves bandwidth and client work but no server work. Endpoints that
+    need cheaper revalidation derive the tag from a version instead, as
+    ``ArticleCreateAPIView.list`` does with its cache key.
+    """
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        etag = make_etag(json.dumps(response.data, sort_keys=True, cls=DjangoJSONEncoder), weak=True)
+        return not_modified(request, etag) or set_validators(response, etag)
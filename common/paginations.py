@@ -0,0 +1,205 @@
+import base64
+import binascii
+import datetime
+import json
+from decimal import Decimal
+from uuid import UUID
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Keyset (seek) pagination with opaque cursors.
+
+    Pages are selected with a ``WHERE (created, pkid) < (last_created, last_pkid)``
+    style condition on a unique ordering instead of ``OFFSET``, so every page
+    costs the same however deep it is, given an index on the ordering columns.
+    No ``COUNT(*)`` is run; responses only carry ``next`` and ``previous`` links.
+
+    The ordering defaults to ``ordering`` (newest first). When the view uses
+    DRF's ``OrderingFilter`` and the client picks one of its fields, that
+    field is used instead, with the primary key appended as a tiebreaker.
+
+    Attributes:
+        page_size (int): Default number of items per page
+        page_size_query_param (str): Query parameter letting clients pick the page size
+        max_page_size (int): Upper bound for a client supplied page size
+        cursor_query_param (str): Query parameter holding the cursor
+        ordering (tuple): Default ordering; the last field must be unique
+
+    Example Usage:
+        /api/v1/articles/?size=5                 # First page of 5 items
+        /api/v1/articles/?cursor=eyJ2IjpbIjIw...  # Page linked from "next"
+    """
+    page_size = 10
+    page_size_query_param = None
+    max_page_size = None
+    cursor_query_param = "cursor"
+    ordering = ("-created", "-pkid")
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Returns one page of ``queryset`` located by the request's cursor."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        ordering = self.get_ordering(request, queryset, view)
+        fields = [queryset.model._meta.get_field(name.lstrip("-")) for name in ordering]
+        self.ordering_fields = fields
+
+        values, backwards = self.decode_cursor(request, fields)
+        if backwards:
+            ordering = [name[1:] if name.startswith("-") else f"-{name}" for name in ordering]
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.seek(ordering, values))
+
+        page = list(queryset[:self.page_size + 1])
+        has_more = len(page) > self.page_size
+        page = page[:self.page_size]
+        if backwards:
+            page.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_previous, self.has_next = values is not None, has_more
+        self.page = page
+        return page
+
+    def get_page_size(self, request):
+        """Returns the client supplied page size, bounded by ``max_page_size``."""
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+            except (KeyError, ValueError):
+                return self.page_size
+            if size > 0:
+                return min(size, self.max_page_size) if self.max_page_size else size
+        return self.page_size
+
+    def get_ordering(self, request, queryset, view):
+        """Returns the ordering to paginate on, ending with a unique field.
+
+        Args:
+            request (Request): Current request
+            queryset (QuerySet): Queryset being paginated
+            view (APIView): View using the paginator
+
+        Returns:
+            list: Field names, prefixed with ``-`` when descending
+        """
+        ordering = None
+        for backend in getattr(view, "filter_backends", []):
+            if issubclass(backend, OrderingFilter) and backend.ordering_param in request.query_params:
+                ordering = backend().get_ordering(request, queryset, view)
+        ordering = list(ordering or self.ordering)
+
+        pk_name = queryset.model._meta.pk.name
+        if ordering[-1].lstrip("-") != pk_name:
+            descending = ordering[-1].startswith("-")
+            ordering = [name for name in ordering if name.lstrip("-") != pk_name]
+            ordering.append(f"-{pk_name}" if descending else pk_name)
+        return ordering
+
+    @staticmethod
+    def seek(ordering, values):
+        """Builds the condition selecting the rows after a cursor position.
+
+        Args:
+            ordering (list): Field names, prefixed with ``-`` when descending
+            values (list): Values of those fields at the cursor position
+
+        Returns:
+            Q: ``(a > x) OR (a = x AND b > y) ...`` with the comparison flipped
+                for descending fields
+        """
+        condition = Q()
+        for index, name in enumerate(ordering):
+            lookup = "lt" if name.startswith("-") else "gt"
+            clause = Q(**{f"{name.lstrip('-')}__{lookup}": values[index]})
+            for previous, value in zip(ordering[:index], values):
+                clause &= Q(**{previous.lstrip("-"): value})
+            condition |= clause
+        return condition
+
+    def decode_cursor(self, request, fields):
+        """Returns the ordering values and direction stored in the request's cursor.
+
+        Args:
+            request (Request): Current request
+            fields (list): Model fields of the ordering
+
+        Returns:
+            tuple: ``(values, backwards)``, with ``values`` None on the first page
+
+        Raises:
+            NotFound: If the cursor is malformed or does not match the ordering
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            values = payload["v"]
+            if len(values) != len(fields):
+                raise ValueError
+            return [field.to_python(value) for field, value in zip(fields, values)], bool(payload.get("p"))
+        except (TypeError, KeyError, ValueError, UnicodeEncodeError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, item, backwards):
+        """Returns the URL of the page after (or before) ``item``."""
+        values = [self._json_value(getattr(item, field.attname)) for field in self.ordering_fields]
+        payload = {"v": values}
+        if backwards:
+            payload["p"] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    @staticmethod
+    def _json_value(value):
+        """Converts an ordering value to JSON without losing precision."""
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+            return value.isoformat()
+        if isinstance(value, (UUID, Decimal)):
+            return str(value)
+        return value
+
+    def get_next_link(self):
+        """Returns the URL of the next page, or None on the last page."""
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], backwards=False)
+
+    def get_previous_link(self):
+        """Returns the URL of the previous page, or None on the first page."""
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], backwards=True)
+
+    def get_paginated_response(self, data):
+        """Wraps a serialized page with its navigation links."""
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        """Describes the paginated response for schema generators."""
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
     
     # Third-party Apps
     'rest_framework',
@@ -53,6 +54,7 @@ INSTALLED_APPS = [
     'debug_toolbar',
     'django_extensions',
     'taggit',
+    'django_elasticsearch_dsl',
     
     # Local Apps
     'users',
@@ -113,6 +115,29 @@ else:
         'default': dj_database_url.config(default=config('DATABASE_URL'))
     }
 
+# ========================
+#  CACHE CONFIGURATION
+# ========================
+# "default" is shared by all processes (Redis when REDIS_URL is set), "local" is per process.
+REDIS_URL = config("REDIS_URL", default="")
+CACHES = {
+    "default": (
+        {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL}
+        if REDIS_URL else
+        {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "shared"}
+    ),
+    "local": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "local",
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
+}
+ARTICLE_CACHE_L1_ALIAS = "local"  # Per-process cache in front of the shared one
+ARTICLE_CACHE_L2_ALIAS = "default"
+ARTICLE_CACHE_TIMEOUT = config("ARTICLE_CACHE_TIMEOUT", default=300, cast=int)  # Seconds serialized articles stay in L2
+ARTICLE_CACHE_L1_TIMEOUT = config("ARTICLE_CACHE_L1_TIMEOUT", default=30, cast=int)  # Seconds they stay in L1
+ARTICLE_LIST_COUNTERS_TIMEOUT = config("ARTICLE_LIST_COUNTERS_TIMEOUT", default=60, cast=int)  # Seconds list pages may show stale counters
+
 # ========================
 #  AUTHENTICATION CONFIGURATION
 # ========================
@@ -216,6 +241,92 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# ========================
+#  ARTICLE ENGAGEMENT CONFIGURATION
+# ========================
+ARTICLE_VIEWS_FLUSH_THRESHOLD = config("ARTICLE_VIEWS_FLUSH_THRESHOLD", default=100, cast=int)  # Buffered views before a flush
+ARTICLE_VIEWS_FLUSH_INTERVAL = config("ARTICLE_VIEWS_FLUSH_INTERVAL", default=5, cast=float)  # Seconds before a flush
+ARTICLE_VIEWS_MODE = config("ARTICLE_VIEWS_MODE", default="exact")  # "exact" rows or "sketch" (HyperLogLog)
+ARTICLE_VIEWS_AUDIT_LOG = config("ARTICLE_VIEWS_AUDIT_LOG", default=False, cast=bool)  # Keep ArticleView rows in sketch mode
+ARTICLE_VIEW_EVENTS_WORKER = config("ARTICLE_VIEW_EVENTS_WORKER", default=True, cast=bool)  # Background ingestion thread
+ARTICLE_VIEW_EVENTS_BATCH_SIZE = config("ARTICLE_VIEW_EVENTS_BATCH_SIZE", default=500, cast=int)  # Events per bulk insert
+ARTICLE_VIEW_EVENTS_FLUSH_INTERVAL = config("ARTICLE_VIEW_EVENTS_FLUSH_INTERVAL", default=1.0, cast=float)  # Seconds to fill a batch
+ARTICLE_VIEW_EVENTS_QUEUE_SIZE = config("ARTICLE_VIEW_EVENTS_QUEUE_SIZE", default=10000, cast=int)  # Events kept before dropping
+ENGAGEMENT_BATCH_MAX_OPERATIONS = config("ENGAGEMENT_BATCH_MAX_OPERATIONS", default=100, cast=int)  # Operations per batch request
+RATING_PRIOR_MEAN = config("RATING_PRIOR_MEAN", default=3.0, cast=float)  # Rating scores start from this mean
+RATING_PRIOR_WEIGHT = config("RATING_PRIOR_WEIGHT", default=5, cast=int)  # Ratings needed to move a score halfway to its mean
+
+# ========================
+#  SEARCH CONFIGURATION
+# ========================
+# "auto" picks "postgres" on PostgreSQL, "sqlite" (FTS5) on SQLite and "database" otherwise;
+# "inverted", "elasticsearch" or a dotted path can also be set explicitly.
+ARTICLE_SEARCH_BACKEND = config("ARTICLE_SEARCH_BACKEND", default="auto")
+ELASTICSEARCH_DSL = {
+    'default': {
+        'hosts': config("ELASTICSEARCH_URL", default="http://localhost:9200"),
+    },
+}
+ELASTICSEARCH_DSL_AUTOSYNC = False  # Indexing is driven by articles.signals through the search backend
+ELASTICSEARCH_DSL_AUTO_REFRESH = False
+
+# ========================
+#  FEED CONFIGURATION
+# ========================
+FEED_TIMELINE_LENGTH = config("FEED_TIMELINE_LENGTH", default=800, cast=int)  # Entries kept per reader timeline
+FEED_TIMELINE_TRIM_SLACK = config("FEED_TIMELINE_TRIM_SLACK", default=80, cast=int)  # Overflow tolerated before trimming
+FEED_FANOUT_MAX_FOLLOWERS = config("FEED_FANOUT_MAX_FOLLOWERS", default=10000, cast=int)  # Larger audiences are pulled at read time
+FEED_FANOUT_BATCH_SIZE = config("FEED_FANOUT_BATCH_SIZE", default=1000, cast=int)  # Timeline rows written per insert
+FEED_FOLLOW_BACKFILL = config("FEED_FOLLOW_BACKFILL", default=20, cast=int)  # Recent articles copied on follow
+
+# ========================
+#  TAGS CONFIGURATION
+# ========================
+POPULAR_TAGS_LIMIT = config("POPULAR_TAGS_LIMIT", default=50, cast=int)  # Tags listed by /articles/tags/
+POPULAR_TAGS_CACHE_TIMEOUT = config("POPULAR_TAGS_CACHE_TIMEOUT", default=300, cast=int)  # Seconds popular tag counts are cached
+
+# ========================
+#  COMMENT THREADS CONFIGURATION
+# ========================
+COMMENTS_PREFETCHED_REPLIES = config("COMMENTS_PREFETCHED_REPLIES", default=3, cast=int)  # Replies embedded under each listed comment
+COMMENTS_MAX_DEPTH = config("COMMENTS_MAX_DEPTH", default=8, cast=int)  # Deepest reply level accepted (top-level comments are 0)
+
+# ========================
+#  TRENDING CONFIGURATION
+# ========================
+# Window name mapped to (length in hours, half-life of an event in hours)
+TRENDING_WINDOWS = {
+    "1h": (1, 0.5),
+    "24h": (24, 6),
+    "7d": (168, 48),
+}
+TRENDING_DEFAULT_WINDOW = "24h"
+TRENDING_WEIGHTS = {"views": 1, "claps": 3, "ratings": 4, "comments": 5}  # Score of one event of each kind
+TRENDING_LIMIT = config("TRENDING_LIMIT", default=100, cast=int)  # Articles stored and served per window
+
+# ========================
+#  ARTICLE STATISTICS CONFIGURATION
+# ========================
+STATS_DEFAULT_DAYS = config("STATS_DEFAULT_DAYS", default=30, cast=int)  # Range served when ?from= is omitted
+STATS_MAX_HOURLY_DAYS = config("STATS_MAX_HOURLY_DAYS", default=31, cast=int)  # Longest range served with ?bucket=hour
+
+# ========================
+#  RELATED ARTICLES CONFIGURATION
+# ========================
+RELATED_ARTICLES_LIMIT = config("RELATED_ARTICLES_LIMIT", default=10, cast=int)  # Neighbours kept per article
+RELATED_ARTICLES_KEYWORDS = config("RELATED_ARTICLES_KEYWORDS", default=32, cast=int)  # TF-IDF terms kept per article
+RELATED_ARTICLES_MAX_FANOUT = config("RELATED_ARTICLES_MAX_FANOUT", default=1000, cast=int)  # Terms, tags and clappers shared by more articles are ignored
+RELATED_ARTICLES_TEXT_WEIGHT = config("RELATED_ARTICLES_TEXT_WEIGHT", default=0.6, cast=float)  # Share of TF-IDF cosine in the score
+RELATED_ARTICLES_TAG_WEIGHT = config("RELATED_ARTICLES_TAG_WEIGHT", default=0.25, cast=float)  # Share of tag overlap in the score
+RELATED_ARTICLES_CLAP_WEIGHT = config("RELATED_ARTICLES_CLAP_WEIGHT", default=0.15, cast=float)  # Share of clap co-occurrence in the score
+
+# ========================
+#  FOLLOW SUGGESTIONS CONFIGURATION
+# ========================
+FOLLOW_SUGGESTIONS_LIMIT = config("FOLLOW_SUGGESTIONS_LIMIT", default=20, cast=int)  # Suggestions kept per profile
+FOLLOW_SUGGESTIONS_ENGAGEMENT_WEIGHT = config("FOLLOW_SUGGESTIONS_ENGAGEMENT_WEIGHT", default=0.5, cast=float)  # Score per shared clap/bookmark
+FOLLOW_SUGGESTIONS_MAX_ARTICLE_ENGAGEMENT = config("FOLLOW_SUGGESTIONS_MAX_ARTICLE_ENGAGEMENT", default=1000, cast=int)  # More popular articles carry no signal
+
 # ========================
 #  cities light library configutation
 # ========================
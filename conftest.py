@@ -0,0 +1,26 @@
+import pytest
+from django.core.cache import caches
+
+from articles.buffers import views_count_buffer
+from articles.ingestion import view_events
+
+
+@pytest.fixture(autouse=True)
+def isolate_view_tracking(settings):
+    """Keeps view events in the calling thread and resets in-process buffers.
+
+    Tests write queued events explicitly with ``view_events.drain()`` instead
+    of racing the background ingestion worker.
+    """
+    settings.ARTICLE_VIEW_EVENTS_WORKER = False
+    yield
+    view_events.clear()
+    views_count_buffer.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Empties every cache so cached responses and aggregates never leak between tests."""
+    yield
+    for cache in caches.all():
+        cache.clear()
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from profiles.models import FollowSuggestion, Profile
+from profiles.suggestions import compute_suggestions
+
+
+class Command(BaseCommand):
+    """Recomputes the precomputed follow suggestions of every profile.
+
+    Profiles that follow someone are processed in primary-key chunks, so the
+    memory used by the candidate counters is bounded by the batch size;
+    suggestions of profiles that follow nobody are dropped. Meant to run
+    periodically, e.g. nightly from cron.
+
+    Example:
+        python manage.py compute_follow_suggestions --batch-size 500
+    """
+    help = "Recomputes follow suggestions from second-degree follows and shared engagement"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of profiles computed per batch"
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        FollowSuggestion.objects.filter(profile__following_count=0).delete()
+
+        profiles = written = 0
+        last_pkid = 0
+        while True:
+            pkids = list(
+                Profile.objects.filter(pkid__gt=last_pkid, following_count__gt=0)
+                .order_by("pkid")
+                .values_list("pkid", flat=True)[:batch_size]
+            )
+            if not pkids:
+                break
+            written += compute_suggestions(pkids)
+            profiles += len(pkids)
+            last_pkid = pkids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} suggestions for {profiles} profiles"))
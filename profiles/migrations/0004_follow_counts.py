@@ -0,0 +1,72 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_counts(apps, schema_editor):
+    """Counts the existing followers and followings of every profile."""
+    Profile = apps.get_model("profiles", "Profile")
+    Follow = apps.get_model("profiles", "Follow")
+
+    def total(column):
+        rows = (
+            Follow.objects.filter(**{column: OuterRef("pkid")})
+            .order_by().values(column).annotate(total=Count("pk")).values("total")
+        )
+        return Coalesce(Subquery(rows, output_field=IntegerField()), Value(0))
+
+    Profile.objects.update(followers_count=total("from_profile"), following_count=total("to_profile"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_created_pkid_index'),
+    ]
+
+    operations = [
+        # The auto-created M2M table becomes the explicit Follow model as is.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name='Follow',
+                    fields=[
+                        ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                        ('from_profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='follower_links', to='profiles.profile')),
+                        ('to_profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='following_links', to='profiles.profile')),
+                    ],
+                    options={
+                        'db_table': 'profiles_profile_followers',
+                        'unique_together': {('from_profile', 'to_profile')},
+                    },
+                ),
+                migrations.AlterField(
+                    model_name='profile',
+                    name='followers',
+                    field=models.ManyToManyField(related_name='following', through='profiles.Follow', through_fields=('from_profile', 'to_profile'), to='profiles.profile'),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['to_profile', 'from_profile'], name='profiles_follow_reverse_idx'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of profiles following this one', verbose_name='Followers count'),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of profiles this one follows', verbose_name='Following count'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['followers_count'], name='profiles_followers_count_idx'),
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.7 on 2026-10-18 19:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0004_follow_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FollowSuggestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Score')),
+                ('mutual_count', models.PositiveIntegerField(default=0, verbose_name='Mutual follows')),
+                ('shared_engagement_count', models.PositiveIntegerField(default=0, verbose_name='Shared claps and bookmarks')),
+                ('computed', models.DateTimeField(verbose_name='Computed at')),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='profiles.profile')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='follow_suggestions', to='profiles.profile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['profile', '-score'], name='profiles_suggestion_rank_idx')],
+                'unique_together': {('profile', 'candidate')},
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Exists, F, OuterRef
 from django.contrib.auth import get_user_model
 from django_countries.fields import CountryField
 from phonenumber_field.modelfields import PhoneNumberField
@@ -10,6 +11,28 @@ from common.models import TimeStampedModel
 User = get_user_model()
 
 
+class ProfileQuerySet(models.QuerySet):
+    """QuerySet with the builders shared by profile list endpoints."""
+
+    def with_relationships(self, viewer):
+        """Annotates how each profile relates to the viewer.
+
+        Adds ``is_followed_by_me`` and ``follows_me`` as ``EXISTS``
+        subqueries on the follow table's two indexes, so a whole page is
+        resolved in the same statement that loads it.
+
+        Args:
+            viewer (Profile): Profile of the current user
+
+        Returns:
+            ProfileQuerySet: Annotated queryset
+        """
+        return self.annotate(
+            is_followed_by_me=Exists(Follow.objects.filter(from_profile=OuterRef("pkid"), to_profile=viewer)),
+            follows_me=Exists(Follow.objects.filter(from_profile=viewer, to_profile=OuterRef("pkid"))),
+        )
+
+
 class Profile(TimeStampedModel):
     """User profile model extending the base User model with additional personal information.
     
@@ -24,7 +47,9 @@ class Profile(TimeStampedModel):
         bio (TextField): Short biography/about text
         gender (CharField): User's gender (M/F)
         phone_number (PhoneNumberField): User's phone number
-        followers (ManyToManyField): Users who follow this profile
+        followers (ManyToManyField): Users who follow this profile, stored as Follow rows
+        followers_count (PositiveIntegerField): Number of followers, maintained by follow/unfollow
+        following_count (PositiveIntegerField): Number of followed profiles, maintained by follow/unfollow
     """
     
     class Gender(models.TextChoices):
@@ -65,24 +90,85 @@ class Profile(TimeStampedModel):
     followers = models.ManyToManyField(
         "self",
         symmetrical=False,
-        related_name="following"
+        related_name="following",
+        through="Follow",
+        through_fields=("from_profile", "to_profile")
+    )
+    followers_count = models.PositiveIntegerField(
+        _("Followers count"),
+        help_text=_("Number of profiles following this one"),
+        default=0,
+        editable=False
     )
+    following_count = models.PositiveIntegerField(
+        _("Following count"),
+        help_text=_("Number of profiles this one follows"),
+        default=0,
+        editable=False
+    )
+
+    objects = ProfileQuerySet.as_manager()
+
+    class Meta(TimeStampedModel.Meta):
+        """Indexes the (created, pkid) keyset of the follow lists and the follower counts."""
+        indexes = [
+            models.Index(fields=["-created", "-pkid"], name="profiles_created_pkid_idx"),
+            models.Index(fields=["followers_count"], name="profiles_followers_count_idx"),
+        ]
+
+    def _lock(self):
+        """Locks this profile's row until the end of the current transaction.
+
+        Serializes the follow changes made by one profile, so the check and
+        the counter updates in ``follow``/``unfollow`` cannot interleave.
+        """
+        Profile.objects.select_for_update().filter(pkid=self.pkid).values_list("pkid", flat=True).get()
+
+    def _count_follow(self, profile, delta):
+        """Adjusts both follow counters with ``F()`` expressions.
+
+        Args:
+            profile (Profile): The followed or unfollowed profile
+            delta (int): 1 for a follow, -1 for an unfollow
+        """
+        Profile.objects.filter(pkid=self.pkid).update(following_count=F("following_count") + delta)
+        Profile.objects.filter(pkid=profile.pkid).update(followers_count=F("followers_count") + delta)
+        self.following_count += delta
+        profile.followers_count += delta
 
     def follow(self, profile):
         """Add a follow relationship to another profile.
         
         Args:
             profile (Profile): The profile to follow
+
+        Returns:
+            bool: True if the relationship was created, False if it already existed
         """
-        self.following.add(profile)
+        with transaction.atomic():
+            self._lock()
+            if self.is_following(profile):
+                return False
+            self.following.add(profile)
+            self._count_follow(profile, 1)
+        return True
 
     def unfollow(self, profile):
         """Remove a follow relationship with another profile.
         
         Args:
             profile (Profile): The profile to unfollow
+
+        Returns:
+            bool: True if the relationship was removed, False if there was none
         """
-        self.following.remove(profile)
+        with transaction.atomic():
+            self._lock()
+            if not self.is_following(profile):
+                return False
+            self.following.remove(profile)
+            self._count_follow(profile, -1)
+        return True
 
     def is_following(self, profile):
         """Check if this profile is following another profile.
@@ -97,4 +183,61 @@ class Profile(TimeStampedModel):
 
     def __str__(self):
         """String representation of the profile (user's full name)."""
-        return f"{self.user.full_name}"
\ No newline at end of file
+        return f"{self.user.full_name}"
+
+
+class Follow(models.Model):
+    """Through model of ``Profile.followers``: ``to_profile`` follows ``from_profile``.
+
+    Keeps the table of the original auto-created M2M. The unique
+    (from_profile, to_profile) index serves follower lookups and the
+    (to_profile, from_profile) index serves following lookups, so both
+    directions are answered from an index alone.
+    """
+    from_profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="follower_links")
+    to_profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="following_links")
+
+    class Meta:
+        """Reuses the M2M table, with an index for each lookup direction."""
+        db_table = "profiles_profile_followers"
+        unique_together = ["from_profile", "to_profile"]
+        indexes = [
+            models.Index(fields=["to_profile", "from_profile"], name="profiles_follow_reverse_idx"),
+        ]
+
+    def __str__(self):
+        """Returns formatted string of the relationship."""
+        return f"{self.to_profile_id} follows {self.from_profile_id}"
+
+
+class FollowSuggestion(models.Model):
+    """A precomputed follow suggestion, written by ``compute_follow_suggestions``.
+
+    Each profile keeps its top ``FOLLOW_SUGGESTIONS_LIMIT`` candidates, so
+    serving suggestions is one range scan of the (profile, -score) index.
+
+    Attributes:
+        profile (ForeignKey): Profile the suggestion is shown to
+        candidate (ForeignKey): Suggested profile
+        score (FloatField): Ranking score
+        mutual_count (PositiveIntegerField): Followed profiles that follow the candidate
+        shared_engagement_count (PositiveIntegerField): Articles both clapped or bookmarked
+        computed (DateTimeField): When the suggestion was computed
+    """
+    profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="follow_suggestions")
+    candidate = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField(_("Score"))
+    mutual_count = models.PositiveIntegerField(_("Mutual follows"), default=0)
+    shared_engagement_count = models.PositiveIntegerField(_("Shared claps and bookmarks"), default=0)
+    computed = models.DateTimeField(_("Computed at"))
+
+    class Meta:
+        """Keeps one suggestion per pair, indexed for best-first reads."""
+        unique_together = ["profile", "candidate"]
+        indexes = [
+            models.Index(fields=["profile", "-score"], name="profiles_suggestion_rank_idx"),
+        ]
+
+    def __str__(self):
+        """Returns formatted string of the suggestion."""
+        return f"Suggest {self.candidate_id} to {self.profile_id} ({self.score:.2f})"
@@ -1,7 +1,7 @@
-from rest_framework.pagination import PageNumberPagination
+from common.paginations import KeysetPagination
 
 
-class ProfilePagination(PageNumberPagination):
+class ProfilePagination(KeysetPagination):
     """Custom pagination class for Profile API endpoints.
     
     Provides configurable pagination with these defaults:
@@ -9,13 +9,13 @@ class ProfilePagination(PageNumberPagination):
     - Client-adjustable page size via 'size' query parameter
     - Maximum allowed page size of 20 profiles
     
-    Inherits from DRF's PageNumberPagination to implement page-number style pagination.
+    Inherits from KeysetPagination: pages are addressed by opaque cursors over
+    ``(created, pkid)`` and no count query is run.
     Suitable for endpoints returning lists of user profiles.
     
     Example Usage:
-        /api/profiles/?page=2         # Get second page (10 items)
-        /api/profiles/?size=15        # Get first page with 15 items
-        /api/profiles/?page=3&size=5  # Get third page with 5 items
+        /api/profiles/followers/?size=15           # Get first page with 15 items
+        /api/profiles/followers/?cursor=<next>     # Follow the "next" link
     """
     page_size = 10
     page_size_query_param = "size"
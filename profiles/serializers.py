@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from profiles.models import Profile 
+from profiles.models import FollowSuggestion, Profile
 from django_countries.serializers import CountryFieldMixin
 from cities_light.models import City, Country
 
@@ -23,6 +23,8 @@ class ProfileOutSerializer(CountryFieldMixin, serializers.ModelSerializer):
         email (ReadOnlyField): User's email from related User model
         first_name (ReadOnlyField): User's first name from related User model
         last_name (ReadOnlyField): User's last name from related User model
+        followers_count (int): Number of followers
+        following_count (int): Number of followed profiles
     
     Validation:
         - Ensures selected city belongs to selected country
@@ -44,7 +46,8 @@ class ProfileOutSerializer(CountryFieldMixin, serializers.ModelSerializer):
         model = Profile
         fields = [
             'country', 'city', 'phone_number', 'profile_pic',
-            'gender', 'bio', 'email', 'first_name', 'last_name'
+            'gender', 'bio', 'email', 'first_name', 'last_name',
+            'followers_count', 'following_count'
         ]
     
     def validate(self, attrs):
@@ -67,4 +70,48 @@ class ProfileOutSerializer(CountryFieldMixin, serializers.ModelSerializer):
             return data
         raise serializers.ValidationError(
             {"city": "Selected city is not in the chosen country."}
-        )
\ No newline at end of file
+        )
+
+
+class ProfileListSerializer(ProfileOutSerializer):
+    """Serializer for profiles listed to another user, with their relationship.
+    
+    Fields:
+        is_followed_by_me (bool): Whether the current user follows the profile
+        follows_me (bool): Whether the profile follows the current user
+    
+    Both fields come from ``ProfileQuerySet.with_relationships``.
+    """
+    is_followed_by_me = serializers.ReadOnlyField()
+    follows_me = serializers.ReadOnlyField()
+
+    class Meta(ProfileOutSerializer.Meta):
+        fields = ProfileOutSerializer.Meta.fields + ['id', 'is_followed_by_me', 'follows_me']
+
+
+class RelationshipsSerializer(serializers.Serializer):
+    """Serializer for a bulk relationship lookup.
+    
+    Fields:
+        profiles (list): Public ids of up to 500 profiles
+    """
+    profiles = serializers.ListField(child=serializers.UUIDField(), allow_empty=False, max_length=500)
+
+
+
+class FollowSuggestionSerializer(serializers.ModelSerializer):
+    """Serializer for a precomputed follow suggestion.
+    
+    Fields:
+        id (UUID): Public id of the suggested profile
+        profile (ProfileOutSerializer): The suggested profile
+        score (float): Ranking score
+        mutual_count (int): Followed profiles that follow the suggested one
+        shared_engagement_count (int): Articles both users clapped or bookmarked
+    """
+    id = serializers.ReadOnlyField(source="candidate.id")
+    profile = ProfileOutSerializer(source="candidate", read_only=True)
+
+    class Meta:
+        model = FollowSuggestion
+        fields = ["id", "profile", "score", "mutual_count", "shared_engagement_count"]
@@ -0,0 +1,122 @@
+import heapq
+from collections import Counter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from articles.models import Bookmark, Clap
+from profiles.models import Follow, FollowSuggestion, Profile
+
+
+# Engagement models compared between readers, with their reverse accessor
+# on Article and the Article counter used to skip very popular articles.
+CO_ENGAGEMENTS = [
+    (Clap, "claps", "clap_count"),
+    (Bookmark, "bookmarks", "bookmark_count"),
+]
+
+
+def second_degree_follows(profile_pkids):
+    """Counts the paths of length two from each profile to the profiles it could follow.
+
+    This is the sparse product of the follow adjacency matrix with itself,
+    restricted to the given rows; it is computed by the database as one
+    self-join of the follow table grouped by (profile, candidate).
+
+    Args:
+        profile_pkids (list): Profiles the suggestions are computed for
+
+    Returns:
+        dict: Profile pkid mapped to a Counter of candidate pkid -> number of
+            followed profiles that follow the candidate
+    """
+    paths = {pkid: Counter() for pkid in profile_pkids}
+    rows = (
+        Follow.objects.filter(to_profile__follower_links__to_profile__in=profile_pkids)
+        .values(viewer=F("to_profile__follower_links__to_profile"), candidate=F("from_profile"))
+        .annotate(total=Count("pk"))
+        .values_list("viewer", "candidate", "total")
+    )
+    for viewer, candidate, total in rows:
+        paths[viewer][candidate] += total
+    return paths
+
+
+def shared_engagements(user_ids):
+    """Counts the articles each user clapped or bookmarked together with every other user.
+
+    Articles above ``FOLLOW_SUGGESTIONS_MAX_ARTICLE_ENGAGEMENT`` engagements
+    are skipped: engaging with a hit says little about shared taste, and
+    they would dominate the size of the self-join.
+
+    Args:
+        user_ids (list): Users the suggestions are computed for
+
+    Returns:
+        dict: User id mapped to a Counter of other user id -> shared articles
+    """
+    shared = {user_id: Counter() for user_id in user_ids}
+    limit = settings.FOLLOW_SUGGESTIONS_MAX_ARTICLE_ENGAGEMENT
+    for model, accessor, counter in CO_ENGAGEMENTS:
+        rows = (
+            model.objects.filter(**{
+                f"article__{accessor}__user_id__in": user_ids,
+                f"article__{counter}__lte": limit,
+            })
+            .values(viewer=F(f"article__{accessor}__user_id"), other=F("user_id"))
+            .annotate(total=Count("pk"))
+            .values_list("viewer", "other", "total")
+        )
+        for viewer, other, total in rows:
+            if viewer != other:
+                shared[viewer][other] += total
+    return shared
+
+
+def compute_suggestions(profile_pkids):
+    """Recomputes the stored suggestions of a batch of profiles.
+
+    Candidates are the second-degree follows of each profile, minus itself
+    and the profiles it already follows. Each is scored by its number of
+    mutual follows plus ``FOLLOW_SUGGESTIONS_ENGAGEMENT_WEIGHT`` per article
+    both users clapped or bookmarked; the best ``FOLLOW_SUGGESTIONS_LIMIT``
+    replace the batch's previous suggestions in one transaction.
+
+    Args:
+        profile_pkids (list): Profiles to recompute
+
+    Returns:
+        int: Number of suggestions written
+    """
+    paths = second_degree_follows(profile_pkids)
+    followed = set(
+        Follow.objects.filter(to_profile__in=profile_pkids).values_list("to_profile", "from_profile")
+    )
+    candidate_pkids = {candidate for counter in paths.values() for candidate in counter}
+    user_of = dict(
+        Profile.objects.filter(pkid__in=candidate_pkids | set(profile_pkids)).values_list("pkid", "user_id")
+    )
+    shared = shared_engagements([user_of[pkid] for pkid in profile_pkids if pkid in user_of])
+
+    weight = settings.FOLLOW_SUGGESTIONS_ENGAGEMENT_WEIGHT
+    now = timezone.now()
+    suggestions = []
+    for pkid, counter in paths.items():
+        engaged = shared.get(user_of.get(pkid), Counter())
+        scored = (
+            (mutual + weight * engaged[user_of[candidate]], mutual, engaged[user_of[candidate]], candidate)
+            for candidate, mutual in counter.items()
+            if candidate != pkid and (pkid, candidate) not in followed
+        )
+        for score, mutual, engagement, candidate in heapq.nlargest(settings.FOLLOW_SUGGESTIONS_LIMIT, scored):
+            suggestions.append(FollowSuggestion(
+                profile_id=pkid, candidate_id=candidate, score=score,
+                mutual_count=mutual, shared_engagement_count=engagement, computed=now,
+            ))
+
+    with transaction.atomic():
+        FollowSuggestion.objects.filter(profile__in=profile_pkids).delete()
+        FollowSuggestion.objects.bulk_create(suggestions)
+    return len(suggestions)
@@ -42,6 +42,23 @@ def test_unfollow_method():
     assert user1.profile.is_following(user2.profile) is False
     assert user2.profile.is_following(user1.profile) is False
 
+# **Test Follow Counters**
+def test_follow_counts_are_maintained():
+    user1 = UserFactory()
+    user2 = UserFactory()
+
+    assert user1.profile.follow(user2.profile) is True
+    assert user1.profile.follow(user2.profile) is False
+    user1.profile.refresh_from_db()
+    user2.profile.refresh_from_db()
+    assert (user1.profile.following_count, user2.profile.followers_count) == (1, 1)
+
+    assert user1.profile.unfollow(user2.profile) is True
+    assert user1.profile.unfollow(user2.profile) is False
+    user1.profile.refresh_from_db()
+    user2.profile.refresh_from_db()
+    assert (user1.profile.following_count, user2.profile.followers_count) == (0, 0)
+
 # 5. **Test is_following Method**
 def test_is_following_method():
     user1 = UserFactory()
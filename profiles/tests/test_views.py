@@ -5,6 +5,8 @@ from profiles.models import Profile
 from profiles.factories import UserFactory, ProfileFactory
 
 from django.urls import reverse
+from django.core.management import call_command
+from articles.factories import ArticleFactory, ClapFactory
 from rest_framework import status
 
 @pytest.fixture
@@ -23,6 +25,34 @@ def test_retrieve_own_profile(api_client):
     assert response.status_code == status.HTTP_200_OK
     assert response.data["email"] == user.email
 
+@pytest.mark.django_db
+def test_retrieve_own_profile_conditional(api_client):
+    user = UserFactory()
+    api_client.force_authenticate(user=user)
+    url = reverse("profiles:profile")
+
+    etag = api_client.get(url)["ETag"]
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    user.first_name = "Renamed"
+    user.save()
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+@pytest.mark.django_db
+def test_followers_list_conditional(api_client):
+    user = UserFactory()
+    UserFactory().profile.follow(user.profile)
+    api_client.force_authenticate(user=user)
+    url = reverse("profiles:followers")
+
+    etag = api_client.get(url)["ETag"]
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+    UserFactory().profile.follow(user.profile)
+    assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
 @pytest.mark.django_db
 def test_list_all_profiles(api_client):
     user = UserFactory()
@@ -34,6 +64,71 @@ def test_list_all_profiles(api_client):
     assert response.status_code == status.HTTP_200_OK
     assert len(response.data) >= 1  # assuming at least one profile
 
+@pytest.mark.django_db
+def test_list_profiles_with_relationships(api_client):
+    user = UserFactory()
+    followed, follower, stranger = UserFactory(), UserFactory(), UserFactory()
+    user.profile.follow(followed.profile)
+    follower.profile.follow(user.profile)
+
+    api_client.force_authenticate(user=user)
+    response = api_client.get(reverse("profiles:profiles"))
+    states = {p["email"]: (p["is_followed_by_me"], p["follows_me"]) for p in response.data}
+    assert states[followed.email] == (True, False)
+    assert states[follower.email] == (False, True)
+    assert states[stranger.email] == (False, False)
+
+    followers = api_client.get(reverse("profiles:followers")).data["results"]
+    assert [(p["email"], p["follows_me"], p["is_followed_by_me"]) for p in followers] == [(follower.email, True, False)]
+
+@pytest.mark.django_db
+def test_relationships_lookup_is_one_query(api_client, django_assert_max_num_queries):
+    user = UserFactory()
+    others = [UserFactory() for _ in range(5)]
+    user.profile.follow(others[0].profile)
+    others[1].profile.follow(user.profile)
+
+    api_client.force_authenticate(user=user)
+    url = reverse("profiles:relationships")
+    ids = [str(other.profile.id) for other in others]
+    with django_assert_max_num_queries(2):  # the user's profile, then the lookup
+        response = api_client.post(url, {"profiles": ids}, format="json")
+    assert response.status_code == status.HTTP_200_OK
+    relationships = response.data["relationships"]
+    assert relationships[ids[0]] == {"is_followed_by_me": True, "follows_me": False}
+    assert relationships[ids[1]] == {"is_followed_by_me": False, "follows_me": True}
+    assert len(relationships) == 5
+
+    too_many = {"profiles": ids * 101}
+    assert api_client.post(url, too_many, format="json").status_code == status.HTTP_400_BAD_REQUEST
+
+@pytest.mark.django_db
+def test_follow_suggestions(api_client):
+    user, friend, other_friend = UserFactory(), UserFactory(), UserFactory()
+    popular, niche, followed = UserFactory(), UserFactory(), UserFactory()
+    for profile in (friend.profile, other_friend.profile, followed.profile):
+        user.profile.follow(profile)
+    friend.profile.follow(popular.profile)
+    other_friend.profile.follow(popular.profile)
+    friend.profile.follow(niche.profile)
+    friend.profile.follow(followed.profile)
+    friend.profile.follow(user.profile)
+    article = ArticleFactory()
+    ClapFactory(user=user, article=article)
+    ClapFactory(user=niche, article=article)
+
+    call_command("compute_follow_suggestions", batch_size=2)
+    api_client.force_authenticate(user=user)
+    response = api_client.get(reverse("profiles:suggestions"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [s["profile"]["email"] for s in response.data] == [popular.email, niche.email]
+    assert response.data[0]["mutual_count"] == 2
+    assert response.data[1]["shared_engagement_count"] == 1
+
+    user.profile.follow(popular.profile)
+    assert [s["profile"]["email"] for s in api_client.get(reverse("profiles:suggestions")).data] == [niche.email]
+
 @pytest.mark.django_db
 def test_follow_another_user(api_client):
     user1 = UserFactory()
@@ -86,7 +181,7 @@ def test_get_followers(api_client):
     response = api_client.get(url)
 
     assert response.status_code == 200
-    assert any(f["email"] == user2.email for f in response.data)
+    assert any(f["email"] == user2.email for f in response.data["results"])
 
 @pytest.mark.django_db
 def test_get_followings(api_client):
@@ -101,4 +196,29 @@ def test_get_followings(api_client):
     response = api_client.get(url)
 
     assert response.status_code == 200
-    assert any(f["email"] == user2.email for f in response.data)
+    assert any(f["email"] == user2.email for f in response.data["results"])
+
+@pytest.mark.django_db
+def test_followers_cursor_pagination(api_client):
+    user = UserFactory()
+    followers = [UserFactory() for _ in range(25)]
+    for follower in followers:
+        follower.profile.follow(user.profile)
+
+    api_client.force_authenticate(user=user)
+    url = reverse("profiles:followers")
+    seen = []
+    response = api_client.get(url)
+    while True:
+        assert response.status_code == 200
+        assert "count" not in response.data
+        seen.extend(f["email"] for f in response.data["results"])
+        if not response.data["next"]:
+            break
+        response = api_client.get(response.data["next"])
+
+    assert sorted(seen) == sorted(f.email for f in followers)
+    assert len(seen) == len(set(seen))
+    previous = api_client.get(response.data["previous"])
+    assert len(previous.data["results"]) == 10
+    assert previous.data["results"][-1]["email"] not in [f["email"] for f in response.data["results"]]
@@ -6,7 +6,9 @@ from profiles.views import (
     FollowAPIView,
     UnFollowAPIView,
     FollowersAPIView,
-    FollowingsAPIView
+    FollowingsAPIView,
+    RelationshipsAPIView,
+    FollowSuggestionsAPIView
 )
 
 app_name = "profiles"
@@ -18,6 +20,12 @@ urlpatterns = [
     # Endpoint to list all profiles
     path("all/", ProfileListAPIView.as_view(), name="profiles"),
     
+    # Endpoint to resolve follow state for many profiles at once
+    path("relationships/", RelationshipsAPIView.as_view(), name="relationships"),
+    
+    # Endpoint to list precomputed follow suggestions
+    path("suggestions/", FollowSuggestionsAPIView.as_view(), name="suggestions"),
+    
     # Endpoint to follow a specific profile
     path("<uuid:profile_id>/follow/", FollowAPIView.as_view(), name="profile-follow"),
     
@@ -1,11 +1,15 @@
+from django.http import Http404
 from django.shortcuts import get_object_or_404
-from profiles.serializers import ProfileOutSerializer
+from profiles.serializers import FollowSuggestionSerializer, ProfileListSerializer, ProfileOutSerializer, RelationshipsSerializer
 from rest_framework.generics import RetrieveUpdateDestroyAPIView, ListAPIView, GenericAPIView
 from rest_framework.permissions import IsAuthenticated
-from profiles.models import Profile
+from django.conf import settings
+from profiles.models import FollowSuggestion, Profile
+from profiles.paginations import ProfilePagination
 from profiles.exceptions import CantFollowYourself
 from rest_framework.response import Response
 from rest_framework import status
+from common.conditional import ConditionalListMixin, make_etag, not_modified, set_validators
 
 
 class ProfileRetrieveAPIView(RetrieveUpdateDestroyAPIView):
@@ -23,17 +27,99 @@ class ProfileRetrieveAPIView(RetrieveUpdateDestroyAPIView):
         """Returns the profile of the currently authenticated user."""
         return self.request.user.profile
 
+    def retrieve(self, request, *args, **kwargs):
+        """Returns the current user's profile, honouring conditional requests.
+
+        The ETag is built from the profile's id, ``updated`` timestamp and
+        follow counts and the user fields included in the representation. They are read with a
+        single narrow query, so a matching ``If-None-Match`` request gets a
+        304 without loading the profile. No ``Last-Modified`` is sent, since
+        follows and user edits change the body without touching ``updated``.
+        """
+        state = (
+            Profile.objects.filter(user=request.user)
+            .values(
+                "id", "updated", "followers_count", "following_count",
+                "user__email", "user__first_name", "user__last_name",
+            )
+            .first()
+        )
+        if state is None:
+            raise Http404
+        etag = make_etag(*(state[name] for name in sorted(state)))
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        return set_validators(super().retrieve(request, *args, **kwargs), etag)
 
-class ProfileListAPIView(ListAPIView):
+
+class ProfileListAPIView(ConditionalListMixin, ListAPIView):
     """API endpoint for listing all user profiles.
     
     Provides:
-    - GET: List all profiles in the system
+    - GET: List all profiles in the system, with their relationship to the current user
     """
-    queryset = Profile.objects.select_related("user")
-    serializer_class = ProfileOutSerializer
+    serializer_class = ProfileListSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        """Returns all profiles, annotated with their relationship to the current user."""
+        return Profile.objects.select_related("user").with_relationships(self.request.user.profile)
+
+
+class FollowSuggestionsAPIView(ListAPIView):
+    """API endpoint for profiles the current user may want to follow.
+    
+    GET /profiles/suggestions/
+    - Returns the best precomputed suggestions (see compute_follow_suggestions)
+    - Skips profiles followed since the suggestions were computed
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = FollowSuggestionSerializer
+
+    def get_queryset(self):
+        """Returns the current user's suggestions, best first."""
+        profile = self.request.user.profile
+        return (
+            FollowSuggestion.objects.filter(profile=profile)
+            .exclude(candidate__follower_links__to_profile=profile)
+            .select_related("candidate__user", "candidate__city", "candidate__country")
+            .order_by("-score")[:settings.FOLLOW_SUGGESTIONS_LIMIT]
+        )
+
+
+class RelationshipsAPIView(GenericAPIView):
+    """API endpoint for resolving follow state in bulk.
+    
+    POST /profiles/relationships/
+    - Accepts {"profiles": [<uuid>, ...]} with up to 500 profile ids
+    - Returns is_followed_by_me and follows_me per known profile id, read in one query
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = RelationshipsSerializer
+
+    def post(self, request, *args, **kwargs):
+        """Handle a relationship lookup."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        rows = (
+            Profile.objects.filter(id__in=serializer.validated_data["profiles"])
+            .with_relationships(request.user.profile)
+            .values("id", "is_followed_by_me", "follows_me")
+        )
+        return Response(
+            {
+                "relationships": {
+                    str(row["id"]): {
+                        "is_followed_by_me": row["is_followed_by_me"],
+                        "follows_me": row["follows_me"],
+                    }
+                    for row in rows
+                }
+            },
+            status=status.HTTP_200_OK
+        )
+
 
 class FollowAPIView(GenericAPIView):
     """API endpoint for following another user's profile.
@@ -53,13 +139,11 @@ class FollowAPIView(GenericAPIView):
         if own_profile.id == profile_id:
             raise CantFollowYourself
             
-        if own_profile.is_following(profile):
+        if not own_profile.follow(profile):
             return Response(
                 {"message": f"You are already following {profile.user.full_name}"},
                 status=status.HTTP_403_FORBIDDEN
             )
-            
-        own_profile.follow(profile)
         return Response(
             {"message": f"You are now following {profile.user.full_name}"},
             status=status.HTTP_200_OK
@@ -84,8 +168,7 @@ class UnFollowAPIView(GenericAPIView):
         if own_profile.id == profile_id:
             raise CantFollowYourself
             
-        if own_profile.is_following(profile):
-            own_profile.unfollow(profile)
+        if own_profile.unfollow(profile):
             return Response(
                 {"message": f"You are now unfollowing {profile.user.full_name}"},
                 status=status.HTTP_200_OK
@@ -102,31 +185,35 @@ class UnFollowAPIView(GenericAPIView):
         )
 
 
-class FollowersAPIView(ListAPIView):
+class FollowersAPIView(ConditionalListMixin, ListAPIView):
     """API endpoint for listing a user's followers.
     
     GET /profiles/followers/
-    - Returns paginated list of profiles following the current user
+    - Returns cursor-paginated list of profiles following the current user
+    - Flags which of them the current user follows back
     """
     permission_classes = [IsAuthenticated]
-    serializer_class = ProfileOutSerializer
+    serializer_class = ProfileListSerializer
+    pagination_class = ProfilePagination
 
     def get_queryset(self):
         """Returns queryset of profiles following the current user."""
         profile = self.request.user.profile
-        return profile.followers.select_related("user")
+        return profile.followers.select_related("user").with_relationships(profile)
 
 
-class FollowingsAPIView(ListAPIView):
+class FollowingsAPIView(ConditionalListMixin, ListAPIView):
     """API endpoint for listing who a user is following.
     
     GET /profiles/followings/
-    - Returns paginated list of profiles the current user follows
+    - Returns cursor-paginated list of profiles the current user follows
+    - Flags which of them follow the current user back
     """
     permission_classes = [IsAuthenticated]
-    serializer_class = ProfileOutSerializer
+    serializer_class = ProfileListSerializer
+    pagination_class = ProfilePagination
 
     def get_queryset(self):
         """Returns queryset of profiles the current user follows."""
         profile = self.request.user.profile
-        return profile.following.select_related("user")
\ No newline at end of file
+        return profile.following.select_related("user").with_relationships(profile)
\ No newline at end of file